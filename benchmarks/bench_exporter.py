@@ -0,0 +1,75 @@
+"""
+Exporter throughput benchmark
+Reports export time per format for large problem sets
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.exporter import ProblemExporter  # noqa: E402
+from src.generator import ProblemGenerator  # noqa: E402
+
+FORMATS = ["markdown", "latex", "text", "json"]
+
+
+def build_problems(size: int, pool_size: int, seed: int):
+    """
+    Build a problem set of `size` by renumbering a smaller generated pool
+
+    Generating the pool once keeps SymPy out of the measurement.
+    """
+    pool = ProblemGenerator(seed=seed).generate_problem_set(count=pool_size)
+    return [
+        dict(pool[i % pool_size], number=i + 1) for i in range(size)
+    ]
+
+
+def measure(export_format: str, problems) -> float:
+    """
+    Measure the time to export a problem set
+
+    Args:
+        export_format: 'markdown', 'latex', 'text', or 'json'
+        problems: List of problem dictionaries
+
+    Returns:
+        Elapsed seconds
+    """
+    render = getattr(ProblemExporter, f"to_{export_format}")
+    start = time.perf_counter()
+    render(problems)
+    return time.perf_counter() - start
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark problem export")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 100000],
+        help="Problem set sizes to export",
+    )
+    parser.add_argument(
+        "--pool", type=int, default=200, help="Distinct problems to cycle through"
+    )
+    parser.add_argument("-s", "--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    print(f"{'format':<10}{'problems':>10}{'seconds':>10}{'problems/sec':>14}")
+    for size in args.sizes:
+        problems = build_problems(size, args.pool, args.seed)
+        for export_format in FORMATS:
+            elapsed = measure(export_format, problems)
+            print(
+                f"{export_format:<10}{size:>10}{elapsed:>10.3f}{size / elapsed:>14.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
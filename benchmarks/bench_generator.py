@@ -0,0 +1,60 @@
+"""
+Generator throughput benchmark
+Reports problems/sec for each problem type and difficulty level
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.generator import ProblemGenerator  # noqa: E402
+
+PROBLEM_TYPES = ["derivative", "integral", "limit"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+def measure(problem_type: str, difficulty: str, count: int, seed: int) -> float:
+    """
+    Measure generation throughput for one problem type and difficulty
+
+    Args:
+        problem_type: 'derivative', 'integral', or 'limit'
+        difficulty: 'easy', 'medium', or 'hard'
+        count: Number of problems to generate
+        seed: Random seed for the generator
+
+    Returns:
+        Problems generated per second
+    """
+    generator = ProblemGenerator(seed=seed)
+    generate = getattr(generator, f"generate_{problem_type}_problem")
+
+    start = time.perf_counter()
+    for _ in range(count):
+        generate(difficulty)
+    elapsed = time.perf_counter() - start
+
+    return count / elapsed
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark problem generation")
+    parser.add_argument(
+        "-n", "--count", type=int, default=50, help="Problems per measurement"
+    )
+    parser.add_argument("-s", "--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    print(f"{'type':<12}{'difficulty':<12}{'problems/sec':>14}")
+    for problem_type in PROBLEM_TYPES:
+        for difficulty in DIFFICULTIES:
+            rate = measure(problem_type, difficulty, args.count, args.seed)
+            print(f"{problem_type:<12}{difficulty:<12}{rate:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
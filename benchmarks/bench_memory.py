@@ -0,0 +1,135 @@
+"""
+Problem memory benchmark
+Compares peak RSS of holding a large problem set as plain dicts and as
+Problem records, both freshly generated and loaded back from JSON lines
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.generator import ProblemGenerator  # noqa: E402
+from src.problem import Problem  # noqa: E402
+
+CONTAINERS = ["dict", "problem"]
+SOURCES = ["generate", "load"]
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process in bytes"""
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def hold(container: str, source: str, count: int, seed: int, path: str):
+    """
+    Build and keep a problem set, then print the peak RSS before and after
+
+    Runs in a child process so every measurement starts from a fresh heap.
+
+    Args:
+        container: 'dict' (the former representation) or 'problem'
+        source: 'generate' to generate the set, 'load' to read it from path
+        count: Problems in the set
+        seed: Random seed for the generator
+        path: JSON lines file written by the parent
+    """
+    generator = ProblemGenerator(seed=seed)
+    # Warm up imports and caches so the baseline excludes them
+    list(generator.iter_problems(count=10, difficulty="easy"))
+    before = peak_rss()
+
+    if source == "generate":
+        problems = generator.iter_problems(count=count, difficulty="easy")
+        if container == "dict":
+            held = [problem.to_dict() for problem in problems]
+        else:
+            held = list(problems)
+    else:
+        with open(path, encoding="utf-8") as stream:
+            if container == "dict":
+                held = [json.loads(line) for line in stream]
+            else:
+                held = [Problem(json.loads(line)) for line in stream]
+
+    print(json.dumps({"count": len(held), "before": before, "peak": peak_rss()}))
+
+
+def measure(container: str, source: str, count: int, seed: int, path: str):
+    """
+    Run one measurement in a child process
+
+    Returns:
+        Peak RSS in bytes and the growth per problem over the baseline
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            "--child",
+            container,
+            source,
+            "-n",
+            str(count),
+            "-s",
+            str(seed),
+            "--path",
+            path,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = json.loads(result.stdout)
+    return report["peak"], (report["peak"] - report["before"]) / report["count"]
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark problem memory use")
+    parser.add_argument(
+        "-n", "--count", type=int, default=100000, help="Problems per set"
+    )
+    parser.add_argument("-s", "--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        hold(*args.child, args.count, args.seed, args.path)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        # The set as a shard merge or dedup pass would read it back
+        path = str(Path(directory) / "problems.jsonl")
+        generator = ProblemGenerator(seed=args.seed)
+        with open(path, "w", encoding="utf-8") as stream:
+            for problem in generator.iter_problems(count=args.count, difficulty="easy"):
+                stream.write(json.dumps(dict(problem), ensure_ascii=False) + "\n")
+
+        print(f"{args.count} easy problems")
+        print(f"{'source':<10}{'container':<11}{'peak RSS':>12}{'per problem':>14}")
+        for source in SOURCES:
+            peaks = {}
+            for container in CONTAINERS:
+                peak, per_problem = measure(
+                    container, source, args.count, args.seed, path
+                )
+                peaks[container] = peak
+                print(
+                    f"{source:<10}{container:<11}{peak / 2**20:>9.1f} MB"
+                    f"{per_problem:>12.0f} B"
+                )
+            saved = 1 - peaks["problem"] / peaks["dict"]
+            print(f"{'':<10}{'saved':<11}{saved:>11.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Polynomial engine benchmark
+Compares solving easy problems on coefficients with the SymPy path, and
+scalar with vectorized generation of a large easy set
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.generator import ProblemGenerator  # noqa: E402
+from src.rendering import render_latex, render_str  # noqa: E402
+
+PROBLEM_TYPES = ["derivative", "integral", "limit"]
+
+
+def measure(problem_type: str, count: int, seed: int):
+    """
+    Solve the same easy draws with both engines
+
+    Args:
+        problem_type: 'derivative', 'integral', or 'limit'
+        count: Number of problems to solve
+        seed: Random seed for the draws
+
+    Returns:
+        Problems/sec with the polynomial engine and with SymPy
+    """
+    generator = ProblemGenerator(seed=seed)
+    specs = [generator._draw_spec(problem_type, "easy") for _ in range(count)]
+
+    start = time.perf_counter()
+    for spec in specs:
+        generator._solve_polynomial(problem_type, spec)
+    fast = time.perf_counter() - start
+
+    # Start SymPy's printers cold, as in a fresh process
+    render_str.cache_clear()
+    render_latex.cache_clear()
+    start = time.perf_counter()
+    for spec in specs:
+        drawn = generator._build_draw(problem_type, "easy", spec)
+        generator._solve_cached(problem_type, "easy", drawn)
+    slow = time.perf_counter() - start
+
+    return count / fast, count / slow
+
+
+def measure_sets(count: int, seed: int):
+    """
+    Generate a whole easy problem set with and without vectorization
+
+    Args:
+        count: Problems in the set
+        seed: Random seed for the generator
+
+    Returns:
+        Problems/sec for scalar and vectorized generation
+    """
+    rates = []
+    for vectorized in (False, True):
+        generator = ProblemGenerator(seed=seed)
+        start = time.perf_counter()
+        generator.generate_problem_set(
+            count=count, difficulty="easy", vectorized=vectorized
+        )
+        rates.append(count / (time.perf_counter() - start))
+    return rates
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the polynomial engine")
+    parser.add_argument(
+        "-n", "--count", type=int, default=500, help="Problems per measurement"
+    )
+    parser.add_argument(
+        "--set-size", type=int, default=100000, help="Problems per easy set"
+    )
+    parser.add_argument("-s", "--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    print(f"{'type':<12}{'polynomial/s':>14}{'sympy/s':>12}{'speedup':>10}")
+    for problem_type in PROBLEM_TYPES:
+        fast, slow = measure(problem_type, args.count, args.seed)
+        print(f"{problem_type:<12}{fast:>14.1f}{slow:>12.1f}{fast / slow:>9.1f}x")
+
+    scalar, vectorized = measure_sets(args.set_size, args.seed)
+    print(f"\n{args.set_size} easy problems per set:")
+    print(f"  scalar:      {scalar:>10.1f} problems/s")
+    print(f"  vectorized:  {vectorized:>10.1f} problems/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+CLI startup benchmark
+Runs main.py under -X importtime and reports wall time and import cost
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "help": ["--help"],
+    "usage-error": ["--workers", "0"],
+    "one-problem": ["-n", "1", "-s", "1"],
+}
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def run_once(cli_args: List[str]) -> Tuple[float, Dict[str, int], Set[str]]:
+    """
+    Run the CLI once with import timing enabled
+
+    Args:
+        cli_args: Arguments passed to main.py
+
+    Returns:
+        Wall time in seconds, cumulative import time in microseconds for
+        every top-level import, and the names of all imported modules
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", *cli_args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    top_level = {}
+    modules = set()
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        modules.add(match.group(4))
+        # Nesting is shown by indentation; one space marks a top-level import
+        if len(match.group(3)) == 1:
+            top_level[match.group(4)] = int(match.group(2))
+    return elapsed, top_level, modules
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Runs per scenario")
+    parser.add_argument(
+        "--top", type=int, default=5, help="Slowest top-level imports to list"
+    )
+    args = parser.parse_args()
+
+    for name, cli_args in SCENARIOS.items():
+        runs = [run_once(cli_args) for _ in range(args.repeat)]
+        wall = statistics.median(elapsed for elapsed, _, _ in runs)
+        _, imports, modules = runs[-1]
+        total_ms = sum(imports.values()) / 1000
+
+        print(f"{name}: main.py {' '.join(cli_args)}")
+        print(f"  wall time (median):  {wall * 1000:8.1f} ms")
+        print(f"  import time:         {total_ms:8.1f} ms")
+        print(f"  sympy imported:      {'sympy' in modules}")
+        for module, micros in sorted(imports.items(), key=lambda item: -item[1])[
+            : args.top
+        ]:
+            print(f"    {module:<30}{micros / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
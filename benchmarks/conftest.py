@@ -0,0 +1,23 @@
+"""
+Shared fixtures for the pytest-benchmark suite
+"""
+
+import pytest
+from src.generator import ProblemGenerator
+
+
+@pytest.fixture(scope="session")
+def problem_pool():
+    """Mixed easy and hard problems, generated once per session"""
+    generator = ProblemGenerator(seed=0)
+    return generator.generate_problem_set(
+        count=150, difficulty="easy"
+    ) + generator.generate_problem_set(count=50, difficulty="hard")
+
+
+@pytest.fixture(scope="session")
+def problems(problem_pool):
+    """10000 problems for the exporters, cycled from the pool"""
+    return [
+        dict(problem_pool[i % len(problem_pool)], number=i + 1) for i in range(10000)
+    ]
@@ -0,0 +1,99 @@
+"""
+Load test for the generation server
+Sends concurrent requests to `main.py serve` and reports throughput and
+latency percentiles
+"""
+
+import argparse
+import http.client
+import math
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+
+def percentile(samples, q: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+    if not samples:
+        return 0.0
+    return samples[max(1, math.ceil(q / 100 * len(samples))) - 1]
+
+
+def main():
+    """Load test entry point"""
+    parser = argparse.ArgumentParser(description="Load test the generation server")
+    parser.add_argument(
+        "--url", default="http://127.0.0.1:8000", help="Server base URL"
+    )
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=8, help="Concurrent clients"
+    )
+    parser.add_argument("-n", "--requests", type=int, default=200, help="Total requests")
+    parser.add_argument("--count", type=int, default=5, help="Problems per request")
+    parser.add_argument(
+        "-d", "--difficulty", default="medium", help="Difficulty per request"
+    )
+    parser.add_argument("-f", "--format", default="json", help="Output format")
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    next_request = iter(range(args.requests))
+
+    def client():
+        connection = http.client.HTTPConnection(url.hostname, url.port or 80)
+        while True:
+            with lock:
+                index = next(next_request, None)
+            if index is None:
+                break
+
+            query = urlencode(
+                {
+                    "count": args.count,
+                    "difficulty": args.difficulty,
+                    "format": args.format,
+                    "seed": index,
+                }
+            )
+            start = time.perf_counter()
+            try:
+                connection.request("GET", f"/generate?{query}")
+                response = connection.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException) as error:
+                connection.close()
+                ok, response = False, error
+            elapsed = time.perf_counter() - start
+
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors.append(response)
+        connection.close()
+
+    threads = [threading.Thread(target=client) for _ in range(args.concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"requests:     {len(latencies)} ok, {len(errors)} failed in {wall:.2f}s")
+    print(
+        f"throughput:   {len(latencies) / wall:.1f} req/s, "
+        f"{len(latencies) * args.count / wall:.1f} problems/s"
+    )
+    for q in (50, 90, 99):
+        print(f"latency p{q}:  {percentile(latencies, q) * 1000:.1f} ms")
+    print(f"latency max:  {(latencies[-1] if latencies else 0) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
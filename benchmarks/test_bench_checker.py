@@ -0,0 +1,35 @@
+"""
+Answer checker benchmarks
+Checking 10000 submitted answers to one problem
+"""
+
+import pytest
+from src.checker import AnswerChecker, compile_expression
+
+PROBLEMS = {
+    "derivative": {"type": "derivative", "solution": "2*x*cos(x) + 2*sin(x)"},
+    "integral": {
+        "type": "integral",
+        "solution": "-x/3 + log(x**2 + 1/3)/6 - 11*sqrt(3)*atan(sqrt(3)*x)/9",
+    },
+}
+
+
+@pytest.mark.parametrize("distinct", [10, 1000])
+@pytest.mark.parametrize("problem_type", sorted(PROBLEMS))
+def test_check_many(benchmark, problem_type, distinct):
+    """10000 answers with `distinct` different expressions, compiled cold"""
+    benchmark.group = f"check_many/{problem_type}"
+    problem = PROBLEMS[problem_type]
+    answers = [
+        f"{problem['solution']} + {i % distinct}" for i in range(10000)
+    ]
+    checker = AnswerChecker()
+
+    def check():
+        compile_expression.cache_clear()
+        return checker.check_many(problem, answers)
+
+    result = benchmark(check)
+
+    assert result.all() == (problem_type == "integral")
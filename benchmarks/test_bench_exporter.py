@@ -0,0 +1,58 @@
+"""
+Exporter benchmarks
+Every export format and JSON serialization on a 10000-problem set
+"""
+
+import io
+import json
+
+import pytest
+from src.exporter import ProblemExporter
+from src.storage import write_pack
+
+FORMATS = ["markdown", "latex", "text", "json"]
+
+
+@pytest.mark.parametrize("export_format", FORMATS)
+def test_export(benchmark, problems, export_format):
+    """Render the whole set to a string"""
+    benchmark.group = "export"
+    render = getattr(ProblemExporter, f"to_{export_format}")
+
+    output = benchmark(render, problems)
+
+    assert output
+
+
+def test_write_json(benchmark, problems):
+    """Stream the set as JSON, as the CLI does"""
+    benchmark.group = "json"
+
+    def write():
+        stream = io.StringIO()
+        ProblemExporter.write_json(problems, stream)
+        return stream
+
+    benchmark(write)
+
+
+def test_json_dumps(benchmark, problems):
+    """The json.dumps baseline the streaming writer reproduces"""
+    benchmark.group = "json"
+
+    benchmark(json.dumps, problems, indent=2, ensure_ascii=False)
+
+
+def test_json_loads(benchmark, problems):
+    """Parse a JSON export back"""
+    benchmark.group = "json"
+    text = ProblemExporter.to_json(problems)
+
+    assert len(benchmark(json.loads, text)) == len(problems)
+
+
+def test_write_pack(benchmark, problems):
+    """Write the set in the pack format"""
+    benchmark.group = "pack"
+
+    benchmark(write_pack, problems, io.BytesIO())
@@ -0,0 +1,49 @@
+"""
+Generator benchmarks
+Single problems per type and difficulty, and whole sets at several sizes
+"""
+
+import pytest
+from src.generator import ProblemGenerator
+
+PROBLEM_TYPES = ["derivative", "integral", "limit"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+@pytest.mark.parametrize("problem_type", PROBLEM_TYPES)
+def test_generate_problem(benchmark, problem_type, difficulty):
+    """One generate_*_problem call; each round draws the next seeded problem"""
+    benchmark.group = f"generate_{problem_type}_problem"
+    generate = getattr(ProblemGenerator(seed=0), f"generate_{problem_type}_problem")
+
+    problem = benchmark(generate, difficulty)
+
+    assert problem["type"] == problem_type
+
+
+@pytest.mark.parametrize(
+    "difficulty,count,vectorized",
+    [
+        ("easy", 100, False),
+        ("easy", 1000, False),
+        ("easy", 10000, False),
+        ("easy", 10000, True),
+        ("medium", 10, False),
+        ("medium", 50, False),
+        ("hard", 10, False),
+        ("hard", 50, False),
+    ],
+)
+def test_generate_problem_set(benchmark, difficulty, count, vectorized):
+    """A whole seeded set, the same one every round"""
+    benchmark.group = f"generate_problem_set/{difficulty}"
+
+    def generate():
+        return ProblemGenerator(seed=0).generate_problem_set(
+            count=count, difficulty=difficulty, vectorized=vectorized
+        )
+
+    problems = benchmark.pedantic(generate, rounds=5, warmup_rounds=1)
+
+    assert len(problems) == count
@@ -4,15 +4,336 @@ Command-line interface for Math Problem Generator
 
 import argparse
 import json
+import os
+import sys
+import time
+from functools import partial
 from pathlib import Path
-from src.generator import ProblemGenerator
+from src.bank import BANKED_DIFFICULTIES, DIFFICULTIES, PROBLEM_TYPES, ProblemBank
+from src.cache import DEFAULT_CACHE_PATH, SolutionCache
 from src.exporter import ProblemExporter
+from src.problem import FIELDS
+from src.profiling import ALL, Profiler
+from src.shard import parse_shard, read_partials, shard_numbers, write_partial
+from src.storage import write_pack
 
+FORMATS = ["markdown", "latex", "text", "json", "pack"]
 
-def main():
+# src.generator imports SymPy, which costs most of the CLI's startup time.
+# It is imported only once arguments are parsed and validated, so --help
+# and usage errors return immediately.
+
+
+def print_solve_stats(solve_stats):
+    """Print solve-time percentiles per type and difficulty to stderr"""
+    from src.rendering import render_cache_info
+
+    print(
+        f"{'problem':<20}{'count':>8}{'timeouts':>10}{'p50 ms':>10}{'p99 ms':>10}",
+        file=sys.stderr,
+    )
+    for key, row in solve_stats.summary().items():
+        print(
+            f"{key:<20}{row['count']:>8}{row['timeouts']:>10}"
+            f"{row['p50'] * 1000:>10.2f}{row['p99'] * 1000:>10.2f}",
+            file=sys.stderr,
+        )
+    for key, tiers in solve_stats.limit_tiers().items():
+        counts = ", ".join(f"{tier} {count}" for tier, count in tiers.items())
+        print(f"limit tiers {key}: {counts}", file=sys.stderr)
+    for name, info in render_cache_info().items():
+        print(
+            f"render cache {name}: {info['hits']} hits, {info['misses']} misses",
+            file=sys.stderr,
+        )
+
+
+def add_solver_arguments(parser):
+    """Add the options that configure how problems are solved"""
+    parser.add_argument(
+        "--solve-timeout",
+        type=float,
+        help="Per-problem solve budget in seconds; slow draws are redrawn",
+    )
+
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        const=str(DEFAULT_CACHE_PATH),
+        metavar="PATH",
+        help=f"Reuse solutions from an on-disk cache (default path: {DEFAULT_CACHE_PATH})",
+    )
+
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=100000,
+        help="Maximum cached solutions before LRU eviction (default: 100000)",
+    )
+
+    parser.add_argument(
+        "--bank",
+        metavar="PATH",
+        help="Serve problems from a bank written by 'main.py build-bank'",
+    )
+
+
+def generator_options(parser, args):
+    """Validate the solver options and turn them into ProblemGenerator arguments"""
+    if args.solve_timeout is not None and args.solve_timeout <= 0:
+        parser.error("--solve-timeout must be positive")
+    if args.cache_size < 1:
+        parser.error("--cache-size must be at least 1")
+    if args.bank and not Path(args.bank).expanduser().is_file():
+        parser.error(f"--bank: no such file: {args.bank}")
+
+    return {
+        "solve_timeout": args.solve_timeout,
+        "cache": SolutionCache(args.cache, args.cache_size) if args.cache else None,
+        "bank": ProblemBank(args.bank) if args.bank else None,
+    }
+
+
+def format_writer(output_format, title, generated_at=None):
+    """Pick the streaming writer and file extension for an output format"""
+    exporter = ProblemExporter()
+
+    if output_format == "markdown":
+        write = partial(exporter.write_markdown, title=title, generated_at=generated_at)
+        extension = ".md"
+    elif output_format == "latex":
+        write = partial(exporter.write_latex, title=title, generated_at=generated_at)
+        extension = ".tex"
+    elif output_format == "text":
+        write = partial(exporter.write_text, generated_at=generated_at)
+        extension = ".txt"
+    elif output_format == "json":
+        write = exporter.write_json
+        extension = ".json"
+    else:  # pack
+        write = partial(write_pack, title=title, generated_at=generated_at)
+        extension = ".pack"
+    return write, extension
+
+
+def format_fields(output_format, steps=True):
+    """Problem fields an output format reads, so the generator skips the rest"""
+    fields = ProblemExporter.FORMAT_FIELDS.get(output_format, FIELDS)
+    return [name for name in fields if steps or name != "steps"]
+
+
+def write_output(write, problems, output, extension, newline=True, binary=False):
+    """
+    Write problems to a file, or to stdout when no output path is given
+
+    Returns:
+        The file written, or None for stdout
+    """
+    if not output:
+        if binary:
+            write(problems, sys.stdout.buffer)
+            sys.stdout.buffer.flush()
+            return None
+        write(problems, sys.stdout)
+        if newline:
+            sys.stdout.write("\n")
+        return None
+
+    output_path = Path(output)
+    # Add extension if not present
+    if not output_path.suffix:
+        output_path = output_path.with_suffix(extension)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # Write beside the target and move into place once complete, so a
+    # failed run never leaves a truncated file at the output path
+    partial_path = output_path.with_name(output_path.name + ".partial")
+    try:
+        if binary:
+            with partial_path.open("wb") as stream:
+                write(problems, stream)
+        else:
+            with partial_path.open("w", encoding="utf-8") as stream:
+                write(problems, stream)
+    except BaseException:
+        partial_path.unlink(missing_ok=True)
+        raise
+    os.replace(partial_path, output_path)
+    return output_path
+
+
+def serve(argv):
+    """`main.py serve`: run the generation server"""
+    parser = argparse.ArgumentParser(
+        prog="main.py serve",
+        description="Serve problem sets over HTTP from warm worker processes",
+    )
+
+    parser.add_argument(
+        "--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)"
+    )
+
+    parser.add_argument(
+        "-p", "--port", type=int, default=8000, help="TCP port (default: 8000)"
+    )
+
+    parser.add_argument("--socket", metavar="PATH", help="Serve on a Unix socket instead")
+
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        help="Number of worker processes (default: CPU count)",
+    )
+
+    parser.add_argument(
+        "--max-count",
+        type=int,
+        default=10000,
+        help="Largest problem count per request (default: 10000)",
+    )
+
+    add_solver_arguments(parser)
+
+    args = parser.parse_args(argv)
+
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.max_count < 0:
+        parser.error("--max-count must not be negative")
+    options = generator_options(parser, args)
+
+    from src.server import serve as run_server
+
+    run_server(
+        host=args.host,
+        port=args.port,
+        socket_path=args.socket,
+        workers=args.workers,
+        generator_options=options,
+        max_count=args.max_count,
+    )
+
+
+def build_bank(argv):
+    """`main.py build-bank`: solve the finite problem families into a bank file"""
+    parser = argparse.ArgumentParser(
+        prog="main.py build-bank",
+        description="Enumerate and solve the finite problem families ahead of time",
+    )
+
+    parser.add_argument("-o", "--output", required=True, help="Bank file to write")
+
+    parser.add_argument(
+        "-d",
+        "--difficulty",
+        nargs="+",
+        choices=DIFFICULTIES,
+        default=BANKED_DIFFICULTIES,
+        help="Difficulty levels to include (default: medium hard)",
+    )
+
+    parser.add_argument(
+        "-t",
+        "--types",
+        nargs="+",
+        choices=PROBLEM_TYPES,
+        default=PROBLEM_TYPES,
+        help="Problem types to include (default: all)",
+    )
+
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        help="Number of worker processes (default: CPU count)",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    from src.bank import build_bank as run_build
+
+    def report(problem_type, difficulty, count):
+        print(f"✓ {problem_type}/{difficulty}: {count} problems", flush=True)
+
+    counts = run_build(
+        args.output,
+        families=[
+            (problem_type, difficulty)
+            for problem_type in args.types
+            for difficulty in args.difficulty
+        ],
+        workers=args.workers or os.cpu_count() or 1,
+        progress=report,
+    )
+    print(f"✓ Saved {sum(counts.values())} problems to: {args.output}")
+
+
+def merge(argv):
+    """`main.py merge`: combine shard partials into one output file"""
+    parser = argparse.ArgumentParser(
+        prog="main.py merge",
+        description="Combine the partials written by 'main.py --shard I/N'",
+    )
+
+    parser.add_argument("partials", nargs="+", help="Partial files, one per shard")
+
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=FORMATS,
+        default="markdown",
+        help="Output format (default: markdown)",
+    )
+
+    parser.add_argument("-o", "--output", type=str, help="Output file path (optional)")
+
+    parser.add_argument(
+        "--title",
+        type=str,
+        default="Math Problem Set",
+        help="Title for the problem set",
+    )
+
+    args = parser.parse_args(argv)
+
+    try:
+        job, started_at, problems = read_partials(args.partials)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    # The set is stamped with the time its first shard started
+    write, extension = format_writer(args.format, args.title, started_at)
+    try:
+        output_path = write_output(
+            write, problems, args.output, extension, binary=args.format == "pack"
+        )
+    except ValueError as error:
+        parser.error(str(error))
+    if output_path:
+        print(f"✓ Merged {job['count']} problems from {len(args.partials)} shards")
+        print(f"✓ Saved to: {output_path}")
+
+
+COMMANDS = {"serve": serve, "build-bank": build_bank, "merge": merge}
+
+
+def main(argv=None):
     """Main CLI entry point"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+
     parser = argparse.ArgumentParser(
-        description="Generate mathematical problems with solutions"
+        description="Generate mathematical problems with solutions",
+        epilog=(
+            "Commands: 'main.py serve --help' runs the generation server, "
+            "'main.py build-bank --help' precomputes a problem bank, "
+            "'main.py merge --help' combines --shard partials"
+        ),
     )
 
     parser.add_argument(
@@ -43,7 +364,7 @@ def main():
     parser.add_argument(
         "-f",
         "--format",
-        choices=["markdown", "latex", "text", "json"],
+        choices=FORMATS,
         default="markdown",
         help="Output format (default: markdown)",
     )
@@ -61,43 +382,171 @@ def main():
         help="Title for the problem set",
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1)",
+    )
 
-    # Generate problems
-    generator = ProblemGenerator(seed=args.seed)
-    problems = generator.generate_problem_set(
-        count=args.count, problem_types=args.types, difficulty=args.difficulty
+    parser.add_argument(
+        "--vectorized",
+        action="store_true",
+        help="Generate easy problems in NumPy batches (fast; different seeded output)",
     )
 
-    # Export to chosen format
-    exporter = ProblemExporter()
+    parser.add_argument(
+        "--shard",
+        metavar="I/N",
+        help="Generate only shard I of N of the set, as a partial for 'main.py merge'",
+    )
 
-    if args.format == "markdown":
-        output = exporter.to_markdown(problems, title=args.title)
-        extension = ".md"
-    elif args.format == "latex":
-        output = exporter.to_latex(problems, title=args.title)
-        extension = ".tex"
-    elif args.format == "text":
-        output = exporter.to_text(problems)
-        extension = ".txt"
-    else:  # json
-        output = json.dumps(problems, indent=2, ensure_ascii=False)
-        extension = ".json"
+    parser.add_argument(
+        "--unique",
+        action="store_true",
+        help="Never repeat a problem within the set",
+    )
+
+    parser.add_argument(
+        "--no-steps",
+        action="store_true",
+        help="Leave out step-by-step solutions (skips computing them)",
+    )
 
-    # Output to file or stdout
-    if args.output:
-        output_path = Path(args.output)
-        # Add extension if not present
-        if not output_path.suffix:
-            output_path = output_path.with_suffix(extension)
+    parser.add_argument(
+        "--solve-stats",
+        action="store_true",
+        help="Print p50/p99 solve times and render cache hits to stderr",
+    )
 
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(output, encoding="utf-8")
-        print(f"✓ Generated {args.count} problems")
-        print(f"✓ Saved to: {output_path}")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print time per stage, problem type and difficulty to stderr",
+    )
+
+    parser.add_argument(
+        "--profile-json",
+        metavar="PATH",
+        help="Write the per-stage timings as JSON",
+    )
+
+    parser.add_argument(
+        "--cprofile",
+        metavar="PATH",
+        help="Dump cProfile stats of the run (main process only) for pstats",
+    )
+
+    add_solver_arguments(parser)
+
+    args = parser.parse_args(argv)
+
+    if args.count < 0:
+        parser.error("--count must not be negative")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.vectorized and args.difficulty != "easy":
+        parser.error("--vectorized requires --difficulty easy")
+    if args.unique and (args.workers > 1 or args.vectorized):
+        parser.error("--unique cannot be combined with --workers or --vectorized")
+    numbers = None
+    if args.shard:
+        try:
+            index, total = parse_shard(args.shard)
+        except ValueError as error:
+            parser.error(f"--shard: {error}")
+        if args.seed is None:
+            parser.error("--shard requires --seed, so every shard draws from one set")
+        if args.unique:
+            parser.error("--shard cannot be combined with --unique")
+        numbers = shard_numbers(index, total, args.count)
+    options = generator_options(parser, args)
+
+    from src.generator import ProblemGenerator
+
+    profiler = Profiler() if args.profile or args.profile_json else None
+    if args.cprofile:
+        import cProfile
+
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+
+    # Generate problems lazily so the exporter can stream them
+    # Partials may be merged into any format, so shards keep every field
+    fields = format_fields("json" if args.shard else args.format, not args.no_steps)
+    generator = ProblemGenerator(
+        seed=args.seed, profiler=profiler, fields=fields, **options
+    )
+    if args.unique:
+        counts = [
+            generator.unique_problem_count(problem_type, args.difficulty)
+            for problem_type in set(args.types)
+        ]
+        if None not in counts and args.count > sum(counts):
+            parser.error(
+                f"--unique: only {sum(counts)} distinct {args.difficulty} "
+                f"problems exist for {' '.join(args.types)}"
+            )
+    problems = generator.iter_problems(
+        count=args.count,
+        problem_types=args.types,
+        difficulty=args.difficulty,
+        workers=args.workers,
+        vectorized=args.vectorized,
+        unique=args.unique,
+        numbers=numbers,
+    )
+    if profiler is not None:
+        # Tell the time spent producing problems from the time exporting them
+        problems = profiler.iterate(problems, "generate")
+    start = time.perf_counter()
+
+    if args.shard:
+        # Partials are rendered into the chosen format by `main.py merge`
+        job = {
+            "count": args.count,
+            "seed": args.seed,
+            "difficulty": args.difficulty,
+            "types": args.types,
+            "vectorized": args.vectorized,
+            # Partials without steps cannot be merged with ones that have them
+            "steps": not args.no_steps,
+        }
+        write = partial(write_partial, job=job, index=index, total=total)
+        output_path = write_output(write, problems, args.output, ".jsonl", newline=False)
+        if output_path:
+            print(
+                f"✓ Generated shard {index}/{total}: problems "
+                f"{numbers.start}-{numbers.stop - 1} of {args.count}"
+            )
+            print(f"✓ Saved to: {output_path}")
     else:
-        print(output)
+        write, extension = format_writer(args.format, args.title)
+        output_path = write_output(
+            write, problems, args.output, extension, binary=args.format == "pack"
+        )
+        if output_path:
+            print(f"✓ Generated {args.count} problems")
+            print(f"✓ Saved to: {output_path}")
+
+    if args.cprofile:
+        cprofile.disable()
+        cprofile.dump_stats(args.cprofile)
+    if profiler is not None:
+        elapsed = time.perf_counter() - start
+        profiler.record("export", ALL, ALL, elapsed - profiler.seconds("generate"))
+        if args.profile:
+            print(profiler.format_table(), file=sys.stderr)
+        if args.profile_json:
+            with open(args.profile_json, "w", encoding="utf-8") as stream:
+                json.dump(profiler.summary(), stream, indent=2)
+    if args.solve_stats:
+        print_solve_stats(generator.solve_stats)
+    if generator.cache is not None:
+        generator.cache.close()
+    if generator.bank is not None:
+        generator.bank.close()
 
 
 if __name__ == "__main__":
@@ -2,8 +2,23 @@
 Math Problem Generator Package
 """
 
-from .generator import ProblemGenerator
-from .exporter import ProblemExporter
-
 __version__ = "1.0.0"
-__all__ = ["ProblemGenerator", "ProblemExporter"]
+__all__ = ["ProblemGenerator", "ProblemExporter", "Problem"]
+
+
+def __getattr__(name):
+    # Import lazily: the generator pulls in SymPy, which dominates startup,
+    # and the exporter and CLI helpers do not need it
+    if name == "ProblemGenerator":
+        from .generator import ProblemGenerator
+
+        return ProblemGenerator
+    if name == "ProblemExporter":
+        from .exporter import ProblemExporter
+
+        return ProblemExporter
+    if name == "Problem":
+        from .problem import Problem
+
+        return Problem
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
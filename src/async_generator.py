@@ -0,0 +1,242 @@
+"""
+Async generation API
+Runs problem generation on an executor so asyncio services stay responsive
+"""
+
+import asyncio
+import os
+import pickle
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from .budget import SolveStats
+from .generator import ProblemGenerator, _generate_seeded_chunk
+from .problem import Problem
+from .profiling import Profiler
+
+# Generator options unpickled once per executor thread or process
+_local = threading.local()
+
+
+def _generate_problem(
+    state: bytes,
+    profile: bool,
+    master_seed: int,
+    number: int,
+    problem_types: List[str],
+    difficulty: str,
+) -> Tuple[List[Problem], SolveStats, Optional[Profiler]]:
+    """
+    Executor entry point: generate problem `number` of a set
+
+    Options arrive pickled, so each thread or worker process builds its own
+    copies once (the solution cache's SQLite connection cannot be shared
+    across threads) and reuses them for every later problem.
+    """
+    cached = getattr(_local, "options", None)
+    if cached is None or cached[0] != state:
+        _local.options = cached = (state, pickle.loads(state))
+    options = {**cached[1], "profiler": Profiler() if profile else None}
+    return _generate_seeded_chunk(
+        options, master_seed, problem_types, difficulty, range(number, number + 1)
+    )
+
+
+class AsyncProblemGenerator:
+    """
+    Generates problems from coroutines, solving them on an executor
+
+    Problems are numbered and seeded exactly as in
+    ProblemGenerator.iter_problems, so agenerate_problem_set returns the
+    same set as generate_problem_set for the same seed, whatever the
+    executor. At most max_concurrency problems are handed to the executor
+    at once; the rest are not submitted until a slot frees up, so
+    cancelling a coroutine or closing an iterator drops them without
+    solving. Problems already running finish in the background and their
+    results are discarded. solve_timeout bounds how long that takes, but
+    budgets can only be enforced in a worker process's main thread, so it
+    requires a ProcessPoolExecutor.
+    """
+
+    def __init__(
+        self,
+        seed: int = None,
+        executor: Optional[Executor] = None,
+        max_concurrency: Optional[int] = None,
+        **generator_options,
+    ):
+        """
+        Initialize the generator
+
+        Args:
+            seed: Random seed for reproducible problem generation
+            executor: Thread or process pool to solve on (default: the
+                event loop's default executor); the caller owns it
+            max_concurrency: Problems in flight at once (default: CPU count)
+            **generator_options: ProblemGenerator options (solve_timeout,
+                cache, bank, profiler, ...)
+
+        Raises:
+            ValueError: If max_concurrency is below 1, or solve_timeout is
+                given without a ProcessPoolExecutor
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if generator_options.get("solve_timeout") is not None and not isinstance(
+            executor, ProcessPoolExecutor
+        ):
+            # Threads never receive SIGALRM, so the budget would be ignored
+            raise ValueError("solve_timeout requires a ProcessPoolExecutor")
+        self.generator = ProblemGenerator(seed=seed, **generator_options)
+        self.executor = executor
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        options = self.generator._worker_options()
+        options["profiler"] = None
+        self._state = pickle.dumps(options)
+
+    @property
+    def solve_stats(self) -> SolveStats:
+        """Solve stats of every problem generated so far"""
+        return self.generator.solve_stats
+
+    async def agenerate_derivative_problem(self, difficulty: str = "medium") -> Dict:
+        """
+        Generate a derivative problem with solution
+
+        Args:
+            difficulty: 'easy', 'medium', or 'hard'
+
+        Returns:
+            Dictionary with problem statement, solution, and steps
+        """
+        return await self._generate_single("derivative", difficulty)
+
+    async def agenerate_integral_problem(self, difficulty: str = "medium") -> Dict:
+        """
+        Generate an integral problem with solution
+
+        Args:
+            difficulty: 'easy', 'medium', or 'hard'
+
+        Returns:
+            Dictionary with problem statement, solution, and steps
+        """
+        return await self._generate_single("integral", difficulty)
+
+    async def agenerate_limit_problem(self, difficulty: str = "medium") -> Dict:
+        """
+        Generate a limit problem with solution
+
+        Args:
+            difficulty: 'easy', 'medium', or 'hard'
+
+        Returns:
+            Dictionary with problem statement, solution, and steps
+        """
+        return await self._generate_single("limit", difficulty)
+
+    async def agenerate_problem_set(
+        self,
+        count: int = 5,
+        problem_types: List[str] = None,
+        difficulty: str = "medium",
+    ) -> List[Dict]:
+        """
+        Generate a set of problems concurrently
+
+        Args:
+            count: Number of problems to generate
+            problem_types: List of problem types ('derivative', 'integral', 'limit')
+            difficulty: Difficulty level
+
+        Returns:
+            List of problem dictionaries ordered by number
+        """
+        problems = [
+            problem
+            async for problem in self.as_completed(count, problem_types, difficulty)
+        ]
+        problems.sort(key=lambda problem: problem["number"])
+        return problems
+
+    async def as_completed(
+        self,
+        count: int = 5,
+        problem_types: List[str] = None,
+        difficulty: str = "medium",
+    ) -> AsyncIterator[Dict]:
+        """
+        Generate a set of problems, yielding each as soon as it is solved
+
+        Problems arrive in completion order; their "number" gives their
+        place in the set. Close the iterator (or use contextlib.aclosing)
+        when stopping early, so unsubmitted problems are dropped at once.
+
+        Args:
+            count: Number of problems to generate
+            problem_types: List of problem types ('derivative', 'integral', 'limit')
+            difficulty: Difficulty level
+
+        Yields:
+            Problem dictionaries in completion order
+        """
+        if problem_types is None:
+            problem_types = ["derivative", "integral", "limit"]
+        master_seed = self.generator._rng.getrandbits(64)
+        numbers = iter(range(1, count + 1))
+
+        pending = set()
+        try:
+            while True:
+                for number in numbers:
+                    pending.add(
+                        self._submit(master_seed, number, problem_types, difficulty)
+                    )
+                    if len(pending) >= self.max_concurrency:
+                        break
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    yield self._collect(future.result())
+        finally:
+            # Stopped early: cancel submitted problems that have not started
+            for future in pending:
+                future.cancel()
+
+    async def _generate_single(self, problem_type: str, difficulty: str) -> Dict:
+        """Generate one problem from a fresh seed drawn from this generator"""
+        master_seed = self.generator._rng.getrandbits(64)
+        future = self._submit(master_seed, 1, [problem_type], difficulty)
+        try:
+            problem = self._collect(await future)
+        finally:
+            future.cancel()
+        del problem["number"]
+        return problem
+
+    def _submit(
+        self, master_seed: int, number: int, problem_types: List[str], difficulty: str
+    ) -> asyncio.Future:
+        """Hand one numbered problem to the executor"""
+        return asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            _generate_problem,
+            self._state,
+            self.generator.profiler is not None,
+            master_seed,
+            number,
+            problem_types,
+            difficulty,
+        )
+
+    def _collect(self, result: Tuple) -> Dict:
+        """Merge a finished problem's solve stats and timings"""
+        (problem,), solve_stats, profiler = result
+        self.generator.solve_stats.merge(solve_stats)
+        if profiler is not None:
+            self.generator.profiler.merge(profiler)
+        return problem.to_dict()
@@ -0,0 +1,279 @@
+"""
+Precomputed problem bank
+Solves the finite problem families ahead of time so generation can skip SymPy
+"""
+
+import json
+import os
+import sqlite3
+import zlib
+from itertools import islice, repeat
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+PROBLEM_TYPES = ["derivative", "integral", "limit"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+# Easy problems are plain polynomials, which the generator solves on their
+# coefficients faster than it could look them up, so banks skip them
+BANKED_DIFFICULTIES = ["medium", "hard"]
+
+# Bump whenever specs, stored fields or the way they are computed change, so
+# a stale bank is rejected instead of serving wrong problems
+BANK_VERSION = 2
+
+# Problems solved per process-pool task while building
+BUILD_CHUNK_SIZE = 256
+
+
+class ProblemBank:
+    """
+    Read-only bank of solved problems backed by SQLite
+
+    Problems are keyed by type, difficulty and the spec the generator draws
+    (coefficient tuples and choice indices), and hold every field of the
+    problem except its type and difficulty, zlib-compressed. The generator
+    still draws each spec from its own random stream, so sampling from the
+    bank follows exactly the same distribution as live generation and a
+    seeded run gives the same problems with or without a bank. Each lookup
+    is a single primary-key probe.
+
+    The connection is opened lazily, so a bank can be handed to worker
+    processes and each opens its own connection.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the bank
+
+        Args:
+            path: Bank file written by build_bank
+        """
+        self.path = Path(os.path.expanduser(str(path)))
+        self.hits = 0
+        self.misses = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._families: Dict[Tuple[str, str], int] = {}
+
+    def __getstate__(self) -> Dict:
+        return {"path": self.path}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__(state["path"])
+
+    @staticmethod
+    def make_key(problem_type: str, difficulty: str, spec: Tuple) -> str:
+        """
+        Build the bank key of one drawn problem
+
+        Args:
+            problem_type: 'derivative', 'integral', or 'limit'
+            difficulty: 'easy', 'medium', or 'hard'
+            spec: Spec tuple drawn by the generator
+
+        Returns:
+            Key string
+        """
+        return f"{problem_type}|{difficulty}|{spec!r}"
+
+    def get(self, problem_type: str, difficulty: str, spec: Tuple) -> Optional[Dict]:
+        """
+        Look up a drawn problem
+
+        Args:
+            problem_type: 'derivative', 'integral', or 'limit'
+            difficulty: 'easy', 'medium', or 'hard'
+            spec: Spec tuple drawn by the generator
+
+        Returns:
+            Stored problem fields, or None if the bank does not hold it
+        """
+        connection = self._connect()
+        if (problem_type, difficulty) not in self._families:
+            self.misses += 1
+            return None
+
+        row = connection.execute(
+            "SELECT value FROM problems WHERE key = ?",
+            (self.make_key(problem_type, difficulty, spec),),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def families(self) -> Dict[Tuple[str, str], int]:
+        """
+        Problem counts of the families held in the bank
+
+        Returns:
+            Mapping of (type, difficulty) to number of problems
+        """
+        self._connect()
+        return dict(self._families)
+
+    def __len__(self) -> int:
+        return sum(self.families().values())
+
+    def close(self) -> None:
+        """Close the database connection; the bank reopens it on next use"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the bank read-only on first use"""
+        if self._connection is None:
+            if not self.path.is_file():
+                raise FileNotFoundError(f"problem bank not found: {self.path}")
+            connection = sqlite3.connect(
+                f"{self.path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+            )
+            version = connection.execute(
+                "SELECT value FROM meta WHERE name = 'version'"
+            ).fetchone()
+            if version is None or int(version[0]) != BANK_VERSION:
+                connection.close()
+                raise ValueError(
+                    f"problem bank {self.path} was built by another version; "
+                    "rebuild it with 'main.py build-bank'"
+                )
+            self._families = {
+                (problem_type, difficulty): count
+                for problem_type, difficulty, count in connection.execute(
+                    "SELECT type, difficulty, count FROM families"
+                )
+            }
+            self._connection = connection
+        return self._connection
+
+
+def _solve_bank_chunk(
+    problem_type: str, difficulty: str, specs: List[Tuple]
+) -> List[Tuple[str, bytes]]:
+    """Process pool entry point: solve a run of specs into bank rows"""
+    from .generator import ProblemGenerator
+
+    generator = ProblemGenerator()
+    rows = []
+    for spec in specs:
+        problem = generator._solve_spec(problem_type, difficulty, spec)
+        fields = {
+            name: value
+            for name, value in problem.items()
+            if name not in ("type", "difficulty")
+        }
+        rows.append(
+            (
+                ProblemBank.make_key(problem_type, difficulty, spec),
+                zlib.compress(json.dumps(fields, ensure_ascii=False).encode("utf-8")),
+            )
+        )
+    return rows
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most `size` items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def build_bank(
+    path,
+    families: Optional[List[Tuple[str, str]]] = None,
+    workers: int = 1,
+    progress: Optional[Callable[[str, str, int], None]] = None,
+) -> Dict[Tuple[str, str], int]:
+    """
+    Enumerate and solve every problem of the finite families into a bank
+
+    Families whose space is too large to enumerate (hard integrals) are
+    skipped; the generator keeps solving those live. The bank is written
+    to a temporary file and moved into place once complete.
+
+    Args:
+        path: Bank file to write, replacing any existing one
+        families: (type, difficulty) pairs to include (default: every type
+            at BANKED_DIFFICULTIES)
+        workers: Number of worker processes (1 solves in-process)
+        progress: Called with type, difficulty and count after each family
+
+    Returns:
+        Mapping of (type, difficulty) to number of problems written
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    from .generator import ProblemGenerator
+
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if families is None:
+        families = [
+            (problem_type, difficulty)
+            for problem_type in PROBLEM_TYPES
+            for difficulty in BANKED_DIFFICULTIES
+        ]
+
+    path = Path(os.path.expanduser(str(path)))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = path.with_name(path.name + ".partial")
+    partial_path.unlink(missing_ok=True)
+
+    enumerator = ProblemGenerator()
+    counts = {}
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    connection = sqlite3.connect(str(partial_path))
+    try:
+        connection.execute("CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT)")
+        connection.execute(
+            "CREATE TABLE families (type TEXT, difficulty TEXT, count INTEGER, "
+            "PRIMARY KEY (type, difficulty))"
+        )
+        connection.execute(
+            "CREATE TABLE problems (key TEXT PRIMARY KEY, value BLOB NOT NULL) "
+            "WITHOUT ROWID"
+        )
+        connection.execute(
+            "INSERT INTO meta VALUES ('version', ?)", (str(BANK_VERSION),)
+        )
+
+        for problem_type, difficulty in families:
+            specs = enumerator._enumerate_specs(problem_type, difficulty)
+            if specs is None:
+                continue
+
+            chunks = _chunked(specs, BUILD_CHUNK_SIZE)
+            solve = executor.map if executor is not None else map
+            count = 0
+            for rows in solve(
+                _solve_bank_chunk, repeat(problem_type), repeat(difficulty), chunks
+            ):
+                connection.executemany("INSERT INTO problems VALUES (?, ?)", rows)
+                count += len(rows)
+
+            connection.execute(
+                "INSERT INTO families VALUES (?, ?, ?)",
+                (problem_type, difficulty, count),
+            )
+            connection.commit()
+            counts[(problem_type, difficulty)] = count
+            if progress is not None:
+                progress(problem_type, difficulty, count)
+
+        connection.commit()
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    os.replace(partial_path, path)
+    return counts
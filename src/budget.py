@@ -0,0 +1,160 @@
+"""
+Solve-time budget for SymPy calls
+Enforces per-problem time limits and collects solve-time percentiles
+"""
+
+import math
+import signal
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional, Tuple
+
+
+class SolveTimeout(BaseException):
+    """
+    Raised when a solve exceeds its time budget
+
+    Derives from BaseException so that broad `except Exception` handlers
+    inside SymPy or the step builders cannot swallow it.
+    """
+
+
+def budget_enforceable() -> bool:
+    """
+    Check whether time budgets can be enforced in the calling thread
+
+    Budgets rely on SIGALRM, which is only available on POSIX systems and
+    only delivered to the main thread. Process pool workers run their tasks
+    in the main thread, so budgets always apply there.
+    """
+    return (
+        hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+
+
+@contextmanager
+def time_limit(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Interrupt the enclosed block with SolveTimeout after `seconds`
+
+    Args:
+        seconds: Time budget in seconds; None disables the limit
+
+    Raises:
+        SolveTimeout: If the block runs longer than the budget
+    """
+    if seconds is None or not budget_enforceable():
+        yield
+        return
+
+    def _expire(signum, frame):
+        raise SolveTimeout(f"solve exceeded {seconds}s budget")
+
+    previous = signal.signal(signal.SIGALRM, _expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class SolveStats:
+    """Solve-time samples and timeout counters per problem type and difficulty"""
+
+    def __init__(self, max_samples: int = 10000):
+        """
+        Initialize empty counters
+
+        Args:
+            max_samples: Number of most recent samples kept per key
+        """
+        self.max_samples = max_samples
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self._timeouts: Dict[Tuple[str, str], int] = {}
+        self._limit_tiers: Dict[Tuple[str, str], int] = {}
+
+    @contextmanager
+    def timer(self, problem_type: str, difficulty: str) -> Iterator[None]:
+        """Record the wall time of the enclosed solve if it completes"""
+        start = time.perf_counter()
+        yield
+        self.record(problem_type, difficulty, time.perf_counter() - start)
+
+    def record(self, problem_type: str, difficulty: str, seconds: float) -> None:
+        """Record one completed solve"""
+        key = (problem_type, difficulty)
+        if key not in self._samples:
+            self._samples[key] = deque(maxlen=self.max_samples)
+        self._samples[key].append(seconds)
+
+    def record_timeout(self, problem_type: str, difficulty: str) -> None:
+        """Record one solve that exceeded its budget and was redrawn"""
+        key = (problem_type, difficulty)
+        self._timeouts[key] = self._timeouts.get(key, 0) + 1
+
+    def record_limit_tier(self, difficulty: str, tier: str) -> None:
+        """Record which solver tier resolved one limit (see src/limits.py)"""
+        key = (difficulty, tier)
+        self._limit_tiers[key] = self._limit_tiers.get(key, 0) + 1
+
+    def merge(self, other: "SolveStats") -> None:
+        """Add the samples and counters of another SolveStats"""
+        for (problem_type, difficulty), samples in other._samples.items():
+            for seconds in samples:
+                self.record(problem_type, difficulty, seconds)
+        for key, count in other._timeouts.items():
+            self._timeouts[key] = self._timeouts.get(key, 0) + count
+        for key, count in other._limit_tiers.items():
+            self._limit_tiers[key] = self._limit_tiers.get(key, 0) + count
+
+    def limit_tiers(self) -> Dict[str, Dict[str, int]]:
+        """
+        Count how often each limit solver tier resolved a limit
+
+        Returns:
+            Mapping of 'limit/difficulty' to tier name to count
+        """
+        tiers: Dict[str, Dict[str, int]] = {}
+        for (difficulty, tier), count in sorted(self._limit_tiers.items()):
+            tiers.setdefault(f"limit/{difficulty}", {})[tier] = count
+        return tiers
+
+    def percentile(self, problem_type: str, difficulty: str, q: float) -> float:
+        """
+        Nearest-rank percentile of recorded solve times
+
+        Args:
+            problem_type: 'derivative', 'integral', or 'limit'
+            difficulty: 'easy', 'medium', or 'hard'
+            q: Percentile between 0 and 100
+
+        Returns:
+            Solve time in seconds, or 0.0 if nothing was recorded
+        """
+        samples = sorted(self._samples.get((problem_type, difficulty), ()))
+        if not samples:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * len(samples)))
+        return samples[rank - 1]
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Summarize counters for every recorded type and difficulty
+
+        Returns:
+            Mapping of 'type/difficulty' to count, timeouts, p50 and p99
+        """
+        keys = sorted(set(self._samples) | set(self._timeouts))
+        return {
+            f"{problem_type}/{difficulty}": {
+                "count": len(self._samples.get((problem_type, difficulty), ())),
+                "timeouts": self._timeouts.get((problem_type, difficulty), 0),
+                "p50": self.percentile(problem_type, difficulty, 50),
+                "p99": self.percentile(problem_type, difficulty, 99),
+            }
+            for problem_type, difficulty in keys
+        }
@@ -0,0 +1,158 @@
+"""
+Persistent solution cache
+Stores solved problems on disk so repeat runs can skip SymPy
+"""
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_CACHE_PATH = Path("~/.cache/math-problem-generator/solutions.db")
+
+# Bump whenever the stored fields or the way they are computed change, so
+# stale entries are never served
+SCHEMA_VERSION = 2
+
+
+class SolutionCache:
+    """
+    Size-bounded LRU cache of solved problems backed by SQLite
+
+    Entries are keyed by the operation, difficulty, point and `srepr` of
+    the function, and hold every field of the problem except its type and
+    difficulty. The connection is opened lazily, so a cache can be handed
+    to worker processes and each opens its own connection.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries: int = 100000):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite database file, created on first use
+            max_entries: Entries kept before least recently used ones are evicted
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = Path(os.path.expanduser(str(path)))
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._size = 0
+
+    def __getstate__(self) -> Dict:
+        return {"path": self.path, "max_entries": self.max_entries}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__(state["path"], state["max_entries"])
+
+    @staticmethod
+    def make_key(operation: str, difficulty: str, expression_srepr: str, point=None) -> str:
+        """
+        Build the cache key of one solve
+
+        Args:
+            operation: 'derivative', 'integral', or 'limit'
+            difficulty: 'easy', 'medium', or 'hard'
+            expression_srepr: `sympy.srepr` of the function
+            point: Limit point, if any
+
+        Returns:
+            Key string
+        """
+        return f"{SCHEMA_VERSION}|{operation}|{difficulty}|{point}|{expression_srepr}"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a solved problem and mark it as recently used
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Stored problem fields, or None on a miss
+        """
+        connection = self._connect()
+        row = connection.execute(
+            "SELECT value FROM solutions WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        connection.execute(
+            "UPDATE solutions SET last_used = ? WHERE key = ?", (time.time_ns(), key)
+        )
+        return json.loads(row[0])
+
+    def put(self, key: str, fields: Dict) -> None:
+        """
+        Store a solved problem, evicting least recently used entries if full
+
+        Args:
+            key: Key from make_key
+            fields: JSON-serializable problem fields
+        """
+        connection = self._connect()
+        cursor = connection.execute(
+            "INSERT OR REPLACE INTO solutions (key, value, last_used) VALUES (?, ?, ?)",
+            (key, json.dumps(fields, ensure_ascii=False), time.time_ns()),
+        )
+        self._size += cursor.rowcount
+        if self._size > self.max_entries:
+            self._evict()
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        self._connect().execute("DELETE FROM solutions")
+        self._size = 0
+
+    def close(self) -> None:
+        """Close the database connection; the cache reopens it on next use"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use"""
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit: every statement is its own short transaction, so
+            # concurrent worker processes only contend for a moment
+            connection = sqlite3.connect(
+                str(self.path), timeout=30, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS solutions ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used INTEGER NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)"
+            )
+            self._connection = connection
+            self._size = len(self)
+        return self._connection
+
+    def _evict(self) -> None:
+        """Drop least recently used entries down to max_entries"""
+        connection = self._connect()
+        # Other processes may have inserted too, so recount before deleting
+        self._size = len(self)
+        excess = self._size - self.max_entries
+        if excess > 0:
+            connection.execute(
+                "DELETE FROM solutions WHERE key IN "
+                "(SELECT key FROM solutions ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            self._size -= excess
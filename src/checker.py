@@ -0,0 +1,314 @@
+"""
+Answer checking
+Compiles solutions and submitted answers to NumPy and compares them numerically
+"""
+
+import ast
+import io
+import tokenize
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+# Longest submission accepted; longer input is rejected before parsing
+MAX_ANSWER_LENGTH = 1000
+
+# Compiled expressions kept per process. Graded answers repeat a lot, and
+# every problem's solution is compiled once.
+EVALUATOR_CACHE_SIZE = 4096
+
+# Names an expression may use, and what they evaluate to
+_NAMESPACE = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "asin": np.arcsin,
+    "acos": np.arccos,
+    "atan": np.arctan,
+    "sinh": np.sinh,
+    "cosh": np.cosh,
+    "tanh": np.tanh,
+    "exp": np.exp,
+    "log": np.log,
+    "ln": np.log,
+    "sqrt": np.sqrt,
+    "Abs": np.abs,
+    "abs": np.abs,
+    "pi": np.pi,
+    "E": np.e,
+    "e": np.e,
+    "oo": np.inf,
+    "inf": np.inf,
+    "infinity": np.inf,
+}
+_FUNCTIONS = {name for name, value in _NAMESPACE.items() if callable(value)}
+_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.USub, ast.UAdd)
+
+# Answers meaning a limit does not exist
+_UNDEFINED = {"undefined", "dne", "does not exist"}
+
+# Tokens that carry no part of the expression
+_LAYOUT_TOKENS = {
+    tokenize.NEWLINE,
+    tokenize.NL,
+    tokenize.COMMENT,
+    tokenize.INDENT,
+    tokenize.DEDENT,
+    tokenize.ENDMARKER,
+}
+
+Evaluator = Callable[[np.ndarray], np.ndarray]
+
+
+class _Validator(ast.NodeTransformer):
+    """
+    Reject anything but arithmetic on x, numbers and whitelisted functions
+
+    Also turns numbers into floats, so huge integer powers overflow
+    instead of running unbounded.
+    """
+
+    def generic_visit(self, node):
+        if not isinstance(
+            node,
+            (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load)
+            + _OPERATORS,
+        ):
+            raise ValueError(f"unsupported syntax: {type(node).__name__}")
+        return super().generic_visit(node)
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"unsupported constant: {node.value!r}")
+        return ast.copy_location(ast.Constant(float(node.value)), node)
+
+    def visit_Name(self, node):
+        if node.id != "x" and node.id not in _NAMESPACE:
+            raise ValueError(f"unknown name: {node.id}")
+        return node
+
+    def visit_Call(self, node):
+        if (
+            not isinstance(node.func, ast.Name)
+            or node.func.id not in _FUNCTIONS
+            or len(node.args) != 1
+            or node.keywords
+        ):
+            raise ValueError("only single-argument calls of known functions")
+        return self.generic_visit(node)
+
+
+def _insert_multiplication(expression: str) -> str:
+    """
+    Make implicit multiplication explicit: 2x, 3x(x + 1), x sin(x)
+
+    A '*' goes between a number, a name that is not a function or a closing
+    parenthesis and a following number, name or opening parenthesis.
+    """
+    tokens = []
+    ends_operand = False
+    for token in tokenize.generate_tokens(io.StringIO(expression).readline):
+        if token.type in _LAYOUT_TOKENS:
+            continue
+        starts_operand = (
+            token.type in (tokenize.NUMBER, tokenize.NAME) or token.string == "("
+        )
+        if ends_operand and starts_operand:
+            tokens.append("*")
+        tokens.append(token.string)
+        ends_operand = (
+            token.type == tokenize.NUMBER
+            or (token.type == tokenize.NAME and token.string not in _FUNCTIONS)
+            or token.string == ")"
+        )
+    return " ".join(tokens)
+
+
+@lru_cache(maxsize=EVALUATOR_CACHE_SIZE)
+def compile_expression(expression: str) -> Evaluator:
+    """
+    Compile an expression in x to a vectorized NumPy function
+
+    Accepts the syntax of the generator's solutions (SymPy's str() form)
+    and of typical typed answers: +, -, *, /, ** or ^, implicit
+    multiplication such as 2x, parentheses, numbers, x, pi, E, oo and the
+    functions in _NAMESPACE. Anything else,
+    including attribute access and unknown names, is rejected before the
+    expression is compiled, so untrusted answers are safe to check.
+
+    Args:
+        expression: Expression text
+
+    Returns:
+        Function mapping an array of x values to an array of results
+
+    Raises:
+        ValueError: If the expression is too long or not allowed
+    """
+    if len(expression) > MAX_ANSWER_LENGTH:
+        raise ValueError(f"expression longer than {MAX_ANSWER_LENGTH} characters")
+    try:
+        # Students write x^2; Python's ^ binds too loosely to rewrite later
+        expression = _insert_multiplication(expression.strip().replace("^", "**"))
+        tree = ast.parse(expression, mode="eval")
+        tree = ast.fix_missing_locations(_Validator().visit(tree))
+        code = compile(tree, "<answer>", "eval")
+    except (
+        SyntaxError,
+        tokenize.TokenError,
+        RecursionError,
+        MemoryError,
+        OverflowError,
+    ) as error:
+        raise ValueError(f"cannot parse {expression!r}") from error
+    namespace = {"__builtins__": {}, **_NAMESPACE}
+
+    def evaluate(x: np.ndarray) -> np.ndarray:
+        result = eval(code, namespace, {"x": x})
+        return np.broadcast_to(np.asarray(result, dtype=complex), np.shape(x))
+
+    return evaluate
+
+
+class AnswerChecker:
+    """
+    Checks submitted answers against problem solutions numerically
+
+    Both the solution and each answer are compiled once (and cached) to
+    NumPy functions, then evaluated at the same sample points. Derivative
+    answers must match the solution at every point; integral answers may
+    differ from it by a constant; limit answers must equal the value.
+
+    Points are real, but evaluation is complex, so logarithms and roots of
+    negative values stay defined. Across a logarithm's singularity the
+    complex value jumps by a multiple of iπ, so log(x + 1) and
+    ln(abs(x + 1)) differ by a constant only on each side of x = -1.
+    Integrals therefore compare real parts, where the two agree.
+    """
+
+    def __init__(
+        self,
+        points: int = 16,
+        low: float = -1.9,
+        high: float = 1.9,
+        rtol: float = 1e-6,
+        atol: float = 1e-9,
+        seed: int = 0,
+    ):
+        """
+        Initialize the checker
+
+        Args:
+            points: Number of sample points
+            low: Lowest sample point
+            high: Highest sample point
+            rtol: Relative tolerance per point
+            atol: Absolute tolerance per point
+            seed: Seed of the sample points
+        """
+        if points < 2:
+            raise ValueError("points must be at least 2")
+        rng = np.random.default_rng(seed)
+        self.points = rng.uniform(low, high, points).astype(complex)
+        self.rtol = rtol
+        self.atol = atol
+
+    def check(self, problem: Dict, answer: str) -> bool:
+        """
+        Check one answer
+
+        Args:
+            problem: Problem dictionary from the generator
+            answer: Submitted expression
+
+        Returns:
+            Whether the answer is correct
+        """
+        return bool(self.check_many(problem, [answer])[0])
+
+    def check_many(self, problem: Dict, answers: Sequence[str]) -> np.ndarray:
+        """
+        Check many answers to one problem
+
+        Every distinct answer is compiled and evaluated once at all sample
+        points, and the comparison runs on the whole answers-by-points
+        matrix. Answers that do not parse, use disallowed syntax or fail to
+        evaluate are incorrect.
+
+        Args:
+            problem: Problem dictionary from the generator
+            answers: Submitted expressions
+
+        Returns:
+            Boolean array, one entry per answer
+        """
+        if problem["type"] == "limit":
+            return self._check_limit(problem, answers)
+
+        expected = self._evaluate(problem["solution"])
+        if expected is None:
+            raise ValueError(f"cannot evaluate solution {problem['solution']!r}")
+        # Ignore points where the solution itself is singular
+        usable = np.isfinite(expected)
+        if not usable.any():
+            raise ValueError(f"solution {problem['solution']!r} is nowhere finite")
+        expected = expected[usable]
+
+        distinct = {
+            answer: index for index, answer in enumerate(dict.fromkeys(answers))
+        }
+        values = np.full((len(distinct), len(expected)), np.nan, dtype=complex)
+        for answer, row in distinct.items():
+            value = self._evaluate(answer)
+            if value is not None:
+                values[row] = value[usable]
+
+        difference = values - expected
+        if problem["type"] == "integral":
+            # Antiderivatives are equal up to a constant: remove the offset
+            # at the first point. The imaginary part of that offset changes
+            # across log singularities, so only real parts are compared.
+            difference = difference.real - difference.real[:, :1]
+        scale = np.maximum(np.abs(values), np.abs(expected))
+        correct = (np.abs(difference) <= self.rtol * scale + self.atol).all(axis=1)
+        return correct[[distinct[answer] for answer in answers]]
+
+    def _check_limit(self, problem: Dict, answers: Sequence[str]) -> np.ndarray:
+        """Compare answers to a limit's value"""
+        solution = problem["solution"]
+        if solution.strip().lower() in _UNDEFINED:
+            return np.array(
+                [answer.strip().lower() in _UNDEFINED for answer in answers],
+                dtype=bool,
+            )
+
+        expected = self._evaluate(solution)
+        if expected is None:
+            raise ValueError(f"cannot evaluate solution {solution!r}")
+        expected = expected[0]
+
+        results = np.zeros(len(answers), dtype=bool)
+        for index, answer in enumerate(answers):
+            value = self._evaluate(answer)
+            # A limit is a number: reject expressions still depending on x
+            if value is None or not (value == value[0]).all():
+                continue
+            if np.isinf(expected) or np.isinf(value[0]):
+                results[index] = value[0] == expected
+            else:
+                error = np.abs(value[0] - expected)
+                results[index] = error <= self.rtol * np.abs(expected) + self.atol
+        return results
+
+    def _evaluate(self, expression: str) -> Optional[np.ndarray]:
+        """Evaluate an expression at the sample points, or None if it fails"""
+        try:
+            evaluate = compile_expression(expression)
+        except ValueError:
+            return None
+        try:
+            with np.errstate(all="ignore"):
+                return evaluate(self.points)
+        except (ArithmeticError, TypeError, ValueError):
+            return None
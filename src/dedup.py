@@ -0,0 +1,129 @@
+"""
+Duplicate-free problem sets
+Tracks the canonical keys of the problems already drawn into a set
+"""
+
+from collections import defaultdict
+from typing import Dict, Hashable, List, Set, Tuple
+
+# Redraws before a finite family switches to sampling without replacement
+MAX_UNIQUE_RETRIES = 8
+
+# Redraws allowed in families too large to enumerate (hard integrals)
+MAX_OPEN_RETRIES = 1000
+
+
+class DedupIndex:
+    """
+    Index of the problems drawn into one set, for duplicate-free sets
+
+    Problems are identified by a canonical key: the drawn spec for the
+    enumerable families, whose specs map one-to-one onto problems, and the
+    cancelled rational function for hard integrals, whose specs do not
+    ((2x+2)/(x+1) and (4x+4)/(2x+2) are the same problem). Membership
+    checks are set lookups.
+
+    Drawing redraws a duplicate up to MAX_UNIQUE_RETRIES times. If that
+    fails the family is nearly exhausted, so the index lists the unused
+    specs once and from then on samples them without replacement, which
+    keeps every later draw O(1).
+    """
+
+    def __init__(self):
+        """Initialize an empty index"""
+        self._seen: Dict[Tuple[str, str], Set[Hashable]] = defaultdict(set)
+        self._pools: Dict[Tuple[str, str], List[Tuple]] = {}
+
+    def exhausted(self, generator, problem_type: str, difficulty: str) -> bool:
+        """
+        Whether every problem of a type and difficulty is already in the set
+
+        Args:
+            generator: ProblemGenerator drawing the set
+            problem_type: 'derivative', 'integral', or 'limit'
+            difficulty: 'easy', 'medium', or 'hard'
+        """
+        capacity = generator.unique_problem_count(problem_type, difficulty)
+        return (
+            capacity is not None
+            and len(self._seen[(problem_type, difficulty)]) >= capacity
+        )
+
+    def draw(self, generator, problem_type: str, difficulty: str) -> Tuple:
+        """
+        Draw the spec of a problem not yet in the set and record it
+
+        Args:
+            generator: ProblemGenerator whose random stream to draw from
+            problem_type: 'derivative', 'integral', or 'limit'
+            difficulty: 'easy', 'medium', or 'hard'
+
+        Returns:
+            Spec tuple for the generator
+
+        Raises:
+            ValueError: If no new problem can be drawn
+        """
+        family = (problem_type, difficulty)
+        seen = self._seen[family]
+
+        pool = self._pools.get(family)
+        if pool is None:
+            enumerable = generator.unique_problem_count(problem_type, difficulty)
+            retries = MAX_UNIQUE_RETRIES if enumerable is not None else MAX_OPEN_RETRIES
+            for _ in range(retries):
+                spec = generator._draw_spec(problem_type, difficulty)
+                key = self._canonical(generator, problem_type, difficulty, spec)
+                if key not in seen:
+                    seen.add(key)
+                    return spec
+
+            if enumerable is None:
+                raise ValueError(
+                    f"no new unique {problem_type}/{difficulty} problem found "
+                    f"in {retries} draws"
+                )
+            pool = self._pools[family] = [
+                spec
+                for spec in generator._enumerate_specs(problem_type, difficulty)
+                if spec not in seen
+            ]
+
+        if not pool:
+            raise ValueError(f"all {len(seen)} {problem_type}/{difficulty} problems used")
+        # Swap a random unused spec to the end and pop it
+        index = generator._rng.randrange(len(pool))
+        pool[index], pool[-1] = pool[-1], pool[index]
+        spec = pool.pop()
+        seen.add(spec)
+        return spec
+
+    def release(self, generator, problem_type: str, difficulty: str, spec: Tuple):
+        """
+        Return a drawn spec whose problem was never emitted, e.g. because
+        its solve ran over budget, so it can be drawn again
+
+        Args:
+            generator: ProblemGenerator that drew the spec
+            problem_type: 'derivative', 'integral', or 'limit'
+            difficulty: 'easy', 'medium', or 'hard'
+            spec: Spec returned by draw
+        """
+        family = (problem_type, difficulty)
+        self._seen[family].discard(
+            self._canonical(generator, problem_type, difficulty, spec)
+        )
+        pool = self._pools.get(family)
+        if pool is not None:
+            pool.append(spec)
+
+    @staticmethod
+    def _canonical(generator, problem_type: str, difficulty: str, spec: Tuple) -> Hashable:
+        """Key under which equivalent problems collide"""
+        if generator.unique_problem_count(problem_type, difficulty) is not None:
+            return spec
+
+        import sympy as sp
+
+        (function,) = generator._build_draw(problem_type, difficulty, spec)
+        return sp.srepr(sp.cancel(function))
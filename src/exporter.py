@@ -3,151 +3,359 @@ Export functionality for math problems
 Supports Markdown and LaTeX formats
 """
 
-from typing import List, Dict
+import json
+from json.encoder import encode_basestring
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
 from datetime import datetime
 
+from .problem import FIELDS
+
+# Per-type problem statements, compiled once as f-string renderers. Any
+# type other than derivative or integral is rendered as a limit.
+_STATEMENTS = {
+    "derivative": lambda problem: (
+        f"Find the derivative of:\n\n$$f(x) = {problem['function_latex']}$$\n\n"
+    ),
+    "integral": lambda problem: (
+        f"Find the integral of:\n\n$$\\int {problem['function_latex']} \\, dx$$\n\n"
+    ),
+}
+
+
+def _limit_statement(problem: Dict) -> str:
+    """Render the statement of a limit problem"""
+    return (
+        f"Find the limit:\n\n"
+        f"$$\\lim_{{x \\to {problem['point']}}} {problem['function_latex']}$$\n\n"
+    )
+
+
+# The preamble is full of braces, so it is split around the title and
+# date instead of being a format template
+_LATEX_HEADER = (
+    r"""\documentclass[12pt,a4paper]{article}
+\usepackage[utf8]{inputenc}
+\usepackage{amsmath}
+\usepackage{amssymb}
+\usepackage{graphicx}
+
+\title{""",
+    r"""}
+\author{Math Problem Generator}
+\date{""",
+    r"""}
+
+\begin{document}
+
+\maketitle
+
+""",
+)
+_LATEX_FOOTER = r"""
+\end{document}
+"""
+_LATEX_ITEM = "\n    \\item "
+
+_TEXT_RULE = "=" * 50
+_TEXT_DIVIDER = "-" * 50
+
 
 class ProblemExporter:
     """Export problems to various formats"""
 
+    # Problem fields each format reads; pass one as ProblemGenerator(fields=...)
+    # to skip rendering the rest. Steps are optional in every format.
+    FORMAT_FIELDS = {
+        "markdown": ("function_latex", "solution_latex", "steps"),
+        "latex": ("function_latex", "solution_latex", "steps"),
+        "text": ("function", "solution", "steps"),
+        "json": FIELDS,
+    }
+
     @staticmethod
-    def to_markdown(problems: List[Dict], title: str = "Math Problem Set") -> str:
+    def to_markdown(
+        problems: List[Dict],
+        title: str = "Math Problem Set",
+        generated_at: Optional[datetime] = None,
+    ) -> str:
         """
         Export problems to Markdown format
 
         Args:
             problems: List of problem dictionaries
             title: Title for the problem set
+            generated_at: Timestamp shown in the header (default: now)
 
         Returns:
             Markdown formatted string
         """
-        md = f"# {title}\n\n"
-        md += f"*Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n\n"
-        md += "---\n\n"
-
-        for problem in problems:
-            md += f"## Problem {problem['number']}\n\n"
-            md += f"**Type:** {problem['type'].capitalize()}  \n"
-            md += f"**Difficulty:** {problem['difficulty'].capitalize()}  \n\n"
-
-            if problem["type"] == "derivative":
-                md += f"Find the derivative of:\n\n"
-                md += f"$$f(x) = {problem['function_latex']}$$\n\n"
-            elif problem["type"] == "integral":
-                md += f"Find the integral of:\n\n"
-                md += f"$$\\int {problem['function_latex']} \\, dx$$\n\n"
-            else:  # limit
-                md += f"Find the limit:\n\n"
-                md += f"$$\\lim_{{x \\to {problem['point']}}} {problem['function_latex']}$$\n\n"
+        return "".join(ProblemExporter._markdown_chunks(problems, title, generated_at))
 
-            md += "### Solution\n\n"
-            md += f"$$" + problem["solution_latex"] + "$$\n\n"
+    @staticmethod
+    def write_markdown(
+        problems: Iterable[Dict],
+        stream: TextIO,
+        title: str = "Math Problem Set",
+        generated_at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Write problems to a text stream in Markdown format, one at a time
 
-            if "steps" in problem and problem["steps"]:
-                md += "### Steps\n\n"
-                for step in problem["steps"]:
-                    md += f"- {step}\n"
-                md += "\n"
+        Args:
+            problems: Iterable of problem dictionaries
+            stream: File-like object to write to
+            title: Title for the problem set
+            generated_at: Timestamp shown in the header (default: now)
+        """
+        stream.writelines(ProblemExporter._markdown_chunks(problems, title, generated_at))
 
-            md += "---\n\n"
+    @staticmethod
+    def _markdown_chunks(
+        problems: Iterable[Dict], title: str, generated_at: Optional[datetime]
+    ) -> Iterator[str]:
+        """Yield the Markdown document as a header and one chunk per problem"""
+        generated_at = generated_at or datetime.now()
+        yield (
+            f"# {title}\n\n"
+            f"*Generated on: {generated_at.strftime('%Y-%m-%d %H:%M')}*\n\n"
+            "---\n\n"
+        )
 
-        return md
+        for problem in problems:
+            steps = problem.get("steps")
+            yield (
+                f"## Problem {problem['number']}\n\n"
+                f"**Type:** {problem['type'].capitalize()}  \n"
+                f"**Difficulty:** {problem['difficulty'].capitalize()}  \n\n"
+                f"{_STATEMENTS.get(problem['type'], _limit_statement)(problem)}"
+                f"### Solution\n\n"
+                f"$${problem['solution_latex']}$$\n\n"
+                + ("### Steps\n\n- " + "\n- ".join(steps) + "\n\n" if steps else "")
+                + "---\n\n"
+            )
 
     @staticmethod
-    def to_latex(problems: List[Dict], title: str = "Math Problem Set") -> str:
+    def to_latex(
+        problems: List[Dict],
+        title: str = "Math Problem Set",
+        generated_at: Optional[datetime] = None,
+    ) -> str:
         """
         Export problems to LaTeX format
 
         Args:
             problems: List of problem dictionaries
             title: Title for the problem set
+            generated_at: Date shown on the title page (default: today)
 
         Returns:
             LaTeX formatted string
         """
-        latex = (
-            r"""\documentclass[12pt,a4paper]{article}
-\usepackage[utf8]{inputenc}
-\usepackage{amsmath}
-\usepackage{amssymb}
-\usepackage{graphicx}
+        return "".join(ProblemExporter._latex_chunks(problems, title, generated_at))
 
-\title{"""
-            + title
-            + r"""}
-\author{Math Problem Generator}
-\date{"""
-            + datetime.now().strftime("%Y-%m-%d")
-            + r"""}
-
-\begin{document}
+    @staticmethod
+    def write_latex(
+        problems: Iterable[Dict],
+        stream: TextIO,
+        title: str = "Math Problem Set",
+        generated_at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Write problems to a text stream in LaTeX format, one at a time
 
-\maketitle
+        Args:
+            problems: Iterable of problem dictionaries
+            stream: File-like object to write to
+            title: Title for the problem set
+            generated_at: Date shown on the title page (default: today)
+        """
+        stream.writelines(ProblemExporter._latex_chunks(problems, title, generated_at))
 
-"""
+    @staticmethod
+    def _latex_chunks(
+        problems: Iterable[Dict], title: str, generated_at: Optional[datetime]
+    ) -> Iterator[str]:
+        """Yield the LaTeX document as a preamble, one chunk per problem and a footer"""
+        generated_at = generated_at or datetime.now()
+        before_title, before_date, after_date = _LATEX_HEADER
+        yield (
+            before_title
+            + title
+            + before_date
+            + generated_at.strftime("%Y-%m-%d")
+            + after_date
         )
 
         for problem in problems:
-            latex += f"\\section*{{Problem {problem['number']}}}\n\n"
-            latex += f"\\textbf{{Type:}} {problem['type'].capitalize()} \\\\\n"
-            latex += f"\\textbf{{Difficulty:}} {problem['difficulty'].capitalize()}\n\n"
-
-            if problem["type"] == "derivative":
-                latex += "Find the derivative of:\n\n"
-                latex += f"$$f(x) = {problem['function_latex']}$$\n\n"
-            elif problem["type"] == "integral":
-                latex += "Find the integral of:\n\n"
-                latex += f"$$\\int {problem['function_latex']} \\, dx$$\n\n"
-            else:  # limit
-                latex += "Find the limit:\n\n"
-                latex += f"$$\\lim_{{x \\to {problem['point']}}} {problem['function_latex']}$$\n\n"
-
-            latex += "\\subsection*{Solution}\n\n"
-            latex += f"$${problem['solution_latex']}$$\n\n"
-
-            if "steps" in problem and problem["steps"]:
-                latex += "\\subsection*{Steps}\n\n"
-                latex += "\\begin{enumerate}\n"
-                for step in problem["steps"]:
-                    latex += f"    \\item {step}\n"
-                latex += "\\end{enumerate}\n\n"
-
-            latex += "\\vspace{1cm}\n\n"
-
-        latex += r"""
-\end{document}
-"""
-        return latex
+            steps = problem.get("steps")
+            yield (
+                f"\\section*{{Problem {problem['number']}}}\n\n"
+                f"\\textbf{{Type:}} {problem['type'].capitalize()} \\\\\n"
+                f"\\textbf{{Difficulty:}} {problem['difficulty'].capitalize()}\n\n"
+                f"{_STATEMENTS.get(problem['type'], _limit_statement)(problem)}"
+                f"\\subsection*{{Solution}}\n\n"
+                f"$${problem['solution_latex']}$$\n\n"
+                + (
+                    "\\subsection*{Steps}\n\n\\begin{enumerate}"
+                    + _LATEX_ITEM
+                    + _LATEX_ITEM.join(steps)
+                    + "\n\\end{enumerate}\n\n"
+                    if steps
+                    else ""
+                )
+                + "\\vspace{1cm}\n\n"
+            )
+
+        yield _LATEX_FOOTER
 
     @staticmethod
-    def to_text(problems: List[Dict]) -> str:
+    def to_text(problems: List[Dict], generated_at: Optional[datetime] = None) -> str:
         """
         Export problems to plain text format
 
         Args:
             problems: List of problem dictionaries
+            generated_at: Timestamp shown in the header (default: now)
 
         Returns:
             Plain text formatted string
         """
-        text = f"Math Problem Set\n"
-        text += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
-        text += "=" * 50 + "\n\n"
+        return "".join(ProblemExporter._text_chunks(problems, generated_at))
+
+    @staticmethod
+    def write_text(
+        problems: Iterable[Dict],
+        stream: TextIO,
+        generated_at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Write problems to a text stream in plain text format, one at a time
+
+        Args:
+            problems: Iterable of problem dictionaries
+            stream: File-like object to write to
+            generated_at: Timestamp shown in the header (default: now)
+        """
+        stream.writelines(ProblemExporter._text_chunks(problems, generated_at))
+
+    @staticmethod
+    def _text_chunks(
+        problems: Iterable[Dict], generated_at: Optional[datetime]
+    ) -> Iterator[str]:
+        """Yield the plain text document as a header and one chunk per problem"""
+        generated_at = generated_at or datetime.now()
+        yield (
+            "Math Problem Set\n"
+            f"Generated: {generated_at.strftime('%Y-%m-%d %H:%M')}\n"
+            f"{_TEXT_RULE}\n\n"
+        )
 
         for problem in problems:
-            text += f"Problem {problem['number']}\n"
-            text += f"Type: {problem['type'].capitalize()}\n"
-            text += f"Difficulty: {problem['difficulty'].capitalize()}\n"
-            text += "-" * 50 + "\n"
-            text += f"Function: {problem['function']}\n"
-            text += f"Solution: {problem['solution']}\n\n"
+            steps = problem.get("steps")
+            yield (
+                f"Problem {problem['number']}\n"
+                f"Type: {problem['type'].capitalize()}\n"
+                f"Difficulty: {problem['difficulty'].capitalize()}\n"
+                f"{_TEXT_DIVIDER}\n"
+                f"Function: {problem['function']}\n"
+                f"Solution: {problem['solution']}\n\n"
+                + (
+                    "Steps:\n"
+                    + "".join([f"{i}. {step}\n" for i, step in enumerate(steps, 1)])
+                    if steps
+                    else ""
+                )
+                + f"\n{_TEXT_RULE}\n\n"
+            )
+
+    @staticmethod
+    def to_json(problems: List[Dict]) -> str:
+        """
+        Export problems to JSON format
+
+        Args:
+            problems: List of problem dictionaries
 
-            if "steps" in problem and problem["steps"]:
-                text += "Steps:\n"
-                for i, step in enumerate(problem["steps"], 1):
-                    text += f"{i}. {step}\n"
+        Returns:
+            JSON array string, identical to json.dumps(problems, indent=2)
+        """
+        return "".join(ProblemExporter._json_chunks(problems))
 
-            text += "\n" + "=" * 50 + "\n\n"
+    @staticmethod
+    def write_json(problems: Iterable[Dict], stream: TextIO) -> None:
+        """
+        Write problems to a text stream as a JSON array, one at a time
 
-        return text
+        Args:
+            problems: Iterable of problem dictionaries
+            stream: File-like object to write to
+        """
+        stream.writelines(ProblemExporter._json_chunks(problems))
+
+    @staticmethod
+    def _json_chunks(problems: Iterable[Dict]) -> Iterator[str]:
+        """Yield a JSON array as one chunk per element plus the closing bracket"""
+        separator = "[\n  "
+        for problem in problems:
+            yield separator + _json_problem(problem)
+            separator = ",\n  "
+        yield "[]" if separator == "[\n  " else "\n]"
+
+
+def _json_problem(problem: Dict) -> str:
+    """
+    Encode one problem as an indented JSON object nested one level deep
+
+    Produces exactly what json.dumps(..., indent=2, ensure_ascii=False)
+    would emit for the object inside a list. String keys with scalar or
+    string-list values, which is every field the generator produces, are
+    encoded directly; anything else takes the pure-Python indenting encoder.
+    """
+    items = problem.items()
+    if not items:
+        return "{}"
+
+    members = []
+    for key, value in items:
+        if not isinstance(key, str):
+            return _json_indented(problem)
+        if isinstance(value, (list, tuple)):
+            if not all(isinstance(item, str) for item in value):
+                encoded = _json_indented(value, depth=2)
+            elif value:
+                encoded = (
+                    "[\n      "
+                    + ",\n      ".join(map(encode_basestring, value))
+                    + "\n    ]"
+                )
+            else:
+                encoded = "[]"
+        elif isinstance(value, dict):
+            encoded = _json_indented(value, depth=2)
+        else:
+            encoded = _json_scalar(value)
+        members.append(encode_basestring(key) + ": " + encoded)
+
+    return "{\n    " + ",\n    ".join(members) + "\n  }"
+
+
+def _json_scalar(value) -> str:
+    """Encode a JSON scalar the way json.dumps does, without its call overhead"""
+    if isinstance(value, str):
+        return encode_basestring(value)
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, int):
+        return int.__repr__(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _json_indented(value, depth: int = 1) -> str:
+    """Encode any JSON value with indent=2, nested `depth` levels deep"""
+    return json.dumps(value, indent=2, ensure_ascii=False).replace(
+        "\n", "\n" + "  " * depth
+    )
@@ -3,25 +3,195 @@ Math Problem Generator - Core functionality
 Generates calculus problems with step-by-step solutions
 """
 
+import copy
+import hashlib
+import math
 import random
-from typing import Dict, List
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import product
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import sympy as sp
-from sympy import symbols, diff, integrate, limit, sin, cos, exp, log, oo
+from sympy import symbols, integrate, sin, cos, exp, log, oo
+from sympy.integrals.rationaltools import ratint
+
+from .bank import ProblemBank
+from .budget import SolveStats, SolveTimeout, time_limit
+from .cache import SolutionCache
+from .dedup import DedupIndex
+from .polynomial import Polynomial, format_number, format_number_latex
+from .problem import FIELDS, Problem, select_fields
+from .limits import LimitSolution, solve_limit
+from .profiling import ALL, NO_STAGE, Profiler
+from .rendering import render_latex, render_str
+from .steps import (
+    derivative_steps,
+    integral_steps,
+    polynomial_derivative_steps,
+    polynomial_integral_steps,
+)
+from .templates import (
+    Template,
+    coefficients,
+    derivative_template,
+    polynomial,
+    polynomial_times_template,
+)
+
+
+def derive_seed(master_seed: int, number: int) -> int:
+    """
+    Derive the seed of one problem from the seed of its problem set
+
+    Args:
+        master_seed: Seed drawn once for the whole problem set
+        number: 1-based problem number within the set
+
+    Returns:
+        64-bit seed that depends only on master_seed and number
+    """
+    digest = hashlib.sha256(f"{master_seed}:{number}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+# The drawable problem space. Easy and medium problems, hard derivatives and
+# every limit come from finite families built from these.
+MIN_COEFFICIENT, MAX_COEFFICIENT = -5, 5
+LEADING_REPLACEMENTS = [1, 2, -1, -2]
+TRIG_FUNCTIONS = (sin, cos)
+COMPLEX_FUNCTION_COUNT = 4
+LIMIT_POINTS = (0, 1, oo)
+POLYNOMIAL_LIMIT_POINTS = (0, 1, math.inf)
+
+
+def _coefficient_tuples(max_degree: int) -> Iterator[Tuple[int, ...]]:
+    """Every coefficient tuple _draw_coefficients can return, constant term first"""
+    coefficients = range(MIN_COEFFICIENT, MAX_COEFFICIENT + 1)
+    for degree in range(1, max_degree + 1):
+        for lower in product(coefficients, repeat=degree):
+            for leading in coefficients:
+                if leading != 0:
+                    yield lower + (leading,)
+
+
+@lru_cache(maxsize=None)
+def _family_size(problem_type: str, difficulty: str) -> Optional[int]:
+    """Number of specs of a family, or None if it is not enumerable"""
+    specs = ProblemGenerator._enumerate_specs(problem_type, difficulty)
+    return None if specs is None else sum(1 for _ in specs)
+
+
+@lru_cache(maxsize=None)
+def _family_template(problem_type: str, difficulty: str, shape: Tuple) -> Template:
+    """
+    Template of a family, solved on first use
+
+    Args:
+        problem_type: 'derivative' or 'integral'
+        difficulty: 'medium' or 'hard'
+        shape: (degree, trig index) for medium problems; the spec of a
+            fixed hard derivative
+    """
+    x = symbols("x")
+    if difficulty == "medium":
+        degree, trig = shape
+        if problem_type == "integral":
+            return polynomial_times_template(degree, TRIG_FUNCTIONS[trig](x))
+        parameters = coefficients(degree + 1)
+        return derivative_template(
+            polynomial(parameters) + TRIG_FUNCTIONS[trig](x), parameters
+        )
+
+    # Fixed functions: the family is a single problem
+    return derivative_template(
+        *ProblemGenerator()._build_draw(problem_type, difficulty, shape)
+    )
+
+
+def _limit_str(value: Optional[sp.Expr]) -> str:
+    """Text of a limit, or 'undefined' if the solver found none"""
+    return render_str(value) if value is not None else "undefined"
+
+
+def _limit_latex(value: Optional[sp.Expr]) -> str:
+    """LaTeX of a limit, or 'undefined' if the solver found none"""
+    return render_latex(value) if value is not None else "undefined"
+
+
+# Problems per NumPy batch in vectorized generation
+VECTOR_BATCH_SIZE = 10000
+
+# Upper bound on problems per process-pool task, so the first results of a
+# very large set come back quickly
+MAX_CHUNK_SIZE = 64
+
+
+def _generate_seeded_chunk(
+    options: Dict,
+    master_seed: int,
+    problem_types: List[str],
+    difficulty: str,
+    numbers: range,
+) -> Tuple[List[Problem], SolveStats, Optional[Profiler]]:
+    """Process pool entry point: generate a run of numbered problems"""
+    generator = ProblemGenerator(**options)
+    problems = [
+        generator._generate_numbered_problem(
+            master_seed, number, problem_types, difficulty
+        )
+        for number in numbers
+    ]
+    return problems, generator.solve_stats, generator.profiler
 
 
 class ProblemGenerator:
     """Generates mathematical problems with solutions"""
 
-    def __init__(self, seed: int = None):
+    def __init__(
+        self,
+        seed: int = None,
+        solve_timeout: Optional[float] = None,
+        max_redraws: int = 5,
+        cache: Optional[SolutionCache] = None,
+        bank: Optional[ProblemBank] = None,
+        profiler: Optional[Profiler] = None,
+        fields: Optional[Iterable[str]] = None,
+    ):
         """
         Initialize generator with optional seed for reproducibility
 
+        Each generator draws from its own random stream, so seeded
+        generators do not interfere with each other or with the global
+        random module.
+
         Args:
             seed: Random seed for reproducible problem generation
+            solve_timeout: Per-problem solve budget in seconds; a problem
+                whose solve exceeds it is redrawn (None disables the budget)
+            max_redraws: Budgeted attempts before a final unbounded solve
+            cache: Persistent cache of solved problems (None disables caching)
+            bank: Precomputed problem bank; drawn problems found in it are
+                served without solving
+            profiler: Records per-stage timings (None disables profiling)
+            fields: Problem fields to compute (default: all). Renders and
+                steps for any other field are skipped and the field is left
+                out; type, difficulty, point and number are always set.
+                ProblemExporter.FORMAT_FIELDS lists what each format reads.
+
+        Raises:
+            ValueError: If fields names an unknown field
         """
-        if seed is not None:
-            random.seed(seed)
+        self._rng = random.Random(seed)
         self.x = symbols("x")
+        self.solve_timeout = solve_timeout
+        self.max_redraws = max_redraws
+        self.solve_stats = SolveStats()
+        self.cache = cache
+        self.bank = bank
+        self.profiler = profiler
+        self.fields = select_fields(fields)
+        self._dedup: Optional[DedupIndex] = None
 
     def generate_derivative_problem(self, difficulty: str = "medium") -> Dict:
         """
@@ -33,26 +203,7 @@ class ProblemGenerator:
         Returns:
             Dictionary with problem statement, solution, and steps
         """
-        if difficulty == "easy":
-            function = self._generate_polynomial(max_degree=2)
-        elif difficulty == "medium":
-            function = self._generate_polynomial(max_degree=3) + random.choice(
-                [sin(self.x), cos(self.x)]
-            )
-        else:  # hard
-            function = self._generate_complex_function()
-
-        derivative = diff(function, self.x)
-
-        return {
-            "type": "derivative",
-            "difficulty": difficulty,
-            "function": str(function),
-            "function_latex": sp.latex(function),
-            "solution": str(derivative),
-            "solution_latex": sp.latex(derivative),
-            "steps": self._generate_derivative_steps(function),
-        }
+        return self._generate_within_budget("derivative", difficulty).to_dict()
 
     def generate_integral_problem(self, difficulty: str = "medium") -> Dict:
         """
@@ -64,26 +215,7 @@ class ProblemGenerator:
         Returns:
             Dictionary with problem statement, solution, and steps
         """
-        if difficulty == "easy":
-            function = self._generate_polynomial(max_degree=2)
-        elif difficulty == "medium":
-            function = self._generate_polynomial(max_degree=2) * random.choice(
-                [sin(self.x), cos(self.x)]
-            )
-        else:  # hard
-            function = self._generate_rational_function()
-
-        integral = integrate(function, self.x)
-
-        return {
-            "type": "integral",
-            "difficulty": difficulty,
-            "function": str(function),
-            "function_latex": sp.latex(function),
-            "solution": str(integral),
-            "solution_latex": sp.latex(integral),
-            "steps": self._generate_integral_steps(function),
-        }
+        return self._generate_within_budget("integral", difficulty).to_dict()
 
     def generate_limit_problem(self, difficulty: str = "medium") -> Dict:
         """
@@ -95,152 +227,770 @@ class ProblemGenerator:
         Returns:
             Dictionary with problem statement, solution, and steps
         """
-        point = random.choice([0, 1, oo])
-
-        if difficulty == "easy":
-            function = self._generate_polynomial(max_degree=2)
-        elif difficulty == "medium":
-            # Create indeterminate form
-            numerator = self.x**2 - 1
-            denominator = self.x - 1
-            function = numerator / denominator
-            point = 1
-        else:  # hard
-            function = sin(self.x) / self.x
-            point = 0
-
-        try:
-            limit_result = limit(function, self.x, point)
-        except Exception:
-            limit_result = "undefined"
-
-        return {
-            "type": "limit",
-            "difficulty": difficulty,
-            "function": str(function),
-            "function_latex": sp.latex(function),
-            "point": str(point),
-            "solution": str(limit_result),
-            "solution_latex": (
-                sp.latex(limit_result) if limit_result != "undefined" else "undefined"
-            ),
-            "steps": self._generate_limit_steps(function, point),
-        }
+        return self._generate_within_budget("limit", difficulty).to_dict()
 
     def generate_problem_set(
         self,
         count: int = 5,
         problem_types: List[str] = None,
         difficulty: str = "medium",
+        workers: int = 1,
+        vectorized: bool = False,
+        unique: bool = False,
     ) -> List[Dict]:
         """
         Generate a set of problems
 
+        Every problem is generated from its own seed derived from a master
+        seed drawn once per set, so the output is identical for any number
+        of workers.
+
         Args:
             count: Number of problems to generate
             problem_types: List of problem types ('derivative', 'integral', 'limit')
             difficulty: Difficulty level
+            workers: Number of worker processes (1 generates in-process)
+            vectorized: Draw and solve easy problems in NumPy batches (see
+                iter_problems)
+            unique: Never repeat a problem within the set (see iter_problems)
 
         Returns:
-            List of problem dictionaries
+            List of problem dictionaries ordered by number
+        """
+        return [
+            problem.to_dict()
+            for problem in self.iter_problems(
+                count, problem_types, difficulty, workers, vectorized, unique
+            )
+        ]
+
+    def iter_problems(
+        self,
+        count: int = 5,
+        problem_types: List[str] = None,
+        difficulty: str = "medium",
+        workers: int = 1,
+        vectorized: bool = False,
+        unique: bool = False,
+        numbers: Optional[range] = None,
+    ) -> Iterator[Problem]:
+        """
+        Generate a set of problems lazily, one at a time
+
+        Yields the same problems as generate_problem_set without holding
+        the set in memory. With several workers only a small window of
+        problems is in flight at once. Problems are yielded as compact
+        Problem records rather than dicts, for callers that hold many of
+        them; problem.to_dict() gives the plain dictionary.
+
+        Vectorized generation draws VECTOR_BATCH_SIZE easy problems at a
+        time with NumPy and solves them as coefficient matrices, in-process
+        and without solve stats. Problems follow the same distribution but
+        come from a NumPy random stream, so a seed gives a different (still
+        reproducible) set than non-vectorized generation.
+
+        Unique sets redraw any problem already in the set, and once every
+        problem of a type is used, draw the remaining problems from the
+        other types. They are generated in-process, and match the
+        non-unique set up to the first duplicate.
+
+        `numbers` restricts generation to a slice of the set, e.g. one
+        shard of a job split across machines. Each problem still depends
+        only on the set's master seed and its number, so the slices of a
+        seeded set concatenate to the whole set.
+
+        Args:
+            count: Number of problems to generate
+            problem_types: List of problem types ('derivative', 'integral', 'limit')
+            difficulty: Difficulty level
+            workers: Number of worker processes (1 generates in-process)
+            vectorized: Draw and solve easy problems in NumPy batches
+            unique: Never repeat a problem within the set
+            numbers: Problem numbers to generate, a step-1 range within
+                1..count (default: all)
+
+        Yields:
+            Problem records in number order
+
+        Raises:
+            ValueError: If count exceeds the unique problems available
         """
         if problem_types is None:
             problem_types = ["derivative", "integral", "limit"]
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if numbers is None:
+            numbers = range(1, count + 1)
+        elif numbers.step != 1 or (
+            numbers and (numbers.start < 1 or numbers.stop > count + 1)
+        ):
+            raise ValueError(f"numbers must be a step-1 range within 1..{count}")
+        elif unique and numbers != range(1, count + 1):
+            raise ValueError("unique sets cannot be generated in slices")
+        if vectorized and difficulty != "easy":
+            raise ValueError("vectorized generation supports easy difficulty only")
+        if unique:
+            if workers > 1 or vectorized:
+                raise ValueError("unique sets are generated in-process, unvectorized")
+            available = self._unique_capacity(problem_types, difficulty)
+            if available is not None and count > available:
+                raise ValueError(
+                    f"only {available} unique {difficulty} problems exist for "
+                    f"types {sorted(set(problem_types))}"
+                )
+
+        master_seed = self._rng.getrandbits(64)
+
+        if vectorized:
+            yield from self._iter_vectorized(
+                master_seed, count, numbers, problem_types
+            )
+            return
+
+        if unique:
+            dedup = DedupIndex()
+            for number in numbers:
+                yield self._generate_numbered_problem(
+                    master_seed, number, problem_types, difficulty, dedup
+                )
+            return
+
+        if workers == 1:
+            for number in numbers:
+                yield self._generate_numbered_problem(
+                    master_seed, number, problem_types, difficulty
+                )
+            return
+
+        chunksize = max(1, min(MAX_CHUNK_SIZE, len(numbers) // (workers * 4)))
+        chunks = (
+            range(start, min(start + chunksize, numbers.stop))
+            for start in range(numbers.start, numbers.stop, chunksize)
+        )
+        options = self._worker_options()
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            try:
+                for chunk in chunks:
+                    pending.append(
+                        executor.submit(
+                            _generate_seeded_chunk,
+                            options,
+                            master_seed,
+                            problem_types,
+                            difficulty,
+                            chunk,
+                        )
+                    )
+                    if len(pending) >= workers * 2:
+                        yield from self._collect_chunk(pending.popleft())
+                while pending:
+                    yield from self._collect_chunk(pending.popleft())
+            finally:
+                # Consumer stopped early: drop chunks that have not started
+                for future in pending:
+                    future.cancel()
+
+    def unique_problem_count(self, problem_type: str, difficulty: str) -> Optional[int]:
+        """
+        Number of distinct problems of a type and difficulty
 
-        problems = []
-        for i in range(count):
-            problem_type = random.choice(problem_types)
+        Args:
+            problem_type: 'derivative', 'integral', or 'limit'
+            difficulty: 'easy', 'medium', or 'hard'
 
-            if problem_type == "derivative":
-                problem = self.generate_derivative_problem(difficulty)
-            elif problem_type == "integral":
-                problem = self.generate_integral_problem(difficulty)
-            else:
-                problem = self.generate_limit_problem(difficulty)
+        Returns:
+            Size of the problem space, or None when it is too large to
+            enumerate (hard integrals)
+        """
+        return _family_size(problem_type, difficulty)
+
+    def _unique_capacity(
+        self, problem_types: List[str], difficulty: str
+    ) -> Optional[int]:
+        """Distinct problems across several types (None if unbounded)"""
+        counts = [
+            self.unique_problem_count(problem_type, difficulty)
+            for problem_type in set(problem_types)
+        ]
+        return None if None in counts else sum(counts)
 
-            problem["number"] = i + 1
-            problems.append(problem)
+    def _iter_vectorized(
+        self,
+        master_seed: int,
+        count: int,
+        numbers: range,
+        problem_types: List[str],
+    ) -> Iterator[Problem]:
+        """
+        Generate easy problems in NumPy batches, each from its own stream
 
+        Batch k always covers problems k*VECTOR_BATCH_SIZE+1 onwards, so a
+        slice of the set draws the batches it overlaps and keeps its part.
+        """
+        import numpy as np
+
+        from .vectorized import draw_easy_batch, solve_easy_batch
+
+        if not numbers:
+            return
+        first = (numbers.start - 1) // VECTOR_BATCH_SIZE * VECTOR_BATCH_SIZE
+        for start in range(first, numbers.stop - 1, VECTOR_BATCH_SIZE):
+            rng = np.random.default_rng([master_seed, start])
+            with self._stage("draw", ALL, "easy"):
+                drawn = draw_easy_batch(
+                    rng, min(VECTOR_BATCH_SIZE, count - start), len(problem_types)
+                )
+            with self._stage("solve", ALL, "easy"):
+                problems = solve_easy_batch(
+                    problem_types, *drawn, first_number=start + 1, fields=self.fields
+                )
+            yield from problems[
+                max(0, numbers.start - 1 - start) : numbers.stop - 1 - start
+            ]
+
+    def _collect_chunk(self, future) -> List[Problem]:
+        """Wait for a worker chunk and merge its solve stats and timings"""
+        problems, solve_stats, profiler = future.result()
+        self.solve_stats.merge(solve_stats)
+        if profiler is not None:
+            self.profiler.merge(profiler)
         return problems
 
-    def _generate_polynomial(self, max_degree: int = 3) -> sp.Expr:
-        """Generate a random polynomial"""
-        degree = random.randint(1, max_degree)
-        coeffs = [random.randint(-5, 5) for _ in range(degree + 1)]
+    def _generate_numbered_problem(
+        self,
+        master_seed: int,
+        number: int,
+        problem_types: List[str],
+        difficulty: str,
+        dedup: Optional[DedupIndex] = None,
+    ) -> Problem:
+        """Generate problem `number` of a set from its derived seed"""
+        generator = self._spawn(derive_seed(master_seed, number))
+        problem_type = generator._rng.choice(problem_types)
+
+        if dedup is not None:
+            generator._dedup = dedup
+            if dedup.exhausted(self, problem_type, difficulty):
+                # Every problem of this type is used: pick among the others
+                problem_type = generator._rng.choice(
+                    [
+                        name
+                        for name in problem_types
+                        if not dedup.exhausted(self, name, difficulty)
+                    ]
+                )
+
+        # The record itself, not the dict the public generate_* methods return
+        if problem_type not in ("derivative", "integral"):
+            problem_type = "limit"
+        problem = generator._generate_within_budget(problem_type, difficulty)
+
+        problem["number"] = number
+        return problem
+
+    def _worker_options(self) -> Dict:
+        """Constructor arguments that recreate this generator in a worker"""
+        return {
+            "solve_timeout": self.solve_timeout,
+            "max_redraws": self.max_redraws,
+            "cache": self.cache,
+            "bank": self.bank,
+            # Workers fill their own profiler, merged back per chunk
+            "profiler": Profiler() if self.profiler is not None else None,
+            "fields": self.fields,
+        }
+
+    def _spawn(self, seed: int) -> "ProblemGenerator":
+        """Return a copy of this generator with its own random stream"""
+        generator = copy.copy(self)
+        generator._rng = random.Random(seed)
+        return generator
+
+    def _stage(self, name: str, problem_type: str, difficulty: str):
+        """Context that times a stage when a profiler is attached"""
+        if self.profiler is None:
+            return NO_STAGE
+        return self.profiler.stage(name, problem_type, difficulty)
+
+    def _generate_within_budget(self, problem_type: str, difficulty: str) -> Problem:
+        """
+        Draw and solve a problem, redrawing whenever the solve overruns
+
+        Args:
+            problem_type: 'derivative', 'integral', or 'limit'
+            difficulty: 'easy', 'medium', or 'hard'
+
+        Returns:
+            Problem record with statement, solution, and steps
+        """
+        if self.solve_timeout is not None:
+            for _ in range(self.max_redraws):
+                with self._stage("draw", problem_type, difficulty):
+                    spec = self._next_spec(problem_type, difficulty)
+                try:
+                    with time_limit(self.solve_timeout):
+                        return self._solve_spec(problem_type, difficulty, spec)
+                except SolveTimeout:
+                    self.solve_stats.record_timeout(problem_type, difficulty)
+                    if self._dedup is not None:
+                        # Nothing was emitted: keep the problem available
+                        self._dedup.release(self, problem_type, difficulty, spec)
+
+        with self._stage("draw", problem_type, difficulty):
+            spec = self._next_spec(problem_type, difficulty)
+        return self._solve_spec(problem_type, difficulty, spec)
+
+    def _next_spec(self, problem_type: str, difficulty: str) -> Tuple:
+        """Draw a spec, avoiding problems already in the set if deduplicating"""
+        if self._dedup is not None:
+            return self._dedup.draw(self, problem_type, difficulty)
+        return self._draw_spec(problem_type, difficulty)
+
+    def _solve_spec(self, problem_type: str, difficulty: str, spec: Tuple) -> Problem:
+        """Serve a drawn problem from the bank, or build and solve it"""
+        if difficulty == "easy":
+            # Plain polynomials: solved on their coefficients, without SymPy
+            return self._solve_polynomial(problem_type, spec)
+
+        if self.bank is not None:
+            with self._stage("bank", problem_type, difficulty):
+                fields = self.bank.get(problem_type, difficulty, spec)
+            if fields is not None:
+                return self._stored_problem(problem_type, difficulty, fields)
+
+        with self._stage("build", problem_type, difficulty):
+            instance = self._instantiate(problem_type, difficulty, spec)
+            if instance is None:
+                drawn, solve = self._build_draw(problem_type, difficulty, spec), None
+            else:
+                drawn, solve = instance
+        return self._solve_cached(problem_type, difficulty, drawn, solve)
+
+    def _solve_cached(
+        self,
+        problem_type: str,
+        difficulty: str,
+        drawn: Tuple,
+        template_solve: Optional[Callable[[], sp.Expr]] = None,
+    ) -> Problem:
+        """Serve a drawn problem from the solution cache, solving it on a miss"""
+        solve = getattr(self, f"_solve_{problem_type}")
+        if template_solve is not None:
+            solve = partial(solve, template_solve=template_solve)
+        if self.cache is None:
+            return solve(*drawn, difficulty)
+
+        function = drawn[0]
+        point = drawn[1] if len(drawn) > 1 else None
+        with self._stage("cache", problem_type, difficulty):
+            key = SolutionCache.make_key(
+                problem_type, difficulty, sp.srepr(function), point
+            )
+            fields = self.cache.get(key)
+        if fields is not None:
+            return self._stored_problem(problem_type, difficulty, fields)
+
+        # Cache complete problems, so the entry serves a run of any format
+        requested, self.fields = self.fields, select_fields()
+        try:
+            problem = solve(*drawn, difficulty)
+        finally:
+            self.fields = requested
+        fields = {
+            name: value
+            for name, value in problem.items()
+            if name not in ("type", "difficulty")
+        }
+        with self._stage("cache", problem_type, difficulty):
+            self.cache.put(key, fields)
+        if len(self.fields) < len(FIELDS):
+            return self._stored_problem(problem_type, difficulty, fields)
+        return problem
+
+    def _stored_problem(
+        self, problem_type: str, difficulty: str, fields: Dict
+    ) -> Problem:
+        """Rebuild a problem from bank or cache fields, keeping the requested ones"""
+        if len(self.fields) < len(FIELDS):
+            fields = {
+                name: value for name, value in fields.items() if name in self.fields
+            }
+        return Problem(fields, type=problem_type, difficulty=difficulty)
+
+    def _draw_spec(self, problem_type: str, difficulty: str) -> Tuple:
+        """
+        Draw a random problem as plain data
+
+        A spec holds coefficient tuples and choice indices only. It
+        identifies the problem exactly without building any SymPy
+        expression, so it also keys the problem bank.
+
+        Args:
+            problem_type: 'derivative', 'integral', or 'limit'
+            difficulty: 'easy', 'medium', or 'hard'
+
+        Returns:
+            Spec tuple for _build_draw
+        """
+        if problem_type == "derivative":
+            if difficulty == "easy":
+                return (self._draw_coefficients(max_degree=2),)
+            if difficulty == "medium":
+                return (
+                    self._draw_coefficients(max_degree=3),
+                    self._rng.randrange(len(TRIG_FUNCTIONS)),
+                )
+            return (self._rng.randrange(COMPLEX_FUNCTION_COUNT),)
+
+        if problem_type == "integral":
+            if difficulty == "easy":
+                return (self._draw_coefficients(max_degree=2),)
+            if difficulty == "medium":
+                return (
+                    self._draw_coefficients(max_degree=2),
+                    self._rng.randrange(len(TRIG_FUNCTIONS)),
+                )
+            return (
+                self._draw_coefficients(max_degree=2),
+                self._draw_coefficients(max_degree=2),
+            )
+
+        # limit: the point is drawn first and only kept for easy problems
+        point = self._rng.randrange(len(LIMIT_POINTS))
+        if difficulty == "easy":
+            return (point, self._draw_coefficients(max_degree=2))
+        return ()
+
+    @staticmethod
+    def _enumerate_specs(
+        problem_type: str, difficulty: str
+    ) -> Optional[Iterator[Tuple]]:
+        """
+        Every spec _draw_spec can return for a type and difficulty
+
+        Args:
+            problem_type: 'derivative', 'integral', or 'limit'
+            difficulty: 'easy', 'medium', or 'hard'
+
+        Returns:
+            Iterator over the specs, or None when the space is too large to
+            list (hard integrals pair two random polynomials)
+        """
+        trig = range(len(TRIG_FUNCTIONS))
+        if problem_type == "derivative":
+            if difficulty == "easy":
+                return ((coeffs,) for coeffs in _coefficient_tuples(2))
+            if difficulty == "medium":
+                return product(_coefficient_tuples(3), trig)
+            return ((index,) for index in range(COMPLEX_FUNCTION_COUNT))
+
+        if problem_type == "integral":
+            if difficulty == "easy":
+                return ((coeffs,) for coeffs in _coefficient_tuples(2))
+            if difficulty == "medium":
+                return product(_coefficient_tuples(2), trig)
+            return None
+
+        if difficulty == "easy":
+            return product(range(len(LIMIT_POINTS)), _coefficient_tuples(2))
+        return iter([()])
+
+    def _instantiate(
+        self, problem_type: str, difficulty: str, spec: Tuple
+    ) -> Optional[Tuple[Tuple, Callable[[], sp.Expr]]]:
+        """
+        Build a drawn spec from its family's template
+
+        Medium derivatives and integrals and hard derivatives are solved
+        once per family with symbolic coefficients and specialized by
+        substitution, so only hard integrals still go through SymPy's
+        solvers per problem. Limits need no template: solve_limit memoizes
+        the fixed medium and hard functions.
+
+        Returns:
+            The _build_draw result and a function substituting into the
+            template's solution, or None when the family has no template
+        """
+        if difficulty == "medium" and problem_type != "limit":
+            coeffs, trig = spec
+            shape, values = (len(coeffs) - 1, trig), coeffs
+        elif problem_type == "derivative" and difficulty == "hard":
+            shape, values = spec, ()
+        else:
+            return None
+        template = _family_template(problem_type, difficulty, shape)
+        drawn = (template.function_at(values),)
+        return drawn, partial(template.solution_at, values)
+
+    def _build_draw(self, problem_type: str, difficulty: str, spec: Tuple) -> Tuple:
+        """Build the SymPy solve arguments of a drawn spec"""
+        if problem_type == "derivative":
+            if difficulty == "easy":
+                return (self._polynomial(spec[0]),)
+            if difficulty == "medium":
+                return (self._polynomial(spec[0]) + TRIG_FUNCTIONS[spec[1]](self.x),)
+            return (self._complex_function(spec[0]),)
+
+        if problem_type == "integral":
+            if difficulty == "easy":
+                return (self._polynomial(spec[0]),)
+            if difficulty == "medium":
+                return (self._polynomial(spec[0]) * TRIG_FUNCTIONS[spec[1]](self.x),)
+            # Rational function
+            return (self._polynomial(spec[0]) / self._polynomial(spec[1]),)
+
+        if difficulty == "easy":
+            return self._polynomial(spec[1]), LIMIT_POINTS[spec[0]]
+        if difficulty == "medium":
+            # Create indeterminate form
+            numerator = self.x**2 - 1
+            denominator = self.x - 1
+            return numerator / denominator, 1
+        return sin(self.x) / self.x, 0
+
+    def _solve_polynomial(self, problem_type: str, spec: Tuple) -> Problem:
+        """Solve an easy problem on its coefficients, matching SymPy's output"""
+        function = Polynomial(spec[-1])
+        steps = "steps" in self.fields
+        problem = Problem(type=problem_type, difficulty="easy")
+        with self._stage("render", problem_type, "easy"):
+            text = self._render_pair(
+                problem, "function", function, str, Polynomial.latex
+            )
+
+        if problem_type == "derivative":
+            with self._stage("solve", "derivative", "easy"):
+                with self.solve_stats.timer("derivative", "easy"):
+                    derivative = function.diff()
+            with self._stage("render", "derivative", "easy"):
+                solution = self._render_pair(
+                    problem, "solution", derivative, str, Polynomial.latex
+                )
+            if steps:
+                with self._stage("steps", "derivative", "easy"):
+                    problem["steps"] = [
+                        f"Given function: f(x) = {text}",
+                        "Apply derivative rules:",
+                        *polynomial_derivative_steps(function),
+                        f"Result: f'(x) = {solution}",
+                    ]
+        elif problem_type == "integral":
+            with self._stage("solve", "integral", "easy"):
+                with self.solve_stats.timer("integral", "easy"):
+                    integral = function.integrate()
+            with self._stage("render", "integral", "easy"):
+                solution = self._render_pair(
+                    problem, "solution", integral, str, Polynomial.latex
+                )
+            if steps:
+                with self._stage("steps", "integral", "easy"):
+                    problem["steps"] = [
+                        f"Given function: f(x) = {text}",
+                        "Apply integration rules:",
+                        *polynomial_integral_steps(function),
+                        f"Result: ∫f(x)dx = {solution} + C",
+                    ]
+        else:  # limit
+            point = POLYNOMIAL_LIMIT_POINTS[spec[0]]
+            with self._stage("solve", "limit", "easy"):
+                with self.solve_stats.timer("limit", "easy"):
+                    limit_result = function.limit(point)
+            # Polynomials are continuous; at infinity the leading term decides
+            tier = (
+                "leading_term"
+                if math.isinf(point) and function.degree > 0
+                else "substitution"
+            )
+            self.solve_stats.record_limit_tier("easy", tier)
+            with self._stage("render", "limit", "easy"):
+                problem["point"] = format_number(point)
+                solution = self._render_pair(
+                    problem,
+                    "solution",
+                    limit_result,
+                    format_number,
+                    format_number_latex,
+                )
+            if steps:
+                with self._stage("steps", "limit", "easy"):
+                    substitution = format_number(function.evaluate(point))
+                    problem["steps"] = [
+                        f"Given function: f(x) = {text}",
+                        f"Find limit as x → {problem['point']}",
+                        f"Direct substitution: {substitution}",
+                        f"Result: lim(x→{problem['point']}) f(x) = {solution}",
+                    ]
+        return problem
+
+    def _render_pair(
+        self,
+        problem: Problem,
+        name: str,
+        value,
+        text: Callable[..., str],
+        latex: Callable[..., str],
+    ) -> Optional[str]:
+        """
+        Render the requested text and LaTeX fields of one value into a problem
+
+        Args:
+            problem: Problem to fill in
+            name: 'function' or 'solution'; the LaTeX field is name + '_latex'
+            value: Expression or polynomial to render
+            text: Renders the text form
+            latex: Renders the LaTeX form
+
+        Returns:
+            The text form, also rendered when only the steps need it, or None
+        """
+        fields = self.fields
+        rendered = None
+        if name in fields or "steps" in fields:
+            rendered = text(value)
+            if name in fields:
+                problem[name] = rendered
+        if name + "_latex" in fields:
+            problem[name + "_latex"] = latex(value)
+        return rendered
+
+    def _solve_derivative(
+        self,
+        function: sp.Expr,
+        difficulty: str,
+        template_solve: Optional[Callable[[], sp.Expr]] = None,
+    ) -> Problem:
+        """Differentiate once and build the problem from that single result"""
+        with self._stage("solve", "derivative", difficulty):
+            with self.solve_stats.timer("derivative", difficulty):
+                if template_solve is not None:
+                    derivative = template_solve()
+                else:
+                    # The step engine's walk also records the steps
+                    derivative, _ = derivative_steps(function)
+
+        problem = Problem(type="derivative", difficulty=difficulty)
+        with self._stage("render", "derivative", difficulty):
+            self._render_pair(problem, "function", function, render_str, render_latex)
+            self._render_pair(problem, "solution", derivative, render_str, render_latex)
+        if "steps" in self.fields:
+            with self._stage("steps", "derivative", difficulty):
+                problem["steps"] = self._generate_derivative_steps(function, derivative)
+        return problem
+
+    def _solve_integral(
+        self,
+        function: sp.Expr,
+        difficulty: str,
+        template_solve: Optional[Callable[[], sp.Expr]] = None,
+    ) -> Problem:
+        """Integrate once and build the problem from that single result"""
+        with self._stage("solve", "integral", difficulty):
+            with self.solve_stats.timer("integral", difficulty):
+                if template_solve is not None:
+                    integral = template_solve()
+                elif difficulty == "hard":
+                    # Rational integrands: skip integrate's heuristics
+                    integral = ratint(function, self.x)
+                else:
+                    integral = integrate(function, self.x)
+
+        problem = Problem(type="integral", difficulty=difficulty)
+        with self._stage("render", "integral", difficulty):
+            self._render_pair(problem, "function", function, render_str, render_latex)
+            self._render_pair(problem, "solution", integral, render_str, render_latex)
+        if "steps" in self.fields:
+            with self._stage("steps", "integral", difficulty):
+                problem["steps"] = self._generate_integral_steps(function, integral)
+        return problem
+
+    def _solve_limit(self, function: sp.Expr, point, difficulty: str) -> Problem:
+        """Evaluate the limit once and build the problem from that single result"""
+        with self._stage("solve", "limit", difficulty):
+            with self.solve_stats.timer("limit", difficulty):
+                solution = solve_limit(function, point)
+        self.solve_stats.record_limit_tier(difficulty, solution.tier)
+
+        problem = Problem(type="limit", difficulty=difficulty, point=str(point))
+        with self._stage("render", "limit", difficulty):
+            self._render_pair(problem, "function", function, render_str, render_latex)
+            self._render_pair(
+                problem, "solution", solution.value, _limit_str, _limit_latex
+            )
+        if "steps" in self.fields:
+            with self._stage("steps", "limit", difficulty):
+                problem["steps"] = self._generate_limit_steps(function, point, solution)
+        return problem
+
+    def _draw_coefficients(self, max_degree: int = 3) -> Tuple[int, ...]:
+        """Draw the coefficients of a random polynomial, constant term first"""
+        degree = self._rng.randint(1, max_degree)
+        coeffs = [
+            self._rng.randint(MIN_COEFFICIENT, MAX_COEFFICIENT)
+            for _ in range(degree + 1)
+        ]
         # Ensure leading coefficient is not zero
         if coeffs[-1] == 0:
-            coeffs[-1] = random.choice([1, 2, -1, -2])
+            coeffs[-1] = self._rng.choice(LEADING_REPLACEMENTS)
+        return tuple(coeffs)
 
-        poly = sum(c * self.x**i for i, c in enumerate(coeffs))
-        return poly
+    def _polynomial(self, coeffs: Tuple[int, ...]) -> sp.Expr:
+        """Build a polynomial from its coefficients, constant term first"""
+        return sum(c * self.x**i for i, c in enumerate(coeffs))
 
-    def _generate_complex_function(self) -> sp.Expr:
-        """Generate a more complex function"""
+    def _complex_function(self, index: int) -> sp.Expr:
+        """Build one of the fixed hard derivative functions"""
         choices = [
             exp(self.x) * sin(self.x),
             self.x * log(self.x),
             sin(self.x) * cos(self.x),
             exp(self.x**2),
         ]
-        return random.choice(choices)
+        return choices[index]
 
-    def _generate_rational_function(self) -> sp.Expr:
-        """Generate a rational function"""
-        numerator = self._generate_polynomial(max_degree=2)
-        denominator = self._generate_polynomial(max_degree=2)
-        return numerator / denominator
-
-    def _generate_derivative_steps(self, function: sp.Expr) -> List[str]:
+    def _generate_derivative_steps(
+        self, function: sp.Expr, derivative: sp.Expr
+    ) -> List[str]:
         """Generate step-by-step solution for derivative"""
-        steps = [
-            f"Given function: f(x) = {function}",
+        _, rules = derivative_steps(function)
+        return [
+            f"Given function: f(x) = {render_str(function)}",
             "Apply derivative rules:",
+            *rules,
+            f"Result: f'(x) = {render_str(derivative)}",
         ]
 
-        # Add specific rules based on function structure
-        if function.has(sin):
-            steps.append("- Derivative of sin(x) is cos(x)")
-        if function.has(cos):
-            steps.append("- Derivative of cos(x) is -sin(x)")
-        if function.has(exp):
-            steps.append("- Derivative of e^x is e^x")
-
-        derivative = diff(function, self.x)
-        steps.append(f"Result: f'(x) = {derivative}")
-
-        return steps
-
-    def _generate_integral_steps(self, function: sp.Expr) -> List[str]:
+    def _generate_integral_steps(
+        self, function: sp.Expr, integral: sp.Expr
+    ) -> List[str]:
         """Generate step-by-step solution for integral"""
-        steps = [
-            f"Given function: f(x) = {function}",
+        return [
+            f"Given function: f(x) = {render_str(function)}",
             "Apply integration rules:",
+            *integral_steps(function, integral),
+            f"Result: ∫f(x)dx = {render_str(integral)} + C",
         ]
 
-        integral = integrate(function, self.x)
-        steps.append(f"Result: ∫f(x)dx = {integral} + C")
-
-        return steps
-
-    def _generate_limit_steps(self, function: sp.Expr, point) -> List[str]:
+    def _generate_limit_steps(
+        self, function: sp.Expr, point, solution: LimitSolution
+    ) -> List[str]:
         """Generate step-by-step solution for limit"""
         steps = [
-            f"Given function: f(x) = {function}",
+            f"Given function: f(x) = {render_str(function)}",
             f"Find limit as x → {point}",
         ]
 
-        # Check for indeterminate form
-        try:
-            direct_sub = function.subs(self.x, point)
-            steps.append(f"Direct substitution: {direct_sub}")
-        except Exception:
+        # The solver's first tier already substituted
+        if solution.substitution is not None:
+            steps.append(f"Direct substitution: {render_str(solution.substitution)}")
+        else:
             steps.append("Direct substitution leads to indeterminate form")
             steps.append("Apply L'Hôpital's rule or algebraic manipulation")
 
-        try:
-            result = limit(function, self.x, point)
-            steps.append(f"Result: lim(x→{point}) f(x) = {result}")
-        except Exception:
+        if solution.value is not None:
+            steps.append(f"Result: lim(x→{point}) f(x) = {render_str(solution.value)}")
+        else:
             steps.append("Limit is undefined or does not exist")
 
         return steps
@@ -0,0 +1,164 @@
+"""
+Tiered limit solver
+Resolves limits by substitution, leading terms or cancellation before falling back to sympy.limit
+"""
+
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import sympy as sp
+
+x = sp.Symbol("x")
+
+# Tiers in the order they are tried
+TIERS = ("substitution", "leading_term", "cancellation", "gruntz")
+
+# Limits kept per process. Medium and hard limits are a handful of fixed
+# functions, so after the first problem of each every limit is a lookup.
+LIMIT_CACHE_SIZE = 1024
+
+
+class LimitSolution(NamedTuple):
+    """A solved limit and how it was resolved"""
+
+    # The limit, or None if sympy.limit failed
+    value: Optional[sp.Expr]
+    # Tier that produced the value
+    tier: str
+    # Result of direct substitution, or None if substituting raised
+    substitution: Optional[sp.Expr]
+
+
+# Functions continuous wherever they take a finite value, approached along
+# the real line. sign, floor, Heaviside, Piecewise and the like are not.
+CONTINUOUS_FUNCTIONS = (
+    sp.sin,
+    sp.cos,
+    sp.tan,
+    sp.exp,
+    sp.log,
+    sp.sinh,
+    sp.cosh,
+    sp.tanh,
+    sp.asin,
+    sp.acos,
+    sp.atan,
+    sp.Abs,
+)
+
+
+def _continuous(function: sp.Expr) -> bool:
+    """
+    Whether a function is built only from continuous pieces
+
+    Sums, products, constant powers (so polynomials and rational
+    functions) and CONTINUOUS_FUNCTIONS of x qualify; a finite
+    substitution into such a function is its limit.
+    """
+    for node in sp.preorder_traversal(function):
+        if node.is_Atom or isinstance(node, (sp.Add, sp.Mul)):
+            continue
+        if isinstance(node, sp.Pow):
+            base, exponent = node.args
+            if not exponent.is_number and not (base.is_number and base.is_positive):
+                return False
+            continue
+        if not isinstance(node, CONTINUOUS_FUNCTIONS):
+            return False
+    return True
+
+
+def _finite(value: Optional[sp.Expr]) -> bool:
+    """Whether a substituted value is a determinate, finite number"""
+    return value is not None and value.is_finite is True
+
+
+def _substitute(function: sp.Expr, point) -> Optional[sp.Expr]:
+    """Substitute the point for x, or None if that raises"""
+    try:
+        return function.subs(x, point)
+    except Exception:
+        return None
+
+
+def _leading_term_limit(function: sp.Expr, point) -> Optional[sp.Expr]:
+    """
+    Limit of a polynomial or rational function at ±oo from its leading terms
+
+    Returns:
+        The limit, or None if the function is not rational in x or the
+        point is finite
+    """
+    if point not in (sp.oo, -sp.oo):
+        return None
+    numerator, denominator = function.as_numer_denom()
+    if not (numerator.is_polynomial(x) and denominator.is_polynomial(x)):
+        return None
+    numerator, denominator = sp.Poly(numerator, x), sp.Poly(denominator, x)
+    excess = numerator.degree() - denominator.degree()
+    if excess < 0:
+        return sp.S.Zero
+    ratio = numerator.LC() / denominator.LC()
+    if excess == 0:
+        return ratio
+    # x**excess grows to ±oo with the sign of the point raised to excess
+    sign = sp.sign(ratio) * (-1 if point == -sp.oo and excess % 2 else 1)
+    return sign * sp.oo
+
+
+def _cancellation_limit(function: sp.Expr, point) -> Optional[sp.Expr]:
+    """
+    Limit of a rational function at a removable 0/0 point
+
+    Returns:
+        The value of the cancelled function at the point, or None if the
+        function is not rational or the value is not finite
+    """
+    if not function.is_rational_function(x):
+        return None
+    value = _substitute(sp.cancel(function), point)
+    return value if _finite(value) else None
+
+
+@lru_cache(maxsize=LIMIT_CACHE_SIZE)
+def solve_limit(function: sp.Expr, point) -> LimitSolution:
+    """
+    Limit of a function of x, trying cheap tiers before sympy.limit
+
+    1. Direct substitution, if the function is built from continuous
+       pieces (see CONTINUOUS_FUNCTIONS) and the value is finite and
+       determinate.
+    2. At ±oo, polynomials and rational functions by their degrees and
+       leading coefficients.
+    3. At a finite point, rational functions by cancelling common factors
+       and substituting again.
+    4. Everything else with sympy.limit (the Gruntz algorithm).
+
+    Results are memoized per process; count tiers per problem with
+    SolveStats.record_limit_tier.
+
+    Args:
+        function: Function of x
+        point: Limit point (number, oo or -oo)
+
+    Returns:
+        The limit, the tier that resolved it and the direct substitution
+    """
+    substitution = _substitute(function, point)
+    if _finite(substitution) and _continuous(function):
+        return LimitSolution(substitution, "substitution", substitution)
+
+    value = _leading_term_limit(function, point)
+    if value is not None:
+        return LimitSolution(value, "leading_term", substitution)
+
+    if point not in (sp.oo, -sp.oo):
+        value = _cancellation_limit(function, point)
+        if value is not None:
+            return LimitSolution(value, "cancellation", substitution)
+
+    try:
+        value = sp.limit(function, x, point)
+    except Exception:
+        value = None
+    return LimitSolution(value, "gruntz", substitution)
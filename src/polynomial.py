@@ -0,0 +1,204 @@
+"""
+Coefficient-array polynomials
+Exact calculus and SymPy-compatible printing for univariate polynomials,
+without building SymPy expressions
+"""
+
+import math
+from fractions import Fraction
+from numbers import Rational
+from typing import List, Sequence, Tuple, Union
+
+Number = Union[int, Fraction]
+
+
+def _exact(value: Number) -> Number:
+    """Collapse Fractions with denominator 1 to int"""
+    if isinstance(value, Fraction) and value.denominator == 1:
+        return value.numerator
+    return value
+
+
+def format_number(value) -> str:
+    """Print an exact number, ±infinity or NaN the way SymPy's str() does"""
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "nan"
+        return "oo" if value > 0 else "-oo"
+    return str(_exact(value))
+
+
+def format_number_latex(value) -> str:
+    """Print an exact number, ±infinity or NaN the way sympy.latex() does"""
+    if isinstance(value, float):
+        if math.isnan(value):
+            return r"\text{NaN}"
+        return r"\infty" if value > 0 else r"-\infty"
+    value = _exact(value)
+    if isinstance(value, Fraction):
+        sign = "- " if value < 0 else ""
+        return f"{sign}\\frac{{{abs(value.numerator)}}}{{{value.denominator}}}"
+    return str(value)
+
+
+class Polynomial:
+    """
+    Univariate polynomial in x with exact rational coefficients
+
+    Coefficients are stored constant term first, with trailing zeros
+    removed. Derivatives, antiderivatives, values and limits are computed
+    on the coefficients, and str() and latex() print exactly what SymPy
+    prints for the equivalent `sum(c * x**i)` expression. SymPy is only
+    imported by as_expr().
+    """
+
+    __slots__ = ("coeffs",)
+
+    def __init__(self, coeffs: Sequence[Number]):
+        """
+        Initialize the polynomial
+
+        Args:
+            coeffs: Integer or Fraction coefficients, constant term first
+        """
+        coeffs = [_exact(c) for c in coeffs]
+        while coeffs and coeffs[-1] == 0:
+            coeffs.pop()
+        self.coeffs: Tuple[Number, ...] = tuple(coeffs)
+
+    @property
+    def degree(self) -> int:
+        """Degree of the polynomial (-1 for the zero polynomial)"""
+        return len(self.coeffs) - 1
+
+    def diff(self) -> "Polynomial":
+        """Derivative with respect to x"""
+        return Polynomial([i * c for i, c in enumerate(self.coeffs) if i])
+
+    def integrate(self) -> "Polynomial":
+        """Antiderivative with respect to x, with zero constant of integration"""
+        return Polynomial(
+            [0] + [Fraction(c, i + 1) for i, c in enumerate(self.coeffs)]
+        )
+
+    def evaluate(self, point) -> Union[Number, float]:
+        """
+        Substitute a value for x, term by term
+
+        Args:
+            point: Exact number, or math.inf / -math.inf
+
+        Returns:
+            Exact value, or ±inf or NaN when substituting an infinity
+            (opposite infinite terms give NaN, as in SymPy)
+        """
+        if isinstance(point, Rational):
+            return _exact(sum(c * point**i for i, c in enumerate(self.coeffs)))
+        return sum(c * point**i for i, c in enumerate(self.coeffs) if c)
+
+    def limit(self, point) -> Union[Number, float]:
+        """
+        Limit as x approaches a point
+
+        Args:
+            point: Exact number, or math.inf / -math.inf
+
+        Returns:
+            Exact value, or ±inf for a non-constant polynomial at infinity
+        """
+        if isinstance(point, Rational) or self.degree < 1:
+            return self.evaluate(point)
+        # The leading term dominates
+        return math.copysign(math.inf, self.coeffs[-1] * point**self.degree)
+
+    def as_expr(self, x=None):
+        """
+        Build the equivalent SymPy expression
+
+        Args:
+            x: SymPy symbol to use (default: Symbol('x'))
+
+        Returns:
+            sum(c * x**i) over the coefficients
+        """
+        import sympy as sp
+
+        if x is None:
+            x = sp.Symbol("x")
+        return sum(
+            (sp.Rational(c.numerator, c.denominator) if isinstance(c, Fraction) else c)
+            * x**i
+            for i, c in enumerate(self.coeffs)
+        )
+
+    def _ordered_terms(self) -> List[Tuple[int, Number]]:
+        """Non-zero (degree, coefficient) pairs in SymPy's printing order"""
+        terms = [(i, c) for i, c in reversed(list(enumerate(self.coeffs))) if c]
+        # SymPy prints a positive constant before a lone negative term: 3 - x**2
+        if len(terms) == 2 and terms[1][0] == 0 and terms[1][1] > 0 > terms[0][1]:
+            terms.reverse()
+        return terms
+
+    def monomials(self) -> List["Polynomial"]:
+        """Non-zero terms as single-term polynomials, in SymPy's printing order"""
+        return [Polynomial([0] * i + [c]) for i, c in self._ordered_terms()]
+
+    def __str__(self) -> str:
+        terms = self._ordered_terms()
+        if not terms:
+            return "0"
+
+        output = []
+        for i, c in terms:
+            if i == 0 and not output:
+                output.append(format_number(c))
+                continue
+            if i == 0:
+                body = format_number(abs(c))
+            else:
+                body = "x" if i == 1 else f"x**{i}"
+                c = Fraction(c)
+                if abs(c.numerator) != 1:
+                    body = f"{abs(c.numerator)}*{body}"
+                if c.denominator != 1:
+                    body = f"{body}/{c.denominator}"
+            if not output:
+                output.append(f"-{body}" if c < 0 else body)
+            else:
+                output.append(f" - {body}" if c < 0 else f" + {body}")
+        return "".join(output)
+
+    def latex(self) -> str:
+        """LaTeX form, as printed by sympy.latex()"""
+        terms = self._ordered_terms()
+        if not terms:
+            return "0"
+
+        output = []
+        for i, c in terms:
+            if i == 0 and not output:
+                output.append(format_number_latex(c))
+                continue
+            if i == 0:
+                body = format_number_latex(abs(c))
+            else:
+                body = "x" if i == 1 else f"x^{{{i}}}"
+                c = Fraction(c)
+                if abs(c.numerator) != 1:
+                    body = f"{abs(c.numerator)} {body}"
+                if c.denominator != 1:
+                    body = f"\\frac{{{body}}}{{{c.denominator}}}"
+            if not output:
+                output.append(f"- {body}" if c < 0 else body)
+            else:
+                output.append(f" - {body}" if c < 0 else f" + {body}")
+        return "".join(output)
+
+    def __repr__(self) -> str:
+        return f"Polynomial({list(self.coeffs)!r})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Polynomial) and self.coeffs == other.coeffs
+
+    def __hash__(self) -> int:
+        return hash(self.coeffs)
@@ -0,0 +1,199 @@
+"""
+Problem record
+A compact, dict-like record for one generated problem
+"""
+
+import sys
+from collections.abc import MutableMapping
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    ItemsView,
+    Iterable,
+    Iterator,
+    KeysView,
+    Optional,
+    ValuesView,
+)
+
+# Every field the generator produces, in the order they are emitted
+FIELDS = (
+    "type",
+    "difficulty",
+    "function",
+    "function_latex",
+    "point",
+    "solution",
+    "solution_latex",
+    "steps",
+    "number",
+)
+
+_FIELD_SET = frozenset(FIELDS)
+
+# Fields every problem carries, whichever fields are requested
+REQUIRED_FIELDS = frozenset(("type", "difficulty", "point", "number"))
+
+# Fields drawn from a handful of values: one string object per value is
+# shared by every problem, including problems unpickled from workers
+INTERNED_FIELDS = frozenset(("type", "difficulty", "point"))
+
+_UNSET = object()
+
+
+class Problem(MutableMapping):
+    """
+    One problem, stored in slots rather than a per-instance dict
+
+    Behaves as a dict of its fields: problem["solution"], get, items,
+    "point" in problem, del problem["number"], and equality with plain
+    dicts all work, so exporters and storage take either. Fields iterate
+    in FIELDS order, which is the order the generator fills them in, so
+    serialized output is unchanged. Keys outside FIELDS are kept in a side
+    dict created on first use. keys(), values() and items() are views of a
+    snapshot, so changes made while iterating them are not reflected.
+    """
+
+    __slots__ = FIELDS + ("_extra",)
+
+    def __init__(self, fields=(), **values: Any):
+        """
+        Initialize a problem
+
+        Args:
+            fields: Mapping or iterable of (key, value) pairs
+            **values: More fields, e.g. type="limit"
+        """
+        self._extra = None
+        if fields:
+            values = {**dict(fields), **values}
+        for key, value in values.items():
+            if key in _FIELD_SET:
+                if key in INTERNED_FIELDS and type(value) is str:
+                    value = sys.intern(value)
+                setattr(self, key, value)
+            else:
+                self[key] = value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _FIELD_SET:
+            if key in INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __reduce__(self):
+        # Rebuild through __init__ so unpickled problems share interned values
+        return type(self), (self.to_dict(),)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Copy the fields into a plain dict
+
+        Returns:
+            Dictionary of the set fields, in iteration order
+        """
+        fields = {}
+        for key in FIELDS:
+            value = getattr(self, key, _UNSET)
+            if value is not _UNSET:
+                fields[key] = value
+        if self._extra:
+            fields.update(self._extra)
+        return fields
+
+    # Exporters and storage walk every field of every problem: iterate a
+    # snapshot built in one pass rather than looking up each key in turn
+    def keys(self) -> KeysView:
+        return self.to_dict().keys()
+
+    def items(self) -> ItemsView:
+        return self.to_dict().items()
+
+    def values(self) -> ValuesView:
+        return self.to_dict().values()
+
+
+def select_fields(fields: Optional[Iterable[str]] = None) -> FrozenSet[str]:
+    """
+    Resolve which fields to compute for each problem
+
+    Args:
+        fields: Field names to compute (default: all of FIELDS); the
+            REQUIRED_FIELDS are always included
+
+    Returns:
+        The field names to compute
+
+    Raises:
+        ValueError: If a name is not one of FIELDS
+    """
+    if fields is None:
+        return _FIELD_SET
+    selected = frozenset(fields)
+    unknown = selected - _FIELD_SET
+    if unknown:
+        raise ValueError(
+            f"unknown fields: {', '.join(sorted(unknown))} "
+            f"(choose from {', '.join(FIELDS)})"
+        )
+    return selected | REQUIRED_FIELDS
+
+
+def json_default(value: Any) -> Dict[str, Any]:
+    """
+    Serialize Problem records for json.dump(s, default=json_default)
+
+    Args:
+        value: Object json cannot encode by itself
+
+    Returns:
+        The record's fields as a plain dict
+
+    Raises:
+        TypeError: If value is not a Problem, as json itself would
+    """
+    if isinstance(value, Problem):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
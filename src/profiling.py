@@ -0,0 +1,145 @@
+"""
+Per-stage timing instrumentation
+Records where generation time goes, per problem type and difficulty
+"""
+
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterable, Iterator, Tuple
+
+# Stages of one problem in pipeline order, then the whole-set stages: time
+# spent producing problems and time spent exporting them
+STAGES = (
+    "draw",
+    "build",
+    "bank",
+    "cache",
+    "solve",
+    "render",
+    "steps",
+    "generate",
+    "export",
+)
+
+# Type and difficulty of measurements that span the whole set
+ALL = "all"
+
+# Shared no-op context for stages of an unprofiled generator
+NO_STAGE = nullcontext()
+
+
+class Profiler:
+    """
+    Wall time and call counts per stage, problem type and difficulty
+
+    Pass one to ProblemGenerator(profiler=...) to instrument generation.
+    Worker processes record into their own copies, which are merged back
+    like solve stats.
+    """
+
+    def __init__(self):
+        """Initialize empty counters"""
+        self._totals: Dict[Tuple[str, str, str], float] = {}
+        self._calls: Dict[Tuple[str, str, str], int] = {}
+
+    @contextmanager
+    def stage(self, name: str, problem_type: str, difficulty: str) -> Iterator[None]:
+        """Record the wall time of the enclosed block, even if it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, problem_type, difficulty, time.perf_counter() - start)
+
+    def record(
+        self,
+        name: str,
+        problem_type: str,
+        difficulty: str,
+        seconds: float,
+        calls: int = 1,
+    ) -> None:
+        """Add time spent in a stage"""
+        key = (problem_type, difficulty, name)
+        self._totals[key] = self._totals.get(key, 0.0) + seconds
+        self._calls[key] = self._calls.get(key, 0) + calls
+
+    def iterate(
+        self, items: Iterable, name: str, problem_type: str = ALL, difficulty: str = ALL
+    ) -> Iterator:
+        """
+        Yield from an iterable, recording the time spent producing each item
+
+        Separates the time a lazy producer (such as iter_problems) spends
+        from the time its consumer (such as an exporter) spends.
+        """
+        iterator = iter(items)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                elapsed = time.perf_counter() - start
+                self.record(name, problem_type, difficulty, elapsed, calls=0)
+                return
+            self.record(name, problem_type, difficulty, time.perf_counter() - start)
+            yield item
+
+    def seconds(
+        self, name: str, problem_type: str = ALL, difficulty: str = ALL
+    ) -> float:
+        """Total time recorded for a stage"""
+        return self._totals.get((problem_type, difficulty, name), 0.0)
+
+    def merge(self, other: "Profiler") -> None:
+        """Add the counters of another Profiler"""
+        for (problem_type, difficulty, name), seconds in other._totals.items():
+            self.record(
+                name,
+                problem_type,
+                difficulty,
+                seconds,
+                other._calls[(problem_type, difficulty, name)],
+            )
+
+    def summary(self) -> Dict[str, Dict[str, Dict]]:
+        """
+        Summarize every recorded stage
+
+        Returns:
+            Mapping of 'type/difficulty' to stage name to calls, total and
+            mean seconds; stages in pipeline order
+        """
+        order = {name: index for index, name in enumerate(STAGES)}
+        # Per-problem rows first, whole-set rows last
+        keys = sorted(
+            self._totals,
+            key=lambda key: (
+                key[:2] == (ALL, ALL),
+                key[:2],
+                order.get(key[2], len(order)),
+            ),
+        )
+        summary: Dict[str, Dict[str, Dict]] = {}
+        for problem_type, difficulty, name in keys:
+            calls = self._calls[(problem_type, difficulty, name)]
+            seconds = self._totals[(problem_type, difficulty, name)]
+            summary.setdefault(f"{problem_type}/{difficulty}", {})[name] = {
+                "calls": calls,
+                "total": seconds,
+                "mean": seconds / calls if calls else 0.0,
+            }
+        return summary
+
+    def format_table(self) -> str:
+        """Render the summary as a plain-text table"""
+        lines = [
+            f"{'problem':<20}{'stage':<10}{'calls':>8}{'total ms':>12}{'mean ms':>10}"
+        ]
+        for key, stages in self.summary().items():
+            for name, row in stages.items():
+                lines.append(
+                    f"{key:<20}{name:<10}{row['calls']:>8}"
+                    f"{row['total'] * 1000:>12.2f}{row['mean'] * 1000:>10.3f}"
+                )
+        return "\n".join(lines)
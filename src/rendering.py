@@ -0,0 +1,42 @@
+"""
+Expression rendering
+Memoized printing of the SymPy expressions problems are built from
+"""
+
+from functools import lru_cache
+from typing import Dict
+
+import sympy as sp
+
+# Expressions whose printed forms are kept per process. Problems share many
+# sub-expressions (the same polynomials, sin(x), exp(x)*sin(x), ...), so a
+# few thousand entries cover nearly every repeat.
+RENDER_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def render_str(expression: sp.Basic) -> str:
+    """Memoized str() of a SymPy expression"""
+    return str(expression)
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def render_latex(expression: sp.Basic) -> str:
+    """Memoized sympy.latex() of a SymPy expression"""
+    return sp.latex(expression)
+
+
+def render_cache_info() -> Dict[str, Dict[str, int]]:
+    """
+    Hit and miss counts of the expression printing caches in this process
+
+    Returns:
+        Mapping of 'str' and 'latex' to hits, misses and current size
+    """
+    return {
+        name: {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+        for name, info in (
+            ("str", render_str.cache_info()),
+            ("latex", render_latex.cache_info()),
+        )
+    }
@@ -0,0 +1,370 @@
+"""
+Generation server
+Serves problem sets over HTTP from a pool of warm generator processes
+"""
+
+import asyncio
+import io
+import json
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .exporter import ProblemExporter
+from .problem import select_fields
+
+PROBLEM_TYPES = ["derivative", "integral", "limit"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+FORMATS = {
+    "json": "application/json",
+    "markdown": "text/markdown",
+    "latex": "application/x-latex",
+    "text": "text/plain",
+}
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+# Request limits: parameters are a handful of short values, so anything
+# larger is refused before it is buffered
+MAX_LINE_LENGTH = 8192
+MAX_HEADERS = 100
+MAX_BODY_SIZE = 16384
+
+# Per-process generator, created by the pool initializer and kept warm
+# across requests together with SymPy's and the generator's caches
+_worker_generator = None
+
+
+def _init_worker(generator_options: Dict) -> None:
+    """Pool initializer: import SymPy and warm up one generator per process"""
+    global _worker_generator
+    from .generator import ProblemGenerator
+
+    _worker_generator = ProblemGenerator(**generator_options)
+    warmup = _worker_generator._spawn(0)
+    for difficulty in DIFFICULTIES:
+        warmup.generate_derivative_problem(difficulty)
+        warmup.generate_integral_problem(difficulty)
+        warmup.generate_limit_problem(difficulty)
+
+
+def _render_request(params: Dict) -> str:
+    """Worker entry point: generate and render one request's problem set"""
+    generator = _worker_generator._spawn(params["seed"])
+    # Compute only the fields the requested format shows
+    fields = ProblemExporter.FORMAT_FIELDS[params["format"]]
+    generator.fields = select_fields(
+        name for name in fields if params["steps"] or name != "steps"
+    )
+    problems = generator.iter_problems(
+        count=params["count"],
+        problem_types=params["types"],
+        difficulty=params["difficulty"],
+    )
+
+    buffer = io.StringIO()
+    if params["format"] == "markdown":
+        ProblemExporter.write_markdown(problems, buffer, title=params["title"])
+    elif params["format"] == "latex":
+        ProblemExporter.write_latex(problems, buffer, title=params["title"])
+    elif params["format"] == "text":
+        ProblemExporter.write_text(problems, buffer)
+    else:  # json
+        ProblemExporter.write_json(problems, buffer)
+    return buffer.getvalue()
+
+
+def parse_params(raw: Dict, max_count: int) -> Dict:
+    """
+    Validate request parameters, mirroring the CLI options
+
+    Args:
+        raw: Parameters from the query string or JSON body
+        max_count: Largest problem count a single request may ask for
+
+    Returns:
+        Normalized parameters
+
+    Raises:
+        ValueError: If a parameter is missing its expected type or range
+    """
+    try:
+        count = int(raw.get("count", 5))
+        seed = raw.get("seed")
+        seed = int(seed) if seed not in (None, "") else None
+    except (TypeError, ValueError):
+        raise ValueError("count and seed must be integers")
+    if not 0 <= count <= max_count:
+        raise ValueError(f"count must be between 0 and {max_count}")
+
+    types = raw.get("types", PROBLEM_TYPES)
+    if isinstance(types, str):
+        types = [name for name in types.split(",") if name]
+    if (
+        not isinstance(types, list)
+        or not types
+        or any(name not in PROBLEM_TYPES for name in types)
+    ):
+        raise ValueError(f"types must be a non-empty subset of {PROBLEM_TYPES}")
+
+    difficulty = raw.get("difficulty", "medium")
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f"difficulty must be one of {DIFFICULTIES}")
+
+    output_format = raw.get("format", "json")
+    if output_format not in FORMATS:
+        raise ValueError(f"format must be one of {list(FORMATS)}")
+
+    steps = raw.get("steps", True)
+    if isinstance(steps, str):
+        steps = steps.lower() not in ("0", "false", "no")
+    if not isinstance(steps, bool):
+        raise ValueError("steps must be a boolean")
+
+    return {
+        "count": count,
+        "types": list(types),
+        "difficulty": difficulty,
+        "seed": seed,
+        "format": output_format,
+        "title": str(raw.get("title", "Math Problem Set")),
+        "steps": steps,
+    }
+
+
+class ProblemServer:
+    """
+    Asyncio HTTP server for problem generation
+
+    Endpoints:
+        GET  /health    -> {"status": "ok"}
+        GET  /generate  -> problem set; parameters in the query string
+        POST /generate  -> problem set; parameters in a JSON body
+
+    Parameters match the CLI: count, types, difficulty, seed, format,
+    title and steps (false for --no-steps). SymPy work runs in a process
+    pool whose workers keep a warm ProblemGenerator between requests.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        generator_options: Optional[Dict] = None,
+        max_count: int = 10000,
+    ):
+        """
+        Initialize the server
+
+        Args:
+            workers: Worker processes (default: CPU count)
+            generator_options: ProblemGenerator keyword arguments for each
+                worker, e.g. solve_timeout or cache
+            max_count: Largest problem count a single request may ask for
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.generator_options = generator_options or {}
+        self.max_count = max_count
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        socket_path: Optional[str] = None,
+    ) -> asyncio.AbstractServer:
+        """
+        Start the worker pool and begin accepting connections
+
+        Args:
+            host: Interface to bind for TCP
+            port: TCP port (0 picks a free port)
+            socket_path: Serve on this Unix socket instead of TCP
+
+        Returns:
+            The listening asyncio server
+        """
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.generator_options,),
+        )
+        # Start every worker now so warm-up happens before the first request
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, os.getpid)
+                for _ in range(self.workers)
+            )
+        )
+
+        if socket_path:
+            return await asyncio.start_unix_server(
+                self._handle_connection, socket_path, limit=MAX_LINE_LENGTH
+            )
+        return await asyncio.start_server(
+            self._handle_connection, host, port, limit=MAX_LINE_LENGTH
+        )
+
+    def close(self) -> None:
+        """Shut down the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve HTTP/1.1 requests on one connection until it closes"""
+        try:
+            while True:
+                # readline raises ValueError for lines over MAX_LINE_LENGTH
+                try:
+                    request_line = await reader.readline()
+                    if not request_line:
+                        break
+                    headers = await self._read_headers(reader)
+                    method, target, version = request_line.decode("latin-1").split()
+                    length = int(headers.get("content-length", 0))
+                    if length < 0:
+                        raise ValueError("negative content length")
+                except ValueError:
+                    await self._respond(writer, 400, *_error("malformed request"), False)
+                    break
+                if length > MAX_BODY_SIZE:
+                    await self._respond(
+                        writer,
+                        413,
+                        *_error(f"body larger than {MAX_BODY_SIZE} bytes"),
+                        False,
+                    )
+                    break
+                body = await reader.readexactly(length)
+
+                status, content_type, payload = await self._dispatch(
+                    method, target, body
+                )
+                keep_alive = (
+                    version == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                )
+                await self._respond(writer, status, content_type, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+        """Read header lines up to the blank line, at most MAX_HEADERS of them"""
+        headers = {}
+        for _ in range(MAX_HEADERS + 1):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        raise ValueError(f"more than {MAX_HEADERS} headers")
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> Tuple:
+        """Route one request and return status, content type and payload"""
+        url = urlsplit(target)
+        if url.path == "/health":
+            return 200, FORMATS["json"], b'{"status": "ok"}'
+        if url.path != "/generate":
+            return (404,) + _error("unknown path")
+        if method not in ("GET", "POST"):
+            return (405,) + _error("use GET or POST")
+
+        try:
+            if method == "POST":
+                raw = json.loads(body or b"{}")
+                if not isinstance(raw, dict):
+                    raise ValueError("JSON body must be an object")
+            else:
+                raw = {
+                    name: values[-1] for name, values in parse_qs(url.query).items()
+                }
+            params = parse_params(raw, self.max_count)
+        except ValueError as error:
+            return (400,) + _error(str(error))
+
+        loop = asyncio.get_running_loop()
+        try:
+            output = await loop.run_in_executor(
+                self._executor, _render_request, params
+            )
+        except Exception as error:
+            # Keep serving: report the failure to this client and the log
+            traceback.print_exc(file=sys.stderr)
+            return (500,) + _error(f"generation failed: {type(error).__name__}")
+        return 200, FORMATS[params["format"]], output.encode("utf-8")
+
+    @staticmethod
+    async def _respond(
+        writer: asyncio.StreamWriter,
+        status: int,
+        content_type: str,
+        payload: bytes,
+        keep_alive: bool,
+    ) -> None:
+        """Write one HTTP response"""
+        head = (
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: {content_type}; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + payload)
+        await writer.drain()
+
+
+def _error(message: str) -> Tuple[str, bytes]:
+    """JSON error payload"""
+    return FORMATS["json"], json.dumps({"error": message}).encode("utf-8")
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    socket_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    generator_options: Optional[Dict] = None,
+    max_count: int = 10000,
+) -> None:
+    """
+    Run a ProblemServer until interrupted
+
+    Args:
+        host: Interface to bind for TCP
+        port: TCP port
+        socket_path: Serve on this Unix socket instead of TCP
+        workers: Worker processes (default: CPU count)
+        generator_options: ProblemGenerator keyword arguments for each worker
+        max_count: Largest problem count a single request may ask for
+    """
+    server = ProblemServer(workers, generator_options, max_count)
+
+    async def run():
+        listener = await server.start(host, port, socket_path)
+        address = socket_path or f"http://{host}:{listener.sockets[0].getsockname()[1]}"
+        print(f"✓ Serving on {address} with {server.workers} workers", flush=True)
+        async with listener:
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
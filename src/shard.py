@@ -0,0 +1,160 @@
+"""
+Sharded generation
+Splits one seeded problem set across machines and merges the partial outputs
+"""
+
+import json
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, TextIO, Tuple
+
+from .problem import Problem
+
+PARTIAL_FORMAT = "math-problem-generator/partial"
+PARTIAL_VERSION = 2
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """
+    Parse a shard spec of the form I/N
+
+    Args:
+        text: Shard spec, 1 <= I <= N
+
+    Returns:
+        Shard index and shard count
+
+    Raises:
+        ValueError: If the spec is malformed or out of range
+    """
+    index, _, total = text.partition("/")
+    try:
+        index, total = int(index), int(total)
+    except ValueError:
+        raise ValueError(f"shard must look like I/N, got {text!r}")
+    if not 1 <= index <= total:
+        raise ValueError(f"shard index must be between 1 and {total}, got {index}")
+    return index, total
+
+
+def shard_numbers(index: int, total: int, count: int) -> range:
+    """
+    Problem numbers generated by one shard
+
+    Shards take contiguous, near-equal blocks in order, so shard 1 starts
+    at problem 1 and shard N ends at problem count.
+
+    Args:
+        index: Shard index, 1-based
+        total: Number of shards
+        count: Problems in the whole set
+
+    Returns:
+        Range of 1-based problem numbers
+    """
+    return range((index - 1) * count // total + 1, index * count // total + 1)
+
+
+def write_partial(
+    problems: Iterable[Dict], stream: TextIO, job: Dict, index: int, total: int
+) -> None:
+    """
+    Write one shard's problems as a partial output
+
+    A partial is JSON lines: a header identifying the job and shard and
+    giving the shard's problem count, then one problem per line.
+
+    Args:
+        problems: The shard's problems, in number order
+        stream: Text stream to write to
+        job: Generation options shared by every shard (count, seed, ...)
+        index: Shard index, 1-based
+        total: Number of shards
+    """
+    header = {
+        "format": PARTIAL_FORMAT,
+        "version": PARTIAL_VERSION,
+        "job": job,
+        "shard": [index, total],
+        "count": len(shard_numbers(index, total, job["count"])),
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    stream.write(json.dumps(header) + "\n")
+    stream.writelines(
+        json.dumps(dict(problem), ensure_ascii=False) + "\n" for problem in problems
+    )
+
+
+def read_partials(paths: List[str]) -> Tuple[Dict, datetime, Iterator[Problem]]:
+    """
+    Check that partials form one complete job and stream their problems
+
+    Headers are checked up front; problem numbers and each partial's
+    problem count are checked while streaming, so a truncated partial
+    raises, naming its file, instead of merging short.
+
+    Args:
+        paths: One partial per shard, in any order
+
+    Returns:
+        The job, the earliest shard start time, and an iterator over every
+        problem in number order
+
+    Raises:
+        ValueError: If the partials are not exactly the shards of one job
+    """
+    headers = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as stream:
+            try:
+                header = json.loads(stream.readline())
+            except json.JSONDecodeError:
+                header = None
+        if (
+            not isinstance(header, dict)
+            or header.get("format") != PARTIAL_FORMAT
+            or header.get("version") != PARTIAL_VERSION
+        ):
+            raise ValueError(f"{path} is not a partial output")
+        index, total = header["shard"]
+        if index in headers:
+            raise ValueError(f"shard {index}/{total} given twice")
+        headers[index] = (path, header)
+
+    if not headers:
+        raise ValueError("no partials given")
+    first = next(iter(headers.values()))[1]
+    for path, header in headers.values():
+        if header["job"] != first["job"] or header["shard"][1] != first["shard"][1]:
+            raise ValueError(f"{path} belongs to a different job")
+    total = first["shard"][1]
+    missing = sorted(set(range(1, total + 1)) - set(headers))
+    if missing:
+        raise ValueError(f"missing shards: {', '.join(f'{i}/{total}' for i in missing)}")
+
+    job = first["job"]
+    started_at = min(
+        datetime.fromisoformat(header["started_at"]) for _, header in headers.values()
+    )
+
+    def problems() -> Iterator[Problem]:
+        expected = 1
+        for index in range(1, total + 1):
+            path, header = headers[index]
+            first_number = expected
+            with open(path, encoding="utf-8") as stream:
+                stream.readline()
+                for line in stream:
+                    problem = Problem(json.loads(line))
+                    if problem.get("number") != expected:
+                        raise ValueError(f"{path}: expected problem {expected}")
+                    expected += 1
+                    yield problem
+            if expected - first_number != header["count"]:
+                raise ValueError(
+                    f"{path}: holds {expected - first_number} of "
+                    f"{header['count']} problems"
+                )
+        if expected != job["count"] + 1:
+            raise ValueError(f"partials hold {expected - 1} of {job['count']} problems")
+
+    return job, started_at, problems()
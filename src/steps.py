@@ -0,0 +1,275 @@
+"""
+Step engine
+Explains derivatives and integrals rule by rule in one memoized walk of the expression
+"""
+
+from functools import lru_cache
+from itertools import chain
+from typing import Iterable, List, Optional, Tuple
+
+import sympy as sp
+
+from .polynomial import Polynomial
+from .rendering import render_str
+
+x = sp.Symbol("x")
+
+# Sub-expressions whose rules are kept per process. Problems share most of
+# their terms (3*x**2, sin(x), exp(x)*sin(x), ...), so repeats are free.
+STEP_CACHE_SIZE = 4096
+
+Rules = Tuple[str, ...]
+
+# Derivative of f(u) with respect to u, for the functions with a rule
+_OUTER_DERIVATIVES = {
+    sp.sin: sp.cos,
+    sp.cos: lambda u: -sp.sin(u),
+    sp.exp: sp.exp,
+    sp.log: lambda u: 1 / u,
+    sp.atan: lambda u: 1 / (u**2 + 1),
+}
+
+# How the elementary derivatives are named in the steps
+_ELEMENTARY_NAMES = {sp.exp: "e^x", sp.log: "ln(x)"}
+
+# Antiderivative of sin and cos, as (sign, function)
+_TRIG_ANTIDERIVATIVES = {sp.sin: (-1, sp.cos), sp.cos: (1, sp.sin)}
+
+# Longest u accepted for tabular integration by parts
+MAX_PARTS_DEGREE = 8
+
+
+def _merge(*groups: Iterable[str]) -> Rules:
+    """Concatenate rule lines, keeping the first of any repeats"""
+    return tuple(dict.fromkeys(chain(*groups)))
+
+
+def _rule(name: str, expression: sp.Expr, derivative: sp.Expr) -> str:
+    """One differentiation step: '- <name> rule: d/dx(f) = f''"""
+    return f"- {name} rule: d/dx({render_str(expression)}) = {render_str(derivative)}"
+
+
+def _integral_rule(name: str, expression: sp.Expr, integral: sp.Expr) -> str:
+    """One integration step: '- <name> rule: ∫f dx = F'"""
+    return f"- {name} rule: ∫{render_str(expression)} dx = {render_str(integral)}"
+
+
+def _monomial(expression: sp.Expr) -> Optional[Tuple[sp.Expr, sp.Expr]]:
+    """(coefficient, exponent) of c*x**n with numeric c and n, else None"""
+    coefficient, rest = expression.as_coeff_Mul()
+    if rest == x:
+        return coefficient, sp.S.One
+    if rest.is_Pow and rest.base == x and rest.exp.is_Number:
+        return coefficient, rest.exp
+    return None
+
+
+@lru_cache(maxsize=STEP_CACHE_SIZE)
+def derivative_steps(expression: sp.Expr) -> Tuple[sp.Expr, Rules]:
+    """
+    Differentiate with respect to x by rules, recording each rule used
+
+    Sums, constant multiples, products, powers and sin, cos, exp, log and
+    atan of an inner function are differentiated by their rules, bottom
+    up; results are rebuilt with SymPy's constructors, so they equal
+    sympy.diff's. Anything else falls back to sympy.diff. Every
+    sub-expression is memoized, so shared terms are walked once per
+    process.
+
+    Args:
+        expression: Expression in x
+
+    Returns:
+        The derivative and the rule lines, outermost rule first
+    """
+    if expression == x:
+        return sp.S.One, ("- Power rule: d/dx(x) = 1",)
+    if not expression.args:
+        return sp.S.Zero, ()
+
+    if expression.is_Add:
+        terms = expression.as_ordered_terms()
+        parts = [derivative_steps(term) for term in terms]
+        rules = ["- Sum rule: differentiate term by term"]
+        for term, (_, term_rules) in zip(terms, parts):
+            if term.is_Number:
+                rules.append(f"- Constant rule: d/dx({render_str(term)}) = 0")
+            rules.extend(term_rules)
+        return sp.Add(*(result for result, _ in parts)), _merge(rules)
+
+    if expression.is_Mul:
+        factors = expression.args
+        parts = [derivative_steps(factor) for factor in factors]
+        varying = [index for index, (result, _) in enumerate(parts) if result != 0]
+        if not varying:
+            return sp.S.Zero, ()
+        if len(varying) == 1:
+            (index,) = varying
+            derivative = sp.Mul(
+                *factors[:index], parts[index][0], *factors[index + 1 :]
+            )
+            if _monomial(expression) is not None:
+                return derivative, (_rule("Power", expression, derivative),)
+            rule = _rule("Constant multiple", expression, derivative)
+            return derivative, _merge([rule], parts[index][1])
+        derivative = sp.Add(
+            *(
+                sp.Mul(*factors[:index], parts[index][0], *factors[index + 1 :])
+                for index in varying
+            )
+        )
+        rule = _rule("Product", expression, derivative)
+        return derivative, _merge([rule], *(parts[index][1] for index in varying))
+
+    if expression.is_Pow:
+        base, exponent = expression.args
+        base_derivative, base_rules = derivative_steps(base)
+        if derivative_steps(exponent)[0] == 0:
+            if base_derivative == 0:
+                return sp.S.Zero, ()
+            derivative = exponent * base ** (exponent - 1) * base_derivative
+            if base == x:
+                return derivative, (_rule("Power", expression, derivative),)
+            rule = _rule("Chain", expression, derivative)
+            return derivative, _merge([rule], base_rules)
+
+    elif expression.func in _OUTER_DERIVATIVES and len(expression.args) == 1:
+        (inner,) = expression.args
+        inner_derivative, inner_rules = derivative_steps(inner)
+        if inner_derivative == 0:
+            return sp.S.Zero, ()
+        outer = _OUTER_DERIVATIVES[expression.func](inner)
+        if inner == x:
+            name = _ELEMENTARY_NAMES.get(expression.func, render_str(expression))
+            result = name if outer == expression else render_str(outer)
+            return outer, (f"- Derivative of {name} is {result}",)
+        derivative = outer * inner_derivative
+        rule = _rule("Chain", expression, derivative)
+        return derivative, _merge([rule], inner_rules)
+
+    derivative = sp.diff(expression, x)
+    return derivative, (_rule("Differentiation", expression, derivative),)
+
+
+@lru_cache(maxsize=STEP_CACHE_SIZE)
+def _integral_rules(expression: sp.Expr) -> Optional[Rules]:
+    """Rules integrating an expression term by term, or None if one is missing"""
+    if expression.is_Number:
+        return (_integral_rule("Constant", expression, expression * x),)
+
+    monomial = _monomial(expression)
+    if monomial is not None and monomial[1] != -1:
+        coefficient, exponent = monomial
+        integral = coefficient * x ** (exponent + 1) / (exponent + 1)
+        return (_integral_rule("Power", expression, integral),)
+
+    if expression.is_Add:
+        parts = [_integral_rules(term) for term in expression.as_ordered_terms()]
+        if any(part is None for part in parts):
+            return None
+        return _merge(["- Sum rule: integrate term by term"], *parts)
+
+    if expression.is_Mul:
+        return _parts_rules(expression)
+    return None
+
+
+def _parts_rules(expression: sp.Expr) -> Optional[Rules]:
+    """Tabular integration by parts of polynomial * sin(x) or cos(x)"""
+    trig = [
+        factor
+        for factor in expression.args
+        if factor.func in _TRIG_ANTIDERIVATIVES and factor.args == (x,)
+    ]
+    if len(trig) != 1:
+        return None
+    (dv,) = trig
+    u = sp.Mul(*(factor for factor in expression.args if factor is not dv))
+
+    # Differentiate u until it vanishes; give up if it is not a polynomial
+    derivatives = [u]
+    while derivatives[-1] != 0:
+        if len(derivatives) > MAX_PARTS_DEGREE + 1:
+            return None
+        derivatives.append(derivative_steps(derivatives[-1])[0])
+
+    antiderivatives = []
+    sign, function = 1, dv.func
+    for _ in range(len(derivatives) - 1):
+        step_sign, function = _TRIG_ANTIDERIVATIVES[function]
+        sign *= step_sign
+        antiderivatives.append(sign * function(x))
+    return (
+        f"- Integration by parts (tabular): u = {render_str(u)}, "
+        f"dv = {render_str(dv)} dx",
+        "- Differentiate u until it vanishes: "
+        + " → ".join(map(render_str, derivatives)),
+        "- Integrate dv repeatedly: " + " → ".join(map(render_str, antiderivatives)),
+        "- Multiply diagonally with alternating signs (+, -, +, ...) and add",
+    )
+
+
+def integral_steps(function: sp.Expr, integral: sp.Expr) -> Rules:
+    """
+    Explain an antiderivative rule by rule
+
+    Sums, constants, powers of x and polynomial * sin(x) or cos(x) are
+    explained from the integrand. Anything else, notably rational
+    functions, is explained from the antiderivative: each of its terms is
+    differentiated back (with derivative_steps, no solver call) to the
+    partial fraction or polynomial term it integrates.
+
+    Args:
+        function: Integrand in x
+        integral: Its antiderivative, from the solver
+
+    Returns:
+        Rule lines, outermost rule first
+    """
+    rules = _integral_rules(function)
+    if rules is not None:
+        return rules
+
+    fraction = any(
+        factor.is_Pow and factor.exp.is_negative
+        for factor in sp.Mul.make_args(function)
+    )
+    header = (
+        "- Divide and split into partial fractions, then integrate each term"
+        if fraction
+        else "- Integrate term by term"
+    )
+    terms = integral.as_ordered_terms() if integral.is_Add else [integral]
+    lines = [header]
+    for term in terms:
+        integrand, _ = derivative_steps(term)
+        lines.append(f"- ∫{render_str(integrand)} dx = {render_str(term)}")
+    return _merge(lines)
+
+
+@lru_cache(maxsize=STEP_CACHE_SIZE)
+def polynomial_derivative_steps(polynomial: Polynomial) -> Rules:
+    """The rules derivative_steps records for a polynomial's SymPy expression"""
+    terms = polynomial.monomials()
+    rules: List[str] = []
+    if len(terms) > 1:
+        rules.append("- Sum rule: differentiate term by term")
+    for term in terms:
+        if term.degree > 0:
+            rules.append(f"- Power rule: d/dx({term}) = {term.diff()}")
+        elif len(terms) > 1:
+            rules.append(f"- Constant rule: d/dx({term}) = 0")
+    return tuple(rules)
+
+
+@lru_cache(maxsize=STEP_CACHE_SIZE)
+def polynomial_integral_steps(polynomial: Polynomial) -> Rules:
+    """The rules integral_steps records for a polynomial's SymPy expression"""
+    terms = polynomial.monomials()
+    rules: List[str] = []
+    if len(terms) > 1:
+        rules.append("- Sum rule: integrate term by term")
+    for term in terms:
+        name = "Power" if term.degree > 0 else "Constant"
+        rules.append(f"- {name} rule: ∫{term} dx = {term.integrate()}")
+    return tuple(rules)
@@ -0,0 +1,251 @@
+"""
+Compact problem set storage
+A binary pack format that readers memory-map for random access and filtering
+"""
+
+import json
+import mmap
+import struct
+from datetime import datetime
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional
+
+from .problem import Problem
+
+PACK_MAGIC = b"MPGPACK\x00"
+PACK_VERSION = 1
+
+# Magic and version at the start of the file
+_HEADER = struct.Struct("<8sI4x")
+# Index position, metadata length and magic at the end of the file
+_TRAILER = struct.Struct("<QQ8s")
+_OFFSET = struct.Struct("<Q")
+_OFFSET_PAIR = struct.Struct("<QQ")
+
+# Codes are single bytes
+MAX_CODES = 256
+
+
+def write_pack(
+    problems: Iterable[Dict],
+    stream: BinaryIO,
+    title: str = "Math Problem Set",
+    generated_at: Optional[datetime] = None,
+) -> None:
+    """
+    Write problems to a binary stream in the pack format
+
+    Layout, all integers little-endian:
+
+    - header: magic and format version
+    - records: each problem as a compact JSON array of its values, in the
+      key order of its shape
+    - index: record offsets (uint64, one per problem plus the end), then
+      one byte per problem for each of its type, difficulty and shape code
+    - metadata: JSON with the count, code tables, title and timestamp
+    - trailer: index position, metadata length and magic
+
+    Records are written as problems arrive and the index goes last, so the
+    stream need not be seekable and memory holds only the offsets and
+    codes.
+
+    Args:
+        problems: Iterable of problem dictionaries
+        stream: Binary file-like object to write to
+        title: Title for the problem set
+        generated_at: Timestamp of the set (default: now)
+    """
+    if generated_at is None:
+        generated_at = datetime.now()
+
+    codes = {"types": {}, "difficulties": {}, "shapes": {}}
+    offsets: List[int] = []
+    columns = (bytearray(), bytearray(), bytearray())
+
+    def code(table: str, value) -> int:
+        values = codes[table]
+        if value not in values:
+            if len(values) == MAX_CODES:
+                raise ValueError(f"pack files hold at most {MAX_CODES} {table}")
+            values[value] = len(values)
+        return values[value]
+
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    position = stream.write(_HEADER.pack(PACK_MAGIC, PACK_VERSION))
+    for problem in problems:
+        offsets.append(position)
+        columns[0].append(code("types", problem["type"]))
+        columns[1].append(code("difficulties", problem["difficulty"]))
+        columns[2].append(code("shapes", tuple(problem)))
+        position += stream.write(encoder.encode(list(problem.values())).encode("utf-8"))
+    offsets.append(position)
+
+    # Align the offset table for readers that map it as an array
+    position += stream.write(b"\x00" * (-position % _OFFSET.size))
+    index_position = position
+    stream.write(b"".join(_OFFSET.pack(offset) for offset in offsets))
+    for column in columns:
+        stream.write(column)
+
+    metadata = json.dumps(
+        {
+            "count": len(offsets) - 1,
+            "types": list(codes["types"]),
+            "difficulties": list(codes["difficulties"]),
+            "shapes": [list(shape) for shape in codes["shapes"]],
+            "title": title,
+            "generated_at": generated_at.isoformat(),
+        },
+        ensure_ascii=False,
+    ).encode("utf-8")
+    stream.write(metadata)
+    stream.write(_TRAILER.pack(index_position, len(metadata), PACK_MAGIC))
+
+
+class ProblemPack:
+    """
+    Read-only view of a pack file
+
+    The file is memory-mapped and only the small metadata block is parsed
+    on open. Fetching problem k decodes that one record; filtering by type
+    or difficulty scans the one-byte code columns and decodes only the
+    matches.
+    """
+
+    def __init__(self, path):
+        """
+        Open a pack file
+
+        Args:
+            path: File written by write_pack
+
+        Raises:
+            ValueError: If the file is not a pack or has another version
+        """
+        self.path = str(path)
+        with open(self.path, "rb") as stream:
+            self._mmap = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            size = len(self._mmap)
+            if size < _HEADER.size + _TRAILER.size:
+                raise ValueError(f"{self.path} is not a problem pack")
+            magic, version = _HEADER.unpack_from(self._mmap)
+            index_position, metadata_length, end_magic = _TRAILER.unpack_from(
+                self._mmap, size - _TRAILER.size
+            )
+            if magic != PACK_MAGIC or end_magic != PACK_MAGIC:
+                raise ValueError(f"{self.path} is not a problem pack")
+            if version != PACK_VERSION:
+                raise ValueError(
+                    f"{self.path} is pack version {version}, expected {PACK_VERSION}"
+                )
+            metadata_position = size - _TRAILER.size - metadata_length
+            metadata = json.loads(self._mmap[metadata_position : size - _TRAILER.size])
+        except Exception:
+            self._mmap.close()
+            raise
+
+        self._count = metadata["count"]
+        self._types = metadata["types"]
+        self._difficulties = metadata["difficulties"]
+        self._shapes = [tuple(shape) for shape in metadata["shapes"]]
+        self.title = metadata["title"]
+        self.generated_at = datetime.fromisoformat(metadata["generated_at"])
+
+        self._offsets = index_position
+        columns = index_position + (self._count + 1) * _OFFSET.size
+        self._type_codes = columns
+        self._difficulty_codes = columns + self._count
+        self._shape_codes = columns + 2 * self._count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> Problem:
+        """
+        Decode one problem
+
+        Args:
+            index: Position in the set, 0-based; negative counts from the end
+
+        Returns:
+            Problem record
+        """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("problem index out of range")
+        return self._decode(index)
+
+    def __iter__(self) -> Iterator[Problem]:
+        return (self._decode(index) for index in range(self._count))
+
+    def __enter__(self) -> "ProblemPack":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def indices(
+        self, problem_type: Optional[str] = None, difficulty: Optional[str] = None
+    ) -> List[int]:
+        """
+        Positions of the problems matching a type and/or difficulty
+
+        Args:
+            problem_type: Type to match (default: any)
+            difficulty: Difficulty to match (default: any)
+
+        Returns:
+            Matching 0-based positions, in order
+        """
+        filters = [
+            (self._type_codes, self._types, problem_type),
+            (self._difficulty_codes, self._difficulties, difficulty),
+        ]
+        filters = [entry for entry in filters if entry[2] is not None]
+        if not filters:
+            return list(range(self._count))
+        if any(value not in values for _, values, value in filters):
+            return []
+
+        # Scan the first column with bytes.find, then check the others per match
+        (column, values, value), others = filters[0], filters[1:]
+        wanted = values.index(value)
+        checks = [(other, codes.index(code)) for other, codes, code in others]
+        matches = []
+        position = self._mmap.find(bytes([wanted]), column, column + self._count)
+        while position != -1:
+            index = position - column
+            if all(self._mmap[other + index] == code for other, code in checks):
+                matches.append(index)
+            position = self._mmap.find(bytes([wanted]), position + 1, column + self._count)
+        return matches
+
+    def filter(
+        self, problem_type: Optional[str] = None, difficulty: Optional[str] = None
+    ) -> Iterator[Problem]:
+        """
+        Decode the problems matching a type and/or difficulty
+
+        Args:
+            problem_type: Type to match (default: any)
+            difficulty: Difficulty to match (default: any)
+
+        Returns:
+            Iterator over the matching problems, in order
+        """
+        return (self._decode(index) for index in self.indices(problem_type, difficulty))
+
+    def close(self) -> None:
+        """Unmap the file"""
+        self._mmap.close()
+
+    def _decode(self, index: int) -> Problem:
+        """Decode the record at a position known to be in range"""
+        start, end = _OFFSET_PAIR.unpack_from(
+            self._mmap, self._offsets + index * _OFFSET.size
+        )
+        shape = self._shapes[self._mmap[self._shape_codes + index]]
+        return Problem(zip(shape, json.loads(self._mmap[start:end])))
+
@@ -0,0 +1,114 @@
+"""
+Problem templates
+Solves each problem family once with symbolic coefficients
+"""
+
+from typing import Sequence, Tuple
+
+import sympy as sp
+from sympy import diff, integrate
+
+x = sp.Symbol("x")
+
+
+class Template:
+    """
+    A problem family solved once, with symbolic coefficients
+
+    The function and solution are general expressions in x and the
+    parameters. An instance substitutes integers for the parameters;
+    SymPy re-evaluates the arithmetic while rebuilding the expressions,
+    which combines like terms and drops zero ones, giving the same
+    expressions as solving the instance directly.
+    """
+
+    def __init__(
+        self,
+        parameters: Tuple[sp.Symbol, ...],
+        function: sp.Expr,
+        solution: sp.Expr,
+    ):
+        """
+        Initialize the template
+
+        Args:
+            parameters: Coefficient symbols, in the order values are given
+            function: General function of the family
+            solution: Its general derivative or integral
+        """
+        self.parameters = parameters
+        self.function = function
+        self.solution = solution
+
+    def function_at(self, values: Sequence[int]) -> sp.Expr:
+        """Function of the instance with the given parameter values"""
+        return self._specialize(self.function, values)
+
+    def solution_at(self, values: Sequence[int]) -> sp.Expr:
+        """Solution of the instance with the given parameter values"""
+        return self._specialize(self.solution, values)
+
+    def _specialize(self, expression: sp.Expr, values: Sequence[int]) -> sp.Expr:
+        """Substitute integer values for the parameters"""
+        if not self.parameters:
+            return expression
+        return expression.xreplace(dict(zip(self.parameters, map(sp.Integer, values))))
+
+
+def coefficients(count: int) -> Tuple[sp.Symbol, ...]:
+    """Coefficient symbols a0, a1, ..., constant term first"""
+    return sp.symbols(f"a0:{count}")
+
+
+def polynomial(parameters: Sequence[sp.Symbol]) -> sp.Expr:
+    """General polynomial with the given coefficients, constant term first"""
+    return sp.Add(*(a * x**i for i, a in enumerate(parameters)))
+
+
+def derivative_template(
+    function: sp.Expr, parameters: Tuple[sp.Symbol, ...] = ()
+) -> Template:
+    """
+    Differentiate a family once
+
+    Differentiation is linear, so the general derivative already has one
+    term per power of x and function.
+
+    Args:
+        function: General function
+        parameters: Its coefficient symbols
+
+    Returns:
+        Template of the family
+    """
+    return Template(parameters, function, diff(function, x))
+
+
+def polynomial_times_template(degree: int, factor: sp.Expr) -> Template:
+    """
+    Integrate (a0 + a1*x + ... + an*x**n) * factor once, by tabular integration
+
+    With p the polynomial and F1, F2, ... the repeated antiderivatives of
+    the factor, the integral is p*F1 - p'*F2 + p''*F3 - ...; the series
+    ends after n + 1 terms. It is expanded so each power of x times sin or
+    cos is one term with a coefficient linear in the parameters.
+
+    Args:
+        degree: Degree of the polynomial
+        factor: Factor with simple repeated antiderivatives (sin(x), cos(x))
+
+    Returns:
+        Template of the family
+    """
+    parameters = coefficients(degree + 1)
+    term = polynomial(parameters)
+    antiderivative = integrate(factor, x)
+    terms = []
+    sign = 1
+    while term != 0:
+        terms.append(sign * term * antiderivative)
+        term = diff(term, x)
+        antiderivative = integrate(antiderivative, x)
+        sign = -sign
+    integral = sp.expand(sp.Add(*terms))
+    return Template(parameters, polynomial(parameters) * factor, integral)
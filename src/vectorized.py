@@ -0,0 +1,318 @@
+"""
+Vectorized easy problem generation
+Draws, solves and renders whole batches of polynomial problems with NumPy
+"""
+
+import math
+from fractions import Fraction
+from typing import AbstractSet, List, Optional, Tuple
+
+import numpy as np
+
+from .generator import (
+    LEADING_REPLACEMENTS,
+    LIMIT_POINTS,
+    MAX_COEFFICIENT,
+    MIN_COEFFICIENT,
+    POLYNOMIAL_LIMIT_POINTS,
+)
+from .polynomial import Polynomial, format_number, format_number_latex
+from .problem import FIELDS, Problem
+from .steps import polynomial_derivative_steps, polynomial_integral_steps
+
+# Highest degree of an easy polynomial
+EASY_MAX_DEGREE = 2
+
+
+class PolynomialBatch:
+    """
+    Many polynomials as the rows of a coefficient matrix
+
+    Coefficients are exact: row r holds numerators[r, i] / denominators[i]
+    for the coefficient of x**i, constant term first. Calculus runs on the
+    whole matrix at once; printing renders each distinct row only once.
+    """
+
+    def __init__(self, numerators: np.ndarray, denominators: Optional[np.ndarray] = None):
+        """
+        Initialize the batch
+
+        Args:
+            numerators: Integer matrix, one polynomial per row
+            denominators: Per-column denominators (default: all 1)
+        """
+        self.numerators = numerators
+        if denominators is None:
+            denominators = np.ones(numerators.shape[1], dtype=numerators.dtype)
+        self.denominators = denominators
+
+    def __len__(self) -> int:
+        return self.numerators.shape[0]
+
+    def diff(self) -> "PolynomialBatch":
+        """Derivatives of every row"""
+        powers = np.arange(1, self.numerators.shape[1])
+        return PolynomialBatch(self.numerators[:, 1:] * powers, self.denominators[1:])
+
+    def integrate(self) -> "PolynomialBatch":
+        """Antiderivatives of every row, with zero constants of integration"""
+        rows = self.numerators.shape[0]
+        numerators = np.hstack(
+            [np.zeros((rows, 1), dtype=self.numerators.dtype), self.numerators]
+        )
+        powers = np.arange(1, self.numerators.shape[1] + 1)
+        denominators = np.concatenate([[1], self.denominators * powers])
+        return PolynomialBatch(numerators, denominators)
+
+    def evaluate(self, point) -> List:
+        """
+        Substitute a value for x in every row, as Polynomial.evaluate does
+
+        Args:
+            point: Integer, or math.inf / -math.inf
+
+        Returns:
+            Exact value (or ±inf / NaN for an infinite point) per row
+        """
+        if not math.isinf(point):
+            if (self.denominators == 1).all():
+                powers = point ** np.arange(self.numerators.shape[1])
+                return (self.numerators @ powers).tolist()
+            return [polynomial.evaluate(point) for polynomial in self.polynomials()]
+
+        signs = np.sign(self.numerators[:, 1:]) * np.sign(point) ** np.arange(
+            1, self.numerators.shape[1]
+        )
+        up = (signs > 0).any(axis=1)
+        down = (signs < 0).any(axis=1)
+        constants = self.numerators[:, 0]
+        return [
+            math.nan if u and d else math.inf if u else -math.inf if d else int(c)
+            for u, d, c in zip(up.tolist(), down.tolist(), constants.tolist())
+        ]
+
+    def limit_at_infinity(self, point: float) -> List:
+        """
+        Limit of every row as x approaches ±infinity
+
+        Args:
+            point: math.inf or -math.inf
+
+        Returns:
+            ±inf per non-constant row, the constant otherwise
+        """
+        nonzero = self.numerators != 0
+        degree = self.numerators.shape[1] - 1 - np.argmax(nonzero[:, ::-1], axis=1)
+        leading = self.numerators[np.arange(len(self)), degree]
+        signs = np.sign(leading) * np.sign(point) ** degree
+        return [
+            math.copysign(math.inf, s) if d > 0 else int(c)
+            for s, d, c in zip(
+                signs.tolist(), degree.tolist(), self.numerators[:, 0].tolist()
+            )
+        ]
+
+    def polynomials(self) -> List[Polynomial]:
+        """Every row as a Polynomial"""
+        denominators = self.denominators.tolist()
+        return [
+            Polynomial([Fraction(n, d) for n, d in zip(row, denominators)])
+            for row in self.numerators.tolist()
+        ]
+
+    def render(
+        self, text: bool = True, latex: bool = True
+    ) -> Tuple[Optional[List[str]], Optional[List[str]]]:
+        """
+        Print every row, rendering each distinct polynomial once
+
+        Args:
+            text: Whether to render the str() forms
+            latex: Whether to render the latex() forms
+
+        Returns:
+            str() and latex() forms per row, as SymPy prints them; None for
+            a form not asked for
+        """
+        if not len(self):
+            return ([] if text else None), ([] if latex else None)
+        unique, inverse = np.unique(self.numerators, axis=0, return_inverse=True)
+        polynomials = PolynomialBatch(unique, self.denominators).polynomials()
+        inverse = inverse.reshape(-1).tolist()
+        texts = latexes = None
+        if text:
+            rendered = [str(polynomial) for polynomial in polynomials]
+            texts = [rendered[i] for i in inverse]
+        if latex:
+            rendered = [polynomial.latex() for polynomial in polynomials]
+            latexes = [rendered[i] for i in inverse]
+        return texts, latexes
+
+
+def draw_easy_batch(
+    rng: np.random.Generator, count: int, type_count: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Draw the types, polynomials and limit points of `count` easy problems
+
+    Follows the distribution of ProblemGenerator._draw_spec: uniform degree
+    1 or 2, uniform coefficients, and a zero leading coefficient replaced
+    by one of LEADING_REPLACEMENTS.
+
+    Args:
+        rng: NumPy random generator
+        count: Number of problems
+        type_count: Number of problem types to choose from
+
+    Returns:
+        Type indices, coefficient matrix (constant term first) and limit
+        point indices
+    """
+    type_index = rng.integers(type_count, size=count)
+    degree = rng.integers(1, EASY_MAX_DEGREE + 1, size=count)
+    coeffs = rng.integers(
+        MIN_COEFFICIENT, MAX_COEFFICIENT + 1, size=(count, EASY_MAX_DEGREE + 1)
+    )
+    coeffs[np.arange(EASY_MAX_DEGREE + 1) > degree[:, None]] = 0
+
+    rows = np.arange(count)
+    zero = coeffs[rows, degree] == 0
+    coeffs[rows[zero], degree[zero]] = rng.choice(
+        LEADING_REPLACEMENTS, size=int(zero.sum())
+    )
+    point_index = rng.integers(len(LIMIT_POINTS), size=count)
+    return type_index, coeffs, point_index
+
+
+def solve_easy_batch(
+    problem_types: List[str],
+    type_index: np.ndarray,
+    coeffs: np.ndarray,
+    point_index: np.ndarray,
+    first_number: int = 1,
+    fields: AbstractSet[str] = frozenset(FIELDS),
+) -> List[Problem]:
+    """
+    Solve and render a drawn batch of easy problems
+
+    Produces the same problem for each row as the generator's polynomial
+    engine would for the equivalent spec.
+
+    Args:
+        problem_types: Problem types indexed by type_index
+        type_index: Type of each problem
+        coeffs: Coefficient matrix, one polynomial per row
+        point_index: Limit point of each problem (used by limits only)
+        first_number: Number of the first problem
+        fields: Fields to compute (default: all); renders and steps of the
+            others are skipped
+
+    Returns:
+        Problem records in row order
+    """
+    steps = "steps" in fields
+    # Text forms also feed the steps
+    function_text = "function" in fields or steps
+    solution_text = "solution" in fields or steps
+    functions = PolynomialBatch(coeffs)
+    function_str, function_latex = functions.render(
+        text=function_text, latex="function_latex" in fields
+    )
+
+    # Solve each type on its own sub-matrix, then scatter back by row
+    solution_str = [None] * len(functions)
+    solution_latex = [None] * len(functions)
+    substitution = [None] * len(functions)
+    for index, problem_type in enumerate(problem_types):
+        rows = np.flatnonzero(type_index == index)
+        if not len(rows):
+            continue
+        batch = PolynomialBatch(coeffs[rows])
+
+        if problem_type in ("derivative", "integral"):
+            solved = batch.diff() if problem_type == "derivative" else batch.integrate()
+            texts, latexes = solved.render(
+                text=solution_text, latex="solution_latex" in fields
+            )
+        else:  # limit
+            points = point_index[rows].tolist()
+            values = [
+                batch.evaluate(0),
+                batch.evaluate(1),
+                batch.limit_at_infinity(math.inf),
+            ]
+            results = [values[p][i] for i, p in enumerate(points)]
+            texts = latexes = None
+            if solution_text:
+                texts = [format_number(value) for value in results]
+            if "solution_latex" in fields:
+                latexes = [format_number_latex(value) for value in results]
+            if steps:
+                at_infinity = batch.evaluate(math.inf)
+                for row, result, p, value in zip(
+                    rows.tolist(), results, points, at_infinity
+                ):
+                    substitution[row] = format_number(value if p == 2 else result)
+
+        for position, row in enumerate(rows.tolist()):
+            if texts is not None:
+                solution_str[row] = texts[position]
+            if latexes is not None:
+                solution_latex[row] = latexes[position]
+
+    # Rule lines depend on the function only: build them once per distinct row
+    coeff_rows = coeffs.tolist()
+    rules = {}
+
+    def rules_for(row: int, explain) -> Tuple[str, ...]:
+        key = (explain, tuple(coeff_rows[row]))
+        if key not in rules:
+            rules[key] = explain(Polynomial(coeff_rows[row]))
+        return rules[key]
+
+    def steps_for(row: int, problem_type: str, point: str) -> List[str]:
+        given = f"Given function: f(x) = {function_str[row]}"
+        if problem_type == "derivative":
+            return [
+                given,
+                "Apply derivative rules:",
+                *rules_for(row, polynomial_derivative_steps),
+                f"Result: f'(x) = {solution_str[row]}",
+            ]
+        if problem_type == "integral":
+            return [
+                given,
+                "Apply integration rules:",
+                *rules_for(row, polynomial_integral_steps),
+                f"Result: ∫f(x)dx = {solution_str[row]} + C",
+            ]
+        return [
+            given,
+            f"Find limit as x → {point}",
+            f"Direct substitution: {substitution[row]}",
+            f"Result: lim(x→{point}) f(x) = {solution_str[row]}",
+        ]
+
+    problems = []
+    point_names = [format_number(point) for point in POLYNOMIAL_LIMIT_POINTS]
+    for row, (type_row, point_row) in enumerate(
+        zip(type_index.tolist(), point_index.tolist())
+    ):
+        problem_type = problem_types[type_row]
+        problem = Problem(type=problem_type, difficulty="easy")
+        if "function" in fields:
+            problem["function"] = function_str[row]
+        if "function_latex" in fields:
+            problem["function_latex"] = function_latex[row]
+        if problem_type == "limit":
+            problem["point"] = point_names[point_row]
+        if "solution" in fields:
+            problem["solution"] = solution_str[row]
+        if "solution_latex" in fields:
+            problem["solution_latex"] = solution_latex[row]
+
+        if steps:
+            problem["steps"] = steps_for(row, problem_type, point_names[point_row])
+        problem["number"] = first_number + row
+        problems.append(problem)
+    return problems
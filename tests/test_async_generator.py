@@ -0,0 +1,215 @@
+"""
+Unit tests for AsyncProblemGenerator
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+import src.async_generator as async_module
+from src.async_generator import AsyncProblemGenerator
+from src.cache import SolutionCache
+from src.generator import ProblemGenerator
+from src.profiling import Profiler
+
+
+def run(coroutine):
+    """Run a coroutine on a fresh event loop"""
+    return asyncio.run(coroutine)
+
+
+class CountingTask:
+    """Stand-in executor task that counts how many problems start"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.started = 0
+        self._generate = async_module._generate_problem
+        self._lock = threading.Lock()
+
+    def __call__(self, *args):
+        with self._lock:
+            self.started += 1
+        threading.Event().wait(self.delay)
+        return self._generate(*args)
+
+
+class TestAsyncProblemGenerator:
+    """Test cases for AsyncProblemGenerator"""
+
+    @pytest.mark.parametrize("executor_class", [ThreadPoolExecutor, ProcessPoolExecutor])
+    def test_set_matches_sync_generator(self, executor_class):
+        """Test that a seeded set equals the synchronous one, on any executor"""
+        expected = ProblemGenerator(seed=6).generate_problem_set(count=8, difficulty="easy")
+
+        with executor_class(max_workers=2) as executor:
+            generator = AsyncProblemGenerator(seed=6, executor=executor)
+            result = run(generator.agenerate_problem_set(count=8, difficulty="easy"))
+
+        assert result == expected
+
+    def test_single_problems(self):
+        """Test the agenerate_*_problem coroutines"""
+        generator = AsyncProblemGenerator(seed=1)
+
+        async def generate():
+            return await asyncio.gather(
+                generator.agenerate_derivative_problem("easy"),
+                generator.agenerate_integral_problem("medium"),
+                generator.agenerate_limit_problem("hard"),
+            )
+
+        derivative, integral, limit = run(generate())
+
+        assert (derivative["type"], derivative["difficulty"]) == ("derivative", "easy")
+        assert (integral["type"], integral["difficulty"]) == ("integral", "medium")
+        assert (limit["type"], limit["solution"]) == ("limit", "1")
+        assert "number" not in derivative
+        assert type(derivative) is dict
+
+    def test_as_completed_yields_every_problem(self):
+        """Test that the iterator yields each numbered problem once"""
+        generator = AsyncProblemGenerator(seed=2, max_concurrency=3)
+
+        async def collect():
+            return [p async for p in generator.as_completed(count=10, difficulty="easy")]
+
+        problems = run(collect())
+
+        assert sorted(problem["number"] for problem in problems) == list(range(1, 11))
+
+    def test_concurrency_limit(self, monkeypatch):
+        """Test that no more than max_concurrency problems run at once"""
+        running = []
+        peak = []
+        lock = threading.Lock()
+        generate = async_module._generate_problem
+
+        def tracked(*args):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            threading.Event().wait(0.01)
+            with lock:
+                running.pop()
+            return generate(*args)
+
+        monkeypatch.setattr(async_module, "_generate_problem", tracked)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            generator = AsyncProblemGenerator(
+                seed=3, executor=executor, max_concurrency=2
+            )
+            run(generator.agenerate_problem_set(count=12, difficulty="easy"))
+
+        assert max(peak) == 2
+
+    def test_closing_iterator_drops_pending_problems(self, monkeypatch):
+        """Test that stopping early never starts the rest of the set"""
+        task = CountingTask(delay=0.01)
+        monkeypatch.setattr(async_module, "_generate_problem", task)
+
+        async def take_two(generator):
+            iterator = generator.as_completed(count=100, difficulty="easy")
+            taken = [await iterator.__anext__(), await iterator.__anext__()]
+            await iterator.aclose()
+            return taken
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            generator = AsyncProblemGenerator(
+                seed=4, executor=executor, max_concurrency=2
+            )
+            assert len(run(take_two(generator))) == 2
+
+        assert task.started <= 4
+
+    def test_cancellation_stops_pending_solves(self, monkeypatch):
+        """Test that cancelling a set stops submitting problems"""
+        task = CountingTask(delay=0.02)
+        monkeypatch.setattr(async_module, "_generate_problem", task)
+
+        async def cancel_soon(generator):
+            pending = asyncio.ensure_future(
+                generator.agenerate_problem_set(count=100, difficulty="easy")
+            )
+            await asyncio.sleep(0.05)
+            pending.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await pending
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            generator = AsyncProblemGenerator(
+                seed=5, executor=executor, max_concurrency=2
+            )
+            run(cancel_soon(generator))
+
+        assert task.started < 20
+
+    def test_event_loop_stays_responsive(self):
+        """Test that other coroutines run while problems are solved"""
+        generator = AsyncProblemGenerator(seed=7, max_concurrency=2)
+        ticks = []
+
+        async def ticker(done):
+            while not done.is_set():
+                ticks.append(1)
+                await asyncio.sleep(0.001)
+
+        async def generate():
+            done = asyncio.Event()
+            ticking = asyncio.ensure_future(ticker(done))
+            await generator.agenerate_problem_set(
+                count=4, problem_types=["integral"], difficulty="hard"
+            )
+            done.set()
+            await ticking
+
+        run(generate())
+
+        assert len(ticks) > 1
+
+    def test_stats_and_profiles_are_merged(self, tmp_path):
+        """Test that solve stats and timings come back from the executor"""
+        profiler = Profiler()
+        generator = AsyncProblemGenerator(
+            seed=8,
+            profiler=profiler,
+            cache=SolutionCache(tmp_path / "cache.db"),
+        )
+
+        run(
+            generator.agenerate_problem_set(
+                count=5, problem_types=["limit"], difficulty="hard"
+            )
+        )
+
+        assert generator.solve_stats.summary()["limit/hard"]["count"] >= 1
+        assert profiler.summary()["limit/hard"]["draw"]["calls"] == 5
+
+    def test_rejects_bad_concurrency(self):
+        """Test that the concurrency limit must be positive"""
+        with pytest.raises(ValueError):
+            AsyncProblemGenerator(max_concurrency=0)
+
+    def test_solve_timeout_fires_in_worker_processes(self):
+        """Test that solve budgets are enforced on a process pool"""
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            generator = AsyncProblemGenerator(
+                seed=1, executor=executor, solve_timeout=1e-6, max_redraws=2
+            )
+            problems = run(
+                generator.agenerate_problem_set(
+                    count=2, problem_types=["integral"], difficulty="hard"
+                )
+            )
+
+        assert all(problem["solution"] for problem in problems)
+        assert generator.solve_stats.summary()["integral/hard"]["timeouts"] == 4
+
+    def test_solve_timeout_rejected_on_threads(self):
+        """Test that a budget threads cannot enforce is refused up front"""
+        with pytest.raises(ValueError, match="ProcessPoolExecutor"):
+            AsyncProblemGenerator(solve_timeout=1.0)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with pytest.raises(ValueError, match="ProcessPoolExecutor"):
+                AsyncProblemGenerator(executor=executor, solve_timeout=1.0)
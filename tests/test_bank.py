@@ -0,0 +1,147 @@
+"""
+Unit tests for ProblemBank
+"""
+
+import pickle
+import sqlite3
+
+import pytest
+from src.bank import BANK_VERSION, ProblemBank, build_bank
+from src.generator import ProblemGenerator
+
+# Small families, so the bank builds in well under a second
+FAMILIES = [("derivative", "hard"), ("limit", "medium"), ("limit", "hard")]
+
+
+@pytest.fixture(scope="module")
+def bank_path(tmp_path_factory):
+    """Bank holding the small families"""
+    path = tmp_path_factory.mktemp("bank") / "bank.db"
+    build_bank(path, families=FAMILIES)
+    return path
+
+
+class TestProblemBank:
+    """Test cases for ProblemBank class"""
+
+    def test_build_reports_family_sizes(self, bank_path):
+        """Test that every spec of each family is stored once"""
+        assert ProblemBank(bank_path).families() == {
+            ("derivative", "hard"): 4,
+            ("limit", "medium"): 1,
+            ("limit", "hard"): 1,
+        }
+
+    def test_hard_integrals_are_not_enumerated(self, tmp_path):
+        """Test that families too large to enumerate are skipped"""
+        counts = build_bank(tmp_path / "bank.db", families=[("integral", "hard")])
+
+        assert counts == {}
+        assert len(ProblemBank(tmp_path / "bank.db")) == 0
+
+    def test_banked_run_matches_live_run(self, bank_path):
+        """Test that a seeded run gives the same problems with or without a bank"""
+        expected = ProblemGenerator(seed=5).generate_problem_set(
+            count=10, problem_types=["derivative", "limit"], difficulty="hard"
+        )
+
+        bank = ProblemBank(bank_path)
+        banked = ProblemGenerator(seed=5, bank=bank).generate_problem_set(
+            count=10, problem_types=["derivative", "limit"], difficulty="hard"
+        )
+
+        assert banked == expected
+        assert (bank.hits, bank.misses) == (10, 0)
+
+    def test_missing_family_falls_back_to_solving(self, bank_path):
+        """Test that problems outside the bank are solved live"""
+        bank = ProblemBank(bank_path)
+        problem = ProblemGenerator(seed=1, bank=bank).generate_integral_problem("medium")
+
+        assert problem == ProblemGenerator(seed=1).generate_integral_problem("medium")
+        assert (bank.hits, bank.misses) == (0, 1)
+
+    def test_bank_is_shared_with_workers(self, bank_path):
+        """Test that worker processes reopen the bank and match in-process output"""
+        bank = ProblemBank(bank_path)
+        expected = ProblemGenerator(seed=2).generate_problem_set(
+            count=6, problem_types=["derivative"], difficulty="hard"
+        )
+
+        result = ProblemGenerator(seed=2, bank=bank).generate_problem_set(
+            count=6, problem_types=["derivative"], difficulty="hard", workers=2
+        )
+
+        assert result == expected
+
+    def test_pickle_reopens_lazily(self, bank_path):
+        """Test that a pickled bank points at the same file"""
+        bank = ProblemBank(bank_path)
+        bank.families()
+
+        clone = pickle.loads(pickle.dumps(bank))
+
+        assert clone.families() == bank.families()
+
+    def test_missing_file(self, tmp_path):
+        """Test that opening a missing bank fails clearly"""
+        with pytest.raises(FileNotFoundError):
+            ProblemBank(tmp_path / "missing.db").families()
+
+    def test_stale_bank_is_rejected(self, tmp_path):
+        """Test that a bank built by another version is not served"""
+        path = tmp_path / "bank.db"
+        build_bank(path, families=[("limit", "hard")])
+        connection = sqlite3.connect(str(path))
+        connection.execute("UPDATE meta SET value = '0' WHERE name = 'version'")
+        connection.commit()
+        connection.close()
+
+        with pytest.raises(ValueError):
+            ProblemBank(path).families()
+
+    def test_bank_from_previous_version_is_rejected(self, tmp_path):
+        """Test that a bank built before the step engine is not served"""
+        path = tmp_path / "bank.db"
+        build_bank(path, families=[("derivative", "hard")])
+        connection = sqlite3.connect(str(path))
+        connection.execute(
+            "UPDATE meta SET value = ? WHERE name = 'version'",
+            (str(BANK_VERSION - 1),),
+        )
+        connection.commit()
+        connection.close()
+
+        with pytest.raises(ValueError):
+            ProblemBank(path).families()
+
+
+class TestSpecEnumeration:
+    """Test cases for the enumeration of drawable problems"""
+
+    @pytest.mark.parametrize(
+        "problem_type,difficulty,size",
+        [
+            ("derivative", "easy", 1320),
+            ("derivative", "medium", 29260),
+            ("derivative", "hard", 4),
+            ("integral", "easy", 1320),
+            ("integral", "medium", 2640),
+            ("limit", "easy", 3960),
+            ("limit", "medium", 1),
+            ("limit", "hard", 1),
+        ],
+    )
+    def test_drawn_specs_are_enumerated(self, problem_type, difficulty, size):
+        """Test that enumeration lists each drawable spec exactly once"""
+        generator = ProblemGenerator(seed=0)
+        specs = list(generator._enumerate_specs(problem_type, difficulty))
+        enumerated = set(specs)
+
+        assert len(specs) == len(enumerated) == size
+        for _ in range(200):
+            assert generator._draw_spec(problem_type, difficulty) in enumerated
+
+    def test_hard_integral_space_is_not_enumerable(self):
+        """Test that hard integrals report no enumeration"""
+        assert ProblemGenerator()._enumerate_specs("integral", "hard") is None
@@ -0,0 +1,79 @@
+"""
+Unit tests for solve-time budgets
+"""
+
+import time
+
+import pytest
+from src.budget import SolveStats, SolveTimeout, time_limit
+from src.generator import ProblemGenerator
+
+
+class TestTimeLimit:
+    """Test cases for the time_limit context manager"""
+
+    def test_interrupts_slow_block(self):
+        """Test that a block running past its budget is interrupted"""
+        with pytest.raises(SolveTimeout):
+            with time_limit(0.05):
+                time.sleep(1)
+
+    def test_fast_block_completes(self):
+        """Test that a block within budget runs to completion"""
+        with time_limit(1):
+            result = sum(range(100))
+
+        assert result == 4950
+
+    def test_none_disables_limit(self):
+        """Test that no budget means no interruption"""
+        with time_limit(None):
+            time.sleep(0.01)
+
+
+class TestSolveStats:
+    """Test cases for SolveStats counters"""
+
+    def test_percentiles(self):
+        """Test nearest-rank percentiles"""
+        stats = SolveStats()
+        for ms in range(1, 101):
+            stats.record("integral", "hard", ms / 1000)
+
+        assert stats.percentile("integral", "hard", 50) == pytest.approx(0.050)
+        assert stats.percentile("integral", "hard", 99) == pytest.approx(0.099)
+        assert stats.percentile("limit", "easy", 50) == 0.0
+
+    def test_summary_and_merge(self):
+        """Test that merged stats combine samples and timeouts"""
+        first = SolveStats()
+        first.record("limit", "easy", 0.001)
+        second = SolveStats()
+        second.record("limit", "easy", 0.003)
+        second.record_timeout("limit", "easy")
+
+        first.merge(second)
+        summary = first.summary()
+
+        assert summary["limit/easy"]["count"] == 2
+        assert summary["limit/easy"]["timeouts"] == 1
+        assert summary["limit/easy"]["p99"] == pytest.approx(0.003)
+
+
+class TestGeneratorBudget:
+    """Test cases for budgeted problem generation"""
+
+    def test_generator_records_solve_times(self):
+        """Test that every generated problem records one solve time"""
+        generator = ProblemGenerator(seed=1)
+        generator.generate_problem_set(count=4, problem_types=["integral"])
+
+        assert generator.solve_stats.summary()["integral/medium"]["count"] == 4
+
+    def test_overrun_solves_are_redrawn(self):
+        """Test that solves over budget are redrawn before a final unbounded solve"""
+        generator = ProblemGenerator(seed=1, solve_timeout=1e-6, max_redraws=2)
+        problem = generator.generate_integral_problem("hard")
+
+        assert problem["solution"]
+        assert generator.solve_stats.summary()["integral/hard"]["timeouts"] == 2
@@ -0,0 +1,100 @@
+"""
+Unit tests for SolutionCache
+"""
+
+import pickle
+
+import pytest
+import src.cache
+from src.cache import SolutionCache
+from src.generator import ProblemGenerator
+
+
+class TestSolutionCache:
+    """Test cases for SolutionCache class"""
+
+    def test_put_and_get(self, tmp_path):
+        """Test that stored fields come back unchanged"""
+        cache = SolutionCache(tmp_path / "cache.db")
+        key = SolutionCache.make_key("derivative", "easy", "Symbol('x')")
+        fields = {"function": "x", "solution": "1", "steps": ["a", "b"]}
+
+        assert cache.get(key) is None
+        cache.put(key, fields)
+
+        assert cache.get(key) == fields
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_entries_persist_across_instances(self, tmp_path):
+        """Test that a new cache on the same file sees earlier entries"""
+        path = tmp_path / "cache.db"
+        first = SolutionCache(path)
+        first.put("k", {"solution": "1"})
+        first.close()
+
+        assert SolutionCache(path).get("k") == {"solution": "1"}
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        """Test that the cache stays within max_entries, dropping LRU entries"""
+        cache = SolutionCache(tmp_path / "cache.db", max_entries=2)
+        cache.put("a", {"v": 1})
+        cache.put("b", {"v": 2})
+        cache.get("a")
+        cache.put("c", {"v": 3})
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == {"v": 1}
+        assert cache.get("c") == {"v": 3}
+
+    def test_make_key_distinguishes_point(self):
+        """Test that limits at different points get different keys"""
+        assert SolutionCache.make_key("limit", "easy", "e", 0) != SolutionCache.make_key(
+            "limit", "easy", "e", 1
+        )
+
+    def test_pickle_reopens_lazily(self, tmp_path):
+        """Test that a pickled cache points at the same file"""
+        cache = SolutionCache(tmp_path / "cache.db", max_entries=5)
+        cache.put("k", {"v": 1})
+
+        clone = pickle.loads(pickle.dumps(cache))
+
+        assert clone.max_entries == 5
+        assert clone.get("k") == {"v": 1}
+
+    def test_invalid_size(self, tmp_path):
+        """Test that a non-positive size is rejected"""
+        with pytest.raises(ValueError):
+            SolutionCache(tmp_path / "cache.db", max_entries=0)
+
+    def test_generator_serves_repeat_runs_from_cache(self, tmp_path):
+        """Test that a cached run reproduces uncached output from cache hits"""
+        expected = ProblemGenerator(seed=3).generate_problem_set(count=8)
+
+        cache = SolutionCache(tmp_path / "cache.db")
+        first = ProblemGenerator(seed=3, cache=cache).generate_problem_set(count=8)
+        misses = cache.misses
+        second = ProblemGenerator(seed=3, cache=cache).generate_problem_set(count=8)
+
+        assert first == expected
+        assert second == expected
+        assert cache.misses == misses
+        assert cache.hits >= 8
+
+    def test_entries_from_previous_version_are_ignored(self, tmp_path, monkeypatch):
+        """Test that solutions cached by an older version are not served"""
+        cache = SolutionCache(tmp_path / "cache.db")
+        monkeypatch.setattr(src.cache, "SCHEMA_VERSION", src.cache.SCHEMA_VERSION - 1)
+        stale = ProblemGenerator(seed=3, cache=cache).generate_problem_set(count=4)
+        keys = [row[0] for row in cache._connect().execute("SELECT key FROM solutions")]
+        for key in keys:
+            cache.put(key, dict(cache.get(key), steps=["stale"]))
+        monkeypatch.undo()
+
+        fresh = ProblemGenerator(seed=3, cache=cache).generate_problem_set(count=4)
+
+        assert all(problem["steps"] != ["stale"] for problem in fresh)
+        assert [problem["solution"] for problem in fresh] == [
+            problem["solution"] for problem in stale
+        ]
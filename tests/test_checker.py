@@ -0,0 +1,151 @@
+"""
+Unit tests for AnswerChecker
+"""
+
+import pytest
+from src.checker import AnswerChecker, compile_expression
+from src.generator import ProblemGenerator
+
+
+@pytest.fixture(scope="module")
+def checker():
+    """Checker with the default sample points"""
+    return AnswerChecker()
+
+
+class TestCompileExpression:
+    """Test cases for compiling expressions"""
+
+    @pytest.mark.parametrize(
+        "expression",
+        [
+            "__import__('os').system('true')",
+            "x.real",
+            "(lambda: 1)()",
+            "[x]",
+            "x if x else 1",
+            "open('f')",
+            "log(x, 2)",
+            "'x'",
+            "x +",
+        ],
+    )
+    def test_rejects_unsafe_or_invalid_syntax(self, expression):
+        """Test that anything beyond arithmetic and known functions is rejected"""
+        with pytest.raises(ValueError):
+            compile_expression(expression)
+
+    def test_rejects_long_input(self):
+        """Test that oversized submissions are rejected before parsing"""
+        with pytest.raises(ValueError):
+            compile_expression("x+" * 1000 + "x")
+
+    @pytest.mark.parametrize(
+        "implicit, explicit",
+        [
+            ("2x", "2*x"),
+            ("3x^2", "3*x**2"),
+            ("2x(x + 1)", "2*x*(x + 1)"),
+            ("(x + 1)(x - 1)", "(x + 1)*(x - 1)"),
+            ("x sin(x)", "x*sin(x)"),
+            ("2pi x", "2*pi*x"),
+        ],
+    )
+    def test_implicit_multiplication(self, implicit, explicit):
+        """Test that juxtaposed factors multiply, while calls stay calls"""
+        points = AnswerChecker().points
+
+        assert compile_expression(implicit)(points) == pytest.approx(
+            compile_expression(explicit)(points)
+        )
+
+    def test_caret_is_power(self):
+        """Test that ^ means exponentiation with the usual precedence"""
+        evaluate = compile_expression("x^2/2 + 1")
+
+        assert evaluate(AnswerChecker().points[:1])[0] == pytest.approx(
+            AnswerChecker().points[0] ** 2 / 2 + 1
+        )
+
+
+class TestAnswerChecker:
+    """Test cases for checking answers"""
+
+    @pytest.mark.parametrize("difficulty", ["easy", "medium", "hard"])
+    def test_generated_solutions_check_out(self, checker, difficulty):
+        """Test that every generated solution is accepted as its own answer"""
+        problems = ProblemGenerator(seed=3).generate_problem_set(
+            count=30, difficulty=difficulty
+        )
+
+        for problem in problems:
+            assert checker.check(problem, problem["solution"]), problem["solution"]
+
+    def test_derivative(self, checker):
+        """Test that equivalent forms pass and other functions fail"""
+        problem = {"type": "derivative", "solution": "2*x*cos(x) + 2*sin(x)"}
+
+        result = checker.check_many(
+            problem,
+            ["2*(x*cos(x) + sin(x))", "2x*cos(x)", "2*x*cos(x) + 2*sin(x) + 1", "cos(x)"],
+        )
+
+        assert result.tolist() == [True, False, False, False]
+
+    def test_integral_allows_constant_offset(self, checker):
+        """Test that antiderivatives differing by a constant are accepted"""
+        problem = {"type": "integral", "solution": "-2*x - 5*log(x - 4)"}
+
+        result = checker.check_many(
+            problem,
+            ["-2*x - 5*log(x - 4) + 3", "-5*log(4 - x) - 2*x", "-2*x", "-2*x - 5*log(x)"],
+        )
+
+        assert result.tolist() == [True, True, False, False]
+
+    @pytest.mark.parametrize(
+        "solution, answer",
+        [
+            ("log(x + 1)", "ln(abs(x+1))"),
+            ("x**2/2 + log(x)", "x^2/2 + ln(abs(x))"),
+            ("3*log(x - 1) + log(x + 1)/2", "3ln(abs(x - 1)) + ln(abs(x + 1))/2"),
+        ],
+    )
+    def test_integral_across_log_singularities(self, checker, solution, answer):
+        """Test that log and ln(abs(...)) forms agree on both sides of a pole"""
+        problem = {"type": "integral", "solution": solution}
+
+        assert checker.check_many(problem, [answer, answer + " + x"]).tolist() == [
+            True,
+            False,
+        ]
+
+    def test_limit(self, checker):
+        """Test numeric, infinite and undefined limits"""
+        assert checker.check_many(
+            {"type": "limit", "solution": "-oo"}, ["-oo", "-inf", "oo", "-1e300"]
+        ).tolist() == [True, True, False, False]
+        assert checker.check_many(
+            {"type": "limit", "solution": "2"}, ["2", "4/2", "2.001", "x + 1"]
+        ).tolist() == [True, True, False, False]
+        assert checker.check_many(
+            {"type": "limit", "solution": "undefined"}, ["DNE", "0"]
+        ).tolist() == [True, False]
+
+    def test_bad_answers_are_wrong_not_errors(self, checker):
+        """Test that unparsable or overflowing answers are simply incorrect"""
+        problem = {"type": "derivative", "solution": "2*x"}
+
+        result = checker.check_many(
+            problem, ["2*x +", "import os", "2.0**2.0**2.0**99", "sin", "2*x"]
+        )
+
+        assert result.tolist() == [False, False, False, False, True]
+
+    def test_duplicate_answers_keep_their_positions(self, checker):
+        """Test that repeated answers map back to every submission"""
+        problem = {"type": "integral", "solution": "x**2/2"}
+
+        result = checker.check_many(problem, ["x^2/2", "x", "x**2/2 + 1", "x"] * 50)
+
+        assert result.tolist() == [True, False, True, False] * 50
@@ -0,0 +1,109 @@
+"""
+Unit tests for duplicate-free problem sets
+"""
+
+import pytest
+from src.dedup import DedupIndex
+from src.generator import ProblemGenerator
+
+
+def problem_key(problem):
+    """What makes two problems in a set the same"""
+    return problem["type"], problem["function"], problem.get("point")
+
+
+class TestUniqueProblemSets:
+    """Test cases for unique problem sets"""
+
+    def test_unique_set_has_no_duplicates(self):
+        """Test that a large easy set never repeats a problem"""
+        problems = ProblemGenerator(seed=0).generate_problem_set(
+            count=2000, difficulty="easy", unique=True
+        )
+
+        assert len({problem_key(p) for p in problems}) == 2000
+
+    def test_matches_plain_set_until_first_duplicate(self):
+        """Test that deduplication only changes problems that would repeat"""
+        plain = ProblemGenerator(seed=6).generate_problem_set(count=20, difficulty="easy")
+        unique = ProblemGenerator(seed=6).generate_problem_set(
+            count=20, difficulty="easy", unique=True
+        )
+
+        assert unique == plain
+
+    def test_family_can_be_exhausted(self):
+        """Test that every problem of a family can be drawn, then other types fill in"""
+        problems = ProblemGenerator(seed=1).generate_problem_set(
+            count=5, problem_types=["derivative", "limit"], difficulty="hard", unique=True
+        )
+
+        assert sorted(p["function"] for p in problems) == sorted(
+            ["exp(x)*sin(x)", "x*log(x)", "sin(x)*cos(x)", "exp(x**2)", "sin(x)/x"]
+        )
+
+    def test_whole_space_drawn_without_replacement(self):
+        """Test that the last draws of a nearly exhausted family still succeed"""
+        problems = ProblemGenerator(seed=2).generate_problem_set(
+            count=1320, problem_types=["integral"], difficulty="easy", unique=True
+        )
+
+        assert len({p["function"] for p in problems}) == 1320
+
+    def test_timed_out_problems_stay_available(self):
+        """Test that a problem whose solve overran is not counted as used"""
+        generator = ProblemGenerator(seed=1, solve_timeout=1e-6, max_redraws=2)
+        problems = generator.generate_problem_set(
+            count=5, problem_types=["derivative", "limit"], difficulty="hard", unique=True
+        )
+
+        assert generator.solve_stats.summary()["limit/hard"]["timeouts"] > 0
+        assert len({problem_key(p) for p in problems}) == 5
+
+    def test_release_returns_spec_to_pool(self):
+        """Test that a released spec can be drawn again from an exhausted family"""
+        generator = ProblemGenerator(seed=3)
+        index = DedupIndex()
+        spec = index.draw(generator, "limit", "hard")
+        with pytest.raises(ValueError, match="all 1 limit/hard problems used"):
+            index.draw(generator, "limit", "hard")
+
+        index.release(generator, "limit", "hard", spec)
+
+        assert index.draw(generator, "limit", "hard") == spec
+
+    def test_count_beyond_capacity_is_rejected(self):
+        """Test that asking for more unique problems than exist fails early"""
+        with pytest.raises(ValueError, match="only 1 unique"):
+            ProblemGenerator().generate_problem_set(
+                count=2, problem_types=["limit"], difficulty="medium", unique=True
+            )
+
+    def test_unique_requires_single_process(self):
+        """Test that unique sets refuse worker processes"""
+        with pytest.raises(ValueError):
+            ProblemGenerator().generate_problem_set(count=2, workers=2, unique=True)
+
+    @pytest.mark.parametrize(
+        "problem_type,difficulty,count",
+        [
+            ("derivative", "easy", 1320),
+            ("derivative", "medium", 29260),
+            ("derivative", "hard", 4),
+            ("integral", "medium", 2640),
+            ("integral", "hard", None),
+            ("limit", "easy", 3960),
+            ("limit", "medium", 1),
+        ],
+    )
+    def test_unique_problem_count(self, problem_type, difficulty, count):
+        """Test the reported size of each problem space"""
+        assert ProblemGenerator().unique_problem_count(problem_type, difficulty) == count
+
+    def test_equivalent_rational_functions_collide(self):
+        """Test that hard integrals are keyed by their cancelled form"""
+        generator = ProblemGenerator()
+        first = DedupIndex._canonical(generator, "integral", "hard", ((2, 2), (1, 1)))
+        second = DedupIndex._canonical(generator, "integral", "hard", ((4, 4), (2, 2)))
+
+        assert first == second
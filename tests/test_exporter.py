@@ -2,6 +2,12 @@
 Unit tests for ProblemExporter
 """
 
+import io
+import json
+import subprocess
+import sys
+from datetime import datetime
+
 import pytest
 from src.generator import ProblemGenerator
 from src.exporter import ProblemExporter
@@ -152,3 +158,68 @@ class TestProblemExporter:
         assert len(md) > 0
         assert len(latex) > 0
         assert len(text) > 0
+
+    def test_write_functions_match_string_exports(self):
+        """Test that streaming writers produce the same output as to_* methods"""
+        for write, render in [
+            (self.exporter.write_markdown, self.exporter.to_markdown),
+            (self.exporter.write_latex, self.exporter.to_latex),
+            (self.exporter.write_text, self.exporter.to_text),
+            (self.exporter.write_json, self.exporter.to_json),
+        ]:
+            stream = io.StringIO()
+            write(iter(self.sample_problems), stream)
+            assert stream.getvalue() == render(self.sample_problems)
+
+    def test_to_json_matches_json_dumps(self):
+        """Test that JSON export is identical to a full json.dumps"""
+        for problems in [self.sample_problems, []]:
+            assert self.exporter.to_json(problems) == json.dumps(
+                problems, indent=2, ensure_ascii=False
+            )
+
+    def test_generated_at_fixes_timestamp(self):
+        """Test that an explicit timestamp makes exports reproducible"""
+        generated_at = datetime(2024, 5, 6, 7, 8)
+
+        md = self.exporter.to_markdown(self.sample_problems, generated_at=generated_at)
+        latex = self.exporter.to_latex(self.sample_problems, generated_at=generated_at)
+        text = self.exporter.to_text(self.sample_problems, generated_at=generated_at)
+
+        assert "*Generated on: 2024-05-06 07:08*" in md
+        assert r"\date{2024-05-06}" in latex
+        assert "Generated: 2024-05-06 07:08" in text
+
+    def test_problem_without_steps(self):
+        """Test that problems without steps omit the steps section"""
+        problem = dict(self.sample_problems[0], steps=[])
+
+        assert "### Steps" not in self.exporter.to_markdown([problem])
+        assert r"\subsection*{Steps}" not in self.exporter.to_latex([problem])
+        assert "Steps:" not in self.exporter.to_text([problem])
+
+    @pytest.mark.parametrize("export_format", ["markdown", "latex", "text", "json"])
+    def test_format_fields_are_sufficient(self, export_format):
+        """Test that generating only a format's fields exports the same document"""
+        generated_at = datetime(2024, 5, 6, 7, 8)
+        fields = self.exporter.FORMAT_FIELDS[export_format]
+        problems = ProblemGenerator(seed=42, fields=fields).generate_problem_set(
+            count=3
+        )
+        render = getattr(self.exporter, f"to_{export_format}")
+        options = {} if export_format == "json" else {"generated_at": generated_at}
+
+        assert render(problems, **options) == render(self.sample_problems, **options)
+
+    def test_exporter_import_does_not_load_sympy(self):
+        """Test that importing the package and exporter leaves SymPy unloaded"""
+        code = (
+            "import sys, src, src.exporter; "
+            "src.ProblemExporter; "
+            "print('sympy' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "False"
@@ -2,6 +2,9 @@
 Unit tests for ProblemGenerator
 """
 
+import random
+import threading
+
 import pytest
 from src.generator import ProblemGenerator
 
@@ -174,3 +177,220 @@ class TestProblemGenerator:
 
         # Should be different with high probability
         assert prob1["function"] != prob2["function"]
+
+    def test_solution_computed_once_per_problem(self, monkeypatch):
+        """Test that each SymPy solve runs at most once and feeds the steps"""
+        import src.generator as generator_module
+
+        calls = {"integrate": 0, "ratint": 0}
+
+        def counting(name):
+            original = getattr(generator_module, name)
+
+            def wrapper(*args, **kwargs):
+                calls[name] += 1
+                return original(*args, **kwargs)
+
+            return wrapper
+
+        for name in calls:
+            monkeypatch.setattr(generator_module, name, counting(name))
+
+        derivative = self.generator.generate_derivative_problem()
+        integral = self.generator.generate_integral_problem()
+        limit = self.generator.generate_limit_problem()
+        rational = self.generator.generate_integral_problem("hard")
+
+        # Medium families are specialized from templates; hard integrals
+        # are solved directly
+        assert calls == {"integrate": 0, "ratint": 1}
+        assert rational["steps"][-1] == f"Result: ∫f(x)dx = {rational['solution']} + C"
+        assert derivative["steps"][-1] == f"Result: f'(x) = {derivative['solution']}"
+        assert integral["steps"][-1] == f"Result: ∫f(x)dx = {integral['solution']} + C"
+        assert limit["steps"][-1].endswith(f"= {limit['solution']}")
+
+    def test_problem_set_identical_across_worker_counts(self):
+        """Test that parallel generation matches serial output in number order"""
+        serial = ProblemGenerator(seed=7).generate_problem_set(count=12)
+        parallel = ProblemGenerator(seed=7).generate_problem_set(count=12, workers=3)
+
+        assert parallel == serial
+        assert [p["number"] for p in parallel] == list(range(1, 13))
+
+    def test_problem_set_rejects_invalid_workers(self):
+        """Test that a non-positive worker count is rejected"""
+        with pytest.raises(ValueError):
+            self.generator.generate_problem_set(count=1, workers=0)
+
+    def test_derive_seed_is_stable(self):
+        """Test that per-problem seeds depend only on master seed and number"""
+        from src.generator import derive_seed
+
+        assert derive_seed(1, 1) == derive_seed(1, 1)
+        assert derive_seed(1, 1) != derive_seed(1, 2)
+        assert derive_seed(1, 1) != derive_seed(2, 1)
+
+    def test_seeded_generators_are_independent(self):
+        """Test that interleaved generators and the global random module don't interact"""
+        expected = ProblemGenerator(seed=5).generate_problem_set(count=6)
+
+        gen1 = ProblemGenerator(seed=5)
+        gen2 = ProblemGenerator(seed=6)
+        gen2.generate_problem_set(count=3)
+        random.seed(0)
+
+        assert gen1.generate_problem_set(count=6) == expected
+
+    def test_seeded_output_stable_across_threads(self):
+        """Test that seeded generators running concurrently in threads stay reproducible"""
+
+        def workload(seed):
+            generator = ProblemGenerator(seed=seed)
+            problems = [generator.generate_derivative_problem("easy") for _ in range(5)]
+            problems += generator.generate_problem_set(count=5, difficulty="easy")
+            return problems
+
+        seeds = list(range(8))
+        expected = {seed: workload(seed) for seed in seeds}
+
+        results = {}
+        barrier = threading.Barrier(len(seeds))
+
+        def run(seed):
+            barrier.wait()
+            results[seed] = workload(seed)
+
+        threads = [threading.Thread(target=run, args=(seed,)) for seed in seeds]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == expected
+
+    def test_iter_problems_matches_problem_set(self):
+        """Test that the streaming API yields the same problems"""
+        expected = ProblemGenerator(seed=9).generate_problem_set(count=6)
+
+        assert list(ProblemGenerator(seed=9).iter_problems(count=6)) == expected
+        assert list(ProblemGenerator(seed=9).iter_problems(count=6, workers=2)) == expected
+
+    def test_iter_problems_is_lazy(self):
+        """Test that the first problem of a huge set is available immediately"""
+        problems = ProblemGenerator(seed=9).iter_problems(count=10**9)
+
+        assert next(problems)["number"] == 1
+        assert next(problems)["number"] == 2
+
+    def test_expression_rendering_is_memoized(self):
+        """Test that repeated expressions are printed once per process"""
+        from src.rendering import render_cache_info, render_latex, render_str
+
+        expression = self.generator.x**3 + 7 * self.generator.x
+        before = render_cache_info()
+
+        assert render_str(expression) == str(expression)
+        assert render_str(expression) == str(expression)
+        assert render_latex(expression) == "x^{3} + 7 x"
+        assert render_latex(expression) == "x^{3} + 7 x"
+
+        after = render_cache_info()
+        assert after["str"]["hits"] >= before["str"]["hits"] + 1
+        assert after["latex"]["hits"] >= before["latex"]["hits"] + 1
+
+
+class TestFieldSelection:
+    """Test cases for computing only the requested fields"""
+
+    @pytest.mark.parametrize("difficulty", ["easy", "medium", "hard"])
+    @pytest.mark.parametrize(
+        "fields",
+        [
+            ("function", "solution", "steps"),
+            ("function_latex", "solution_latex"),
+            ("solution",),
+        ],
+    )
+    def test_fields_are_a_subset_of_full_problems(self, difficulty, fields):
+        """Test that requested fields match a full run and the others are left out"""
+        full = ProblemGenerator(seed=3).generate_problem_set(
+            count=9, difficulty=difficulty
+        )
+        partial = ProblemGenerator(seed=3, fields=fields).generate_problem_set(
+            count=9, difficulty=difficulty
+        )
+
+        for problem, reference in zip(partial, full):
+            kept = set(fields) | {"type", "difficulty", "point", "number"}
+            assert problem == {
+                name: value for name, value in reference.items() if name in kept
+            }
+
+    def test_skipped_fields_are_not_computed(self, monkeypatch):
+        """Test that skipped renders and steps never run"""
+        import src.generator
+
+        def fail(*args, **kwargs):
+            raise AssertionError("skipped field computed")
+
+        monkeypatch.setattr(src.generator, "render_latex", fail)
+        for name in ("derivative", "integral", "limit"):
+            monkeypatch.setattr(ProblemGenerator, f"_generate_{name}_steps", fail)
+        generator = ProblemGenerator(seed=2, fields=["function", "solution"])
+
+        for difficulty in ("medium", "hard"):
+            assert generator.generate_problem_set(count=6, difficulty=difficulty)
+
+    def test_workers_and_vectorized_honor_fields(self):
+        """Test that worker processes and NumPy batches skip the same fields"""
+        fields = ["function_latex", "solution_latex"]
+        serial = ProblemGenerator(seed=5, fields=fields).generate_problem_set(count=6)
+        parallel = ProblemGenerator(seed=5, fields=fields).generate_problem_set(
+            count=6, workers=2
+        )
+        vectorized = ProblemGenerator(seed=5, fields=fields).generate_problem_set(
+            count=6, difficulty="easy", vectorized=True
+        )
+
+        assert parallel == serial
+        assert all("steps" not in problem for problem in vectorized)
+        assert all("function_latex" in problem for problem in vectorized)
+
+    def test_partial_problems_are_cached_complete(self, tmp_path):
+        """Test that a subset run stores complete problems and is served subsets"""
+        from src.cache import SolutionCache
+
+        cache = SolutionCache(str(tmp_path / "cache.db"))
+        partial = ProblemGenerator(
+            seed=1, cache=cache, fields=["solution"]
+        ).generate_problem_set(count=3)
+        assert len(cache) > 0
+
+        full = ProblemGenerator(seed=1, cache=cache).generate_problem_set(count=3)
+        cached = ProblemGenerator(
+            seed=1, cache=cache, fields=["solution"]
+        ).generate_problem_set(count=3)
+        assert full == ProblemGenerator(seed=1).generate_problem_set(count=3)
+        assert cached == partial
+        assert [problem["solution"] for problem in cached] == [
+            problem["solution"] for problem in full
+        ]
+        assert all("steps" not in problem for problem in cached)
+
+    def test_markdown_run_fills_cache(self, tmp_path):
+        """Test that the default CLI format writes to --cache"""
+        import main
+        from src.cache import SolutionCache
+
+        path = str(tmp_path / "cache.db")
+        main.main(
+            ["-n", "4", "-d", "hard", "-s", "3", "-o", str(tmp_path / "set.md"),
+             "--cache", path]
+        )  # fmt: skip
+
+        assert len(SolutionCache(path)) > 0
+
+    def test_unknown_field_rejected(self):
+        """Test that misspelled fields raise instead of being ignored"""
+        with pytest.raises(ValueError, match="unknown fields: stpes"):
+            ProblemGenerator(fields=["stpes"])
@@ -0,0 +1,120 @@
+"""
+Unit tests for the tiered limit solver
+"""
+
+import pytest
+import sympy
+from sympy import cos, exp, log, oo, sin
+from src.generator import ProblemGenerator
+from src.limits import solve_limit, x
+
+
+@pytest.fixture
+def no_gruntz(monkeypatch):
+    """Fail if a limit falls through to sympy.limit"""
+    solve_limit.cache_clear()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("sympy.limit called")
+
+    monkeypatch.setattr(sympy, "limit", fail)
+    yield
+    solve_limit.cache_clear()
+
+
+class TestSolveLimit:
+    """Test cases for the solver tiers"""
+
+    @pytest.mark.parametrize(
+        "function,point,tier,value",
+        [
+            (x**2 + 1, 0, "substitution", 1),
+            (cos(x) / (x + 1), 0, "substitution", 1),
+            (exp(x) * sin(x) + log(x + 2), 0, "substitution", log(2)),
+            (3 * x**2 - x + 2, oo, "leading_term", oo),
+            (3 - x**2, oo, "leading_term", -oo),
+            (2 - x**3, -oo, "leading_term", oo),
+            (x**2 / (x - 1), -oo, "leading_term", -oo),
+            ((2 * x**2 + 1) / (5 * x**2 - x), oo, "leading_term", sympy.Rational(2, 5)),
+            ((x + 1) / (x**3 - 2), oo, "leading_term", 0),
+            ((x**2 - 1) / (x - 1), 1, "cancellation", 2),
+            ((x**2 - 4) / (x**2 - 3 * x + 2), 2, "cancellation", 4),
+        ],
+    )
+    def test_cheap_tiers(self, no_gruntz, function, point, tier, value):
+        """Test that each tier resolves its cases without sympy.limit"""
+        solution = solve_limit(function, point)
+
+        assert solution.tier == tier
+        assert solution.value == value
+
+    @pytest.mark.parametrize(
+        "function,point",
+        [(sin(x) / x, 0), (x * log(x), 0), (exp(x) / x, oo), (1 / x, 0)],
+    )
+    def test_leftovers_fall_back_to_gruntz(self, function, point):
+        """Test that other limits are passed to sympy.limit unchanged"""
+        solution = solve_limit(function, point)
+
+        assert solution.tier == "gruntz"
+        assert solution.value == sympy.limit(function, x, point)
+
+    @pytest.mark.parametrize(
+        "function,point,value",
+        [
+            (sympy.sign(x), 0, 1),
+            (sympy.Heaviside(x), 0, 1),
+            (sympy.floor(x) + x, 1, 2),
+        ],
+    )
+    def test_discontinuous_functions_skip_substitution(self, function, point, value):
+        """Test that a finite substitution is not trusted at a jump"""
+        solution = solve_limit(function, point)
+
+        assert solution.tier == "gruntz"
+        assert solution.value == value == sympy.limit(function, x, point)
+
+    def test_substitution_is_reported(self):
+        """Test that the direct substitution is returned for the steps"""
+        solution = solve_limit((x**2 - 1) / (x - 1), 1)
+
+        assert solution.substitution is sympy.nan
+        assert solve_limit((x**2 - 1) / (x - 1), 1) is solution
+
+
+class TestLimitTiers:
+    """Test cases for counting tiers during generation"""
+
+    def test_counts_cover_every_limit(self):
+        """Test that every generated limit problem records one tier"""
+        generator = ProblemGenerator(seed=5)
+        problems = generator.generate_problem_set(
+            count=30, problem_types=["limit"], difficulty="easy"
+        )
+
+        tiers = generator.solve_stats.limit_tiers()["limit/easy"]
+        assert sum(tiers.values()) == len(problems)
+        assert set(tiers) <= {"substitution", "leading_term"}
+
+    @pytest.mark.parametrize(
+        "difficulty,tier", [("medium", "cancellation"), ("hard", "gruntz")]
+    )
+    def test_fixed_limits(self, difficulty, tier):
+        """Test the tier of the fixed medium and hard limits"""
+        generator = ProblemGenerator(seed=5)
+        generator.generate_problem_set(
+            count=4, problem_types=["limit"], difficulty=difficulty
+        )
+
+        assert generator.solve_stats.limit_tiers() == {f"limit/{difficulty}": {tier: 4}}
+
+    def test_counts_merge_across_workers(self):
+        """Test that worker processes' tier counts are merged back"""
+        serial = ProblemGenerator(seed=9)
+        serial.generate_problem_set(count=12, problem_types=["limit"], difficulty="easy")
+        parallel = ProblemGenerator(seed=9)
+        parallel.generate_problem_set(
+            count=12, problem_types=["limit"], difficulty="easy", workers=2
+        )
+
+        assert parallel.solve_stats.limit_tiers() == serial.solve_stats.limit_tiers()
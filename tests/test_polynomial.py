@@ -0,0 +1,91 @@
+"""
+Unit tests for Polynomial
+"""
+
+import math
+import random
+from fractions import Fraction
+
+import pytest
+import sympy as sp
+from src.generator import ProblemGenerator
+from src.polynomial import Polynomial, format_number, format_number_latex
+
+x = sp.Symbol("x")
+
+
+class TestPolynomial:
+    """Test cases for Polynomial class"""
+
+    def test_trailing_zeros_are_dropped(self):
+        """Test that the degree ignores zero leading coefficients"""
+        assert Polynomial([1, 2, 0, 0]).degree == 1
+        assert Polynomial([0]).degree == -1
+
+    def test_calculus(self):
+        """Test derivative, antiderivative, value and limits on coefficients"""
+        p = Polynomial([3, -5, 2])  # 2x^2 - 5x + 3
+
+        assert p.diff() == Polynomial([-5, 4])
+        assert p.integrate() == Polynomial([0, 3, Fraction(-5, 2), Fraction(2, 3)])
+        assert p.evaluate(1) == 0
+        assert p.limit(0) == 3
+        assert p.limit(math.inf) == math.inf
+        assert Polynomial([0, -1]).limit(math.inf) == -math.inf
+
+    def test_monomials_in_printing_order(self):
+        """Test that terms come out as single-term polynomials in SymPy's order"""
+        assert [str(term) for term in Polynomial([3, 0, -1]).monomials()] == [
+            "3",
+            "-x**2",
+        ]
+        assert Polynomial([1, 2, 5]).monomials() == [
+            Polynomial([0, 0, 5]),
+            Polynomial([0, 2]),
+            Polynomial([1]),
+        ]
+
+    def test_substituting_infinity(self):
+        """Test that opposite infinite terms give NaN, as in SymPy"""
+        assert math.isnan(Polynomial([0, -1, 4]).evaluate(math.inf))
+        assert Polynomial([3, 0, 4]).evaluate(math.inf) == math.inf
+
+    @pytest.mark.parametrize(
+        "coeffs",
+        [
+            [3, 0, -1],
+            [0, -1],
+            [-2, 1],
+            [4, -3],
+            [-3, -5, -2],
+            [0, 0, 1],
+            [Fraction(1, 2), Fraction(-5, 2), 0, Fraction(2, 3)],
+            [Fraction(-1, 2)],
+            [0],
+        ],
+    )
+    def test_printing_matches_sympy(self, coeffs):
+        """Test that str() and latex() print what SymPy prints"""
+        p = Polynomial(coeffs)
+        expr = p.as_expr(x)
+
+        assert str(p) == str(expr)
+        assert p.latex() == sp.latex(expr)
+
+    def test_special_values_match_sympy(self):
+        """Test that infinities and NaN print as in SymPy"""
+        for value, expected in ((math.inf, sp.oo), (-math.inf, -sp.oo), (math.nan, sp.nan)):
+            assert format_number(value) == str(expected)
+            assert format_number_latex(value) == sp.latex(expected)
+
+    @pytest.mark.parametrize("problem_type", ["derivative", "integral", "limit"])
+    def test_easy_problems_match_sympy_path(self, problem_type):
+        """Test that the polynomial engine reproduces SymPy's problems exactly"""
+        generator = ProblemGenerator(seed=0)
+        specs = list(generator._enumerate_specs(problem_type, "easy"))
+
+        for spec in random.Random(1).sample(specs, 150):
+            drawn = generator._build_draw(problem_type, "easy", spec)
+            assert generator._solve_polynomial(
+                problem_type, spec
+            ) == generator._solve_cached(problem_type, "easy", drawn)
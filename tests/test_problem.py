@@ -0,0 +1,159 @@
+"""
+Unit tests for the Problem record
+"""
+
+import json
+import pickle
+import sys
+
+import pytest
+from src.generator import ProblemGenerator
+from src.problem import FIELDS, Problem, json_default, select_fields
+
+
+def make_problem(**fields):
+    """A limit problem as the generator builds it"""
+    problem = Problem(
+        type="limit",
+        difficulty="easy",
+        function="x + 1",
+        function_latex="x + 1",
+        point="0",
+        solution="1",
+        solution_latex="1",
+    )
+    problem["steps"] = ["Given function: f(x) = x + 1"]
+    problem.update(fields)
+    return problem
+
+
+class TestProblem:
+    """Test cases for Problem class"""
+
+    def test_dict_style_access(self):
+        """Test item access, get, membership and deletion"""
+        problem = make_problem(number=3)
+
+        assert problem["solution"] == "1"
+        assert problem.get("missing", "default") == "default"
+        assert "point" in problem and "missing" not in problem
+        del problem["number"]
+        assert "number" not in problem
+        with pytest.raises(KeyError):
+            problem["number"]
+        with pytest.raises(KeyError):
+            del problem["number"]
+
+    def test_equals_plain_dict(self):
+        """Test that a record equals the dict of the same fields"""
+        problem = make_problem(number=1)
+
+        assert problem == problem.to_dict()
+        assert problem.to_dict() == problem
+        assert problem != dict(problem.to_dict(), number=2)
+
+    def test_fields_keep_generator_order(self):
+        """Test that fields iterate in emission order whatever the insertion order"""
+        problem = Problem(number=1, steps=[], solution="2", type="derivative")
+
+        assert list(problem) == ["type", "solution", "steps", "number"]
+        assert len(problem) == 4
+
+    def test_unknown_keys(self):
+        """Test that keys outside the fixed fields are stored after them"""
+        problem = make_problem(score=5)
+
+        assert problem["score"] == 5
+        assert list(problem)[-1] == "score"
+        del problem["score"]
+        assert "score" not in problem
+
+    def test_repeated_values_are_interned(self):
+        """Test that type, difficulty and point share one object per value"""
+        encoded = json.dumps(make_problem().to_dict())
+        first, second = Problem(json.loads(encoded)), Problem(json.loads(encoded))
+
+        for key in ("type", "difficulty", "point"):
+            assert first[key] is second[key]
+        assert first["function"] is not second["function"]
+
+    def test_pickle_round_trip(self):
+        """Test that problems survive pickling, as between worker processes"""
+        problem = make_problem(number=7)
+        restored = pickle.loads(pickle.dumps(problem))
+
+        assert isinstance(restored, Problem)
+        assert restored == problem
+        assert restored["type"] is sys.intern("limit")
+
+    def test_smaller_than_dict(self):
+        """Test that a record takes less memory than the dict it replaces"""
+        problem = make_problem(number=1)
+
+        assert sys.getsizeof(problem) < sys.getsizeof(problem.to_dict())
+
+
+class TestJsonDefault:
+    """Test cases for the json.dumps hook"""
+
+    def test_serializes_records_anywhere_in_the_value(self):
+        """Test that records nested in lists and dicts encode as their fields"""
+        problem = make_problem(number=2)
+        encoded = json.dumps({"problems": [problem]}, default=json_default)
+
+        assert json.loads(encoded) == {"problems": [problem.to_dict()]}
+
+    def test_other_objects_still_raise(self):
+        """Test that the hook only handles Problem records"""
+        with pytest.raises(TypeError, match="set is not JSON serializable"):
+            json.dumps({1, 2}, default=json_default)
+
+
+class TestSelectFields:
+    """Test cases for resolving requested fields"""
+
+    def test_default_is_every_field(self):
+        """Test that no selection means every field"""
+        assert select_fields() == set(FIELDS)
+
+    def test_required_fields_are_added(self):
+        """Test that type, difficulty, point and number are always kept"""
+        assert select_fields(["steps"]) == {
+            "type",
+            "difficulty",
+            "point",
+            "number",
+            "steps",
+        }
+
+    def test_unknown_fields_rejected(self):
+        """Test that names outside FIELDS raise"""
+        with pytest.raises(ValueError, match="unknown fields: latex"):
+            select_fields(["solution", "latex"])
+
+
+class TestGeneratedProblems:
+    """Test cases for problems coming out of the generator"""
+
+    @pytest.mark.parametrize("difficulty", ["easy", "medium"])
+    def test_iter_problems_yields_records(self, difficulty):
+        """Test that the streaming path yields Problem records"""
+        problems = ProblemGenerator(seed=4).iter_problems(count=6, difficulty=difficulty)
+
+        for problem in problems:
+            assert isinstance(problem, Problem)
+            assert json.loads(json.dumps(problem, default=json_default)) == problem
+
+    def test_public_api_returns_plain_dicts(self):
+        """Test that generate_* results keep working as ordinary dicts"""
+        generator = ProblemGenerator(seed=4)
+        problems = generator.generate_problem_set(count=4, difficulty="easy")
+        single = generator.generate_limit_problem("easy")
+
+        assert problems == list(
+            ProblemGenerator(seed=4).iter_problems(count=4, difficulty="easy")
+        )
+        for problem in problems + [single]:
+            assert type(problem) is dict
+            assert problem.copy() | {"score": 1} == {**problem, "score": 1}
+        assert json.loads(json.dumps(problems)) == problems
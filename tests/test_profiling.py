@@ -0,0 +1,124 @@
+"""
+Unit tests for per-stage profiling
+"""
+
+import json
+
+import main
+import pytest
+from src.generator import ProblemGenerator
+from src.profiling import Profiler
+
+
+class TestProfiler:
+    """Test cases for Profiler counters"""
+
+    def test_stage_records_time_and_calls(self):
+        """Test that stages accumulate per type and difficulty"""
+        profiler = Profiler()
+        for _ in range(3):
+            with profiler.stage("solve", "limit", "hard"):
+                pass
+
+        row = profiler.summary()["limit/hard"]["solve"]
+        assert row["calls"] == 3
+        assert row["total"] >= 0 and row["mean"] == row["total"] / 3
+
+    def test_stage_records_on_error(self):
+        """Test that a stage interrupted by an exception is still timed"""
+        profiler = Profiler()
+        with pytest.raises(RuntimeError):
+            with profiler.stage("solve", "integral", "hard"):
+                raise RuntimeError
+
+        assert profiler.summary()["integral/hard"]["solve"]["calls"] == 1
+
+    def test_iterate_times_the_producer(self):
+        """Test that iterate yields every item and counts one call per item"""
+        profiler = Profiler()
+
+        assert list(profiler.iterate(range(4), "generate")) == [0, 1, 2, 3]
+        assert profiler.summary()["all/all"]["generate"]["calls"] == 4
+
+    def test_merge(self):
+        """Test that merging adds times and calls"""
+        first, second = Profiler(), Profiler()
+        first.record("render", "derivative", "easy", 0.5)
+        second.record("render", "derivative", "easy", 0.25, calls=2)
+
+        first.merge(second)
+
+        assert first.summary()["derivative/easy"]["render"] == {
+            "calls": 3,
+            "total": 0.75,
+            "mean": 0.25,
+        }
+
+    def test_summary_orders_stages(self):
+        """Test that stages are listed in pipeline order, whole-set rows last"""
+        profiler = Profiler()
+        for name in ("export", "steps", "solve", "draw"):
+            profiler.record(name, "all" if name == "export" else "limit", "all", 1)
+        profiler.record("render", "derivative", "hard", 1)
+
+        summary = profiler.summary()
+
+        assert list(summary) == ["derivative/hard", "limit/all", "all/all"]
+        assert list(summary["limit/all"]) == ["draw", "solve", "steps"]
+
+
+class TestGeneratorProfiling:
+    """Test cases for profiling a generator"""
+
+    @pytest.mark.parametrize("difficulty", ["easy", "medium"])
+    def test_counts_one_call_per_problem(self, difficulty):
+        """Test that every stage of the pipeline runs once per problem"""
+        profiler = Profiler()
+        ProblemGenerator(seed=1, profiler=profiler).generate_problem_set(
+            count=6, problem_types=["derivative"], difficulty=difficulty
+        )
+
+        stages = profiler.summary()[f"derivative/{difficulty}"]
+        assert stages["draw"]["calls"] == stages["solve"]["calls"] == 6
+        assert stages["steps"]["calls"] == 6
+
+    def test_output_is_unchanged(self):
+        """Test that profiling does not alter seeded output"""
+        expected = ProblemGenerator(seed=8).generate_problem_set(count=6)
+
+        result = ProblemGenerator(seed=8, profiler=Profiler()).generate_problem_set(
+            count=6
+        )
+
+        assert result == expected
+
+    def test_worker_timings_are_merged(self):
+        """Test that worker processes report their stages back"""
+        profiler = Profiler()
+        ProblemGenerator(seed=1, profiler=profiler).generate_problem_set(
+            count=8, problem_types=["limit"], difficulty="hard", workers=2
+        )
+
+        assert profiler.summary()["limit/hard"]["solve"]["calls"] == 8
+
+
+class TestProfileCommand:
+    """Test cases for the profiling CLI options"""
+
+    def test_profile_outputs(self, tmp_path, capsys):
+        """Test that --profile, --profile-json and --cprofile all report the run"""
+        profile_json = tmp_path / "profile.json"
+        cprofile = tmp_path / "run.prof"
+
+        main.main(
+            [
+                "-n", "4", "-d", "easy", "-s", "1", "-f", "json",
+                "-o", str(tmp_path / "set"), "--profile",
+                "--profile-json", str(profile_json), "--cprofile", str(cprofile),
+            ]
+        )  # fmt: skip
+
+        assert "export" in capsys.readouterr().err
+        summary = json.loads(profile_json.read_text())
+        assert summary["all/all"]["generate"]["calls"] == 4
+        assert cprofile.stat().st_size > 0
@@ -0,0 +1,193 @@
+"""
+Unit tests for the generation server
+"""
+
+import asyncio
+import json
+
+import pytest
+import src.server as server_module
+from src.generator import ProblemGenerator
+from src.server import MAX_BODY_SIZE, MAX_HEADERS, ProblemServer, parse_params
+
+
+async def _request(port, method, target, body=b""):
+    """Send one HTTP request and return status and body"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"{method} {target} HTTP/1.1\r\nHost: test\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), payload
+
+
+async def _send_raw(port, data):
+    """Send raw request bytes and return the response status"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return int(response.split()[1])
+
+
+def _failing_render(params):
+    """Stand-in for _render_request that fails inside the worker"""
+    raise RuntimeError("solver crashed")
+
+
+class TestParseParams:
+    """Test cases for request parameter validation"""
+
+    def test_defaults_match_cli(self):
+        """Test that missing parameters take the CLI defaults"""
+        params = parse_params({}, max_count=100)
+
+        assert params == {
+            "count": 5,
+            "types": ["derivative", "integral", "limit"],
+            "difficulty": "medium",
+            "seed": None,
+            "format": "json",
+            "title": "Math Problem Set",
+            "steps": True,
+        }
+
+    def test_query_string_values(self):
+        """Test that string values from a query string are converted"""
+        params = parse_params(
+            {"count": "3", "seed": "7", "types": "limit,integral"}, max_count=100
+        )
+
+        assert params["count"] == 3
+        assert params["seed"] == 7
+        assert params["types"] == ["limit", "integral"]
+        assert parse_params({"steps": "false"}, max_count=100)["steps"] is False
+
+    @pytest.mark.parametrize(
+        "raw",
+        [
+            {"count": "many"},
+            {"count": 101},
+            {"count": -1},
+            {"types": "series"},
+            {"types": []},
+            {"difficulty": "extreme"},
+            {"format": "pdf"},
+            {"steps": 1},
+        ],
+    )
+    def test_invalid_values(self, raw):
+        """Test that invalid parameters are rejected"""
+        with pytest.raises(ValueError):
+            parse_params(raw, max_count=100)
+
+
+class TestProblemServer:
+    """End-to-end test cases for ProblemServer"""
+
+    def test_generate_matches_generator(self):
+        """Test that served problem sets match direct generation"""
+
+        async def scenario():
+            server = ProblemServer(workers=1)
+            listener = await server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            try:
+                health = await _request(port, "GET", "/health")
+                served = await _request(port, "GET", "/generate?count=4&seed=11")
+                posted = await _request(
+                    port,
+                    "POST",
+                    "/generate",
+                    json.dumps({"count": 2, "seed": 1, "format": "text"}).encode(),
+                )
+                no_steps = await _request(
+                    port, "GET", "/generate?count=3&seed=11&steps=false"
+                )
+                invalid = await _request(port, "GET", "/generate?difficulty=x")
+                missing = await _request(port, "GET", "/nothing")
+            finally:
+                listener.close()
+                await listener.wait_closed()
+                server.close()
+            return health, served, posted, no_steps, invalid, missing
+
+        health, served, posted, no_steps, invalid, missing = asyncio.run(scenario())
+
+        assert health == (200, b'{"status": "ok"}')
+        assert served[0] == 200
+        assert json.loads(served[1]) == ProblemGenerator(seed=11).generate_problem_set(
+            count=4
+        )
+        assert posted[0] == 200
+        assert posted[1].startswith(b"Math Problem Set")
+        assert json.loads(no_steps[1]) == [
+            {name: value for name, value in problem.items() if name != "steps"}
+            for problem in ProblemGenerator(seed=11).generate_problem_set(count=3)
+        ]
+        assert invalid[0] == 400
+        assert "difficulty" in json.loads(invalid[1])["error"]
+        assert missing[0] == 404
+
+    def test_generation_failure_is_a_json_500(self, monkeypatch, capsys):
+        """Test that a failing worker answers 500 and the server keeps serving"""
+        monkeypatch.setattr(server_module, "_render_request", _failing_render)
+
+        async def scenario():
+            server = ProblemServer(workers=1)
+            listener = await server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            try:
+                failed = await _request(port, "GET", "/generate?count=2")
+                health = await _request(port, "GET", "/health")
+            finally:
+                listener.close()
+                await listener.wait_closed()
+                server.close()
+            return failed, health
+
+        failed, health = asyncio.run(scenario())
+
+        assert failed[0] == 500
+        assert json.loads(failed[1]) == {"error": "generation failed: RuntimeError"}
+        assert health[0] == 200
+        assert "solver crashed" in capsys.readouterr().err
+
+    def test_oversized_requests_are_refused(self):
+        """Test that long lines, many headers and large bodies are not buffered"""
+        long_line = b"GET /generate?seed=" + b"1" * 20000 + b" HTTP/1.1\r\n\r\n"
+        many_headers = (
+            b"GET /health HTTP/1.1\r\n"
+            + b"X-Filler: 1\r\n" * (MAX_HEADERS + 1)
+            + b"\r\n"
+        )
+        large_body = (
+            b"POST /generate HTTP/1.1\r\n"
+            + f"Content-Length: {MAX_BODY_SIZE + 1}\r\n\r\n".encode()
+        )
+
+        async def scenario():
+            server = ProblemServer(workers=1)
+            listener = await server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            try:
+                statuses = [
+                    await _send_raw(port, data)
+                    for data in (long_line, many_headers, large_body)
+                ]
+                health = await _request(port, "GET", "/health")
+            finally:
+                listener.close()
+                await listener.wait_closed()
+                server.close()
+            return statuses, health
+
+        statuses, health = asyncio.run(scenario())
+
+        assert statuses == [400, 400, 413]
+        assert health[0] == 200
@@ -0,0 +1,169 @@
+"""
+Unit tests for sharded generation
+"""
+
+import io
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import main
+import pytest
+import src.generator as generator_module
+from src.exporter import ProblemExporter
+from src.generator import ProblemGenerator
+from src.shard import parse_shard, read_partials, shard_numbers, write_partial
+
+JOB = {"count": 12, "seed": 9, "difficulty": "easy", "types": ["derivative", "limit"]}
+
+
+def generate_shard(path, index, total):
+    """Stand-in node: generate one shard of JOB into a partial file"""
+    problems = ProblemGenerator(seed=JOB["seed"]).iter_problems(
+        count=JOB["count"],
+        problem_types=JOB["types"],
+        difficulty=JOB["difficulty"],
+        numbers=shard_numbers(index, total, JOB["count"]),
+    )
+    with open(path, "w", encoding="utf-8") as stream:
+        write_partial(problems, stream, JOB, index, total)
+
+
+def write_shards(tmp_path, total):
+    """Generate every shard of JOB in its own process"""
+    paths = [str(tmp_path / f"part{index}.jsonl") for index in range(1, total + 1)]
+    with ProcessPoolExecutor(max_workers=total) as executor:
+        list(executor.map(generate_shard, paths, range(1, total + 1), [total] * total))
+    return paths
+
+
+class TestShardSpecs:
+    """Test cases for shard parsing and numbering"""
+
+    def test_parse_shard(self):
+        """Test that I/N specs parse and bad ones are rejected"""
+        assert parse_shard("2/5") == (2, 5)
+        for text in ("0/3", "4/3", "1", "a/b"):
+            with pytest.raises(ValueError):
+                parse_shard(text)
+
+    @pytest.mark.parametrize("count,total", [(10, 3), (7, 7), (2, 5), (0, 2)])
+    def test_shards_partition_the_set(self, count, total):
+        """Test that shards cover every problem number exactly once, in order"""
+        numbers = [
+            number
+            for index in range(1, total + 1)
+            for number in shard_numbers(index, total, count)
+        ]
+
+        assert numbers == list(range(1, count + 1))
+
+
+class TestShardedGeneration:
+    """Test cases for generating and merging shards"""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_slices_concatenate_to_whole_set(self, workers):
+        """Test that generating by slices reproduces the whole seeded set"""
+        whole = ProblemGenerator(seed=3).generate_problem_set(count=9, difficulty="easy")
+        sliced = [
+            problem
+            for numbers in (range(1, 4), range(4, 9), range(9, 10))
+            for problem in ProblemGenerator(seed=3).iter_problems(
+                count=9, difficulty="easy", workers=workers, numbers=numbers
+            )
+        ]
+
+        assert sliced == whole
+
+    def test_vectorized_slices_concatenate_to_whole_set(self, monkeypatch):
+        """Test that slices crossing batch boundaries match the whole set"""
+        monkeypatch.setattr(generator_module, "VECTOR_BATCH_SIZE", 4)
+        whole = ProblemGenerator(seed=3).generate_problem_set(
+            count=11, difficulty="easy", vectorized=True
+        )
+        sliced = [
+            problem
+            for numbers in (range(1, 3), range(3, 10), range(10, 12))
+            for problem in ProblemGenerator(seed=3).iter_problems(
+                count=11, difficulty="easy", vectorized=True, numbers=numbers
+            )
+        ]
+
+        assert sliced == whole
+
+    def test_numbers_outside_set_are_rejected(self):
+        """Test that a slice must lie within the set"""
+        with pytest.raises(ValueError):
+            list(ProblemGenerator().iter_problems(count=3, numbers=range(2, 6)))
+
+    def test_merged_shards_match_single_node(self, tmp_path):
+        """Test that merging partials from several processes reproduces one run"""
+        paths = write_shards(tmp_path, 3)
+        generated_at = datetime(2025, 1, 6, 9, 0)
+
+        job, _, problems = read_partials(list(reversed(paths)))
+        merged = ProblemExporter.to_markdown(list(problems), generated_at=generated_at)
+        single = ProblemGenerator(seed=JOB["seed"]).generate_problem_set(
+            count=JOB["count"], problem_types=JOB["types"], difficulty=JOB["difficulty"]
+        )
+
+        assert job == JOB
+        assert merged == ProblemExporter.to_markdown(single, generated_at=generated_at)
+
+    def test_missing_shard_is_rejected(self, tmp_path):
+        """Test that merging an incomplete job fails"""
+        paths = write_shards(tmp_path, 3)
+
+        with pytest.raises(ValueError, match="missing shards: 2/3"):
+            read_partials([paths[0], paths[2]])
+
+    def test_truncated_partial_is_rejected(self, tmp_path):
+        """Test that a partial missing problems fails while merging"""
+        paths = write_shards(tmp_path, 2)
+        with open(paths[0], encoding="utf-8") as stream:
+            lines = stream.readlines()
+        with open(paths[0], "w", encoding="utf-8") as stream:
+            stream.writelines(lines[:-1])
+
+        _, _, problems = read_partials(paths)
+        with pytest.raises(ValueError, match="part1.jsonl: holds 5 of 6 problems"):
+            list(problems)
+
+    def test_failed_merge_leaves_no_output(self, tmp_path, capsys):
+        """Test that merging a truncated middle shard names it and writes nothing"""
+        paths = write_shards(tmp_path, 3)
+        with open(paths[1], encoding="utf-8") as stream:
+            lines = stream.readlines()
+        with open(paths[1], "w", encoding="utf-8") as stream:
+            stream.writelines(lines[:-1])
+        output = tmp_path / "merged.json"
+
+        with pytest.raises(SystemExit):
+            main.main(["merge", *paths, "-f", "json", "-o", str(output)])
+
+        assert "part2.jsonl: holds 3 of 4 problems" in capsys.readouterr().err
+        assert list(tmp_path.glob("merged*")) == []
+
+    def test_partials_of_different_jobs_are_rejected(self, tmp_path):
+        """Test that shards of another job cannot be mixed in"""
+        paths = write_shards(tmp_path, 2)
+        other = tmp_path / "other.jsonl"
+        stream = io.StringIO()
+        write_partial([], stream, {**JOB, "seed": 10}, 2, 2)
+        other.write_text(stream.getvalue(), encoding="utf-8")
+
+        with pytest.raises(ValueError, match="different job"):
+            read_partials([paths[0], str(other)])
+
+    def test_partials_with_and_without_steps_are_rejected(self, tmp_path, capsys):
+        """Test that --no-steps shards cannot be merged with full shards"""
+        common = ["-n", "6", "-d", "easy", "-s", "3"]
+        main.main(common + ["--shard", "1/2", "-o", str(tmp_path / "part1")])
+        main.main(
+            common + ["--shard", "2/2", "--no-steps", "-o", str(tmp_path / "part2")]
+        )
+        paths = sorted(str(path) for path in tmp_path.glob("part*.jsonl"))
+
+        with pytest.raises(SystemExit):
+            main.main(["merge", *paths, "-o", str(tmp_path / "merged")])
+        assert "different job" in capsys.readouterr().err
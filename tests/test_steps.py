@@ -0,0 +1,156 @@
+"""
+Unit tests for the step engine
+"""
+
+import random
+
+import pytest
+import sympy
+from sympy import cos, diff, exp, log, sin
+from sympy.integrals.rationaltools import ratint
+from src.generator import ProblemGenerator
+from src.polynomial import Polynomial
+from src.steps import (
+    derivative_steps,
+    integral_steps,
+    polynomial_derivative_steps,
+    polynomial_integral_steps,
+    x,
+)
+
+
+def family_functions(problem_type, difficulty, count, seed=0):
+    """A reproducible sample of a family's functions"""
+    generator = ProblemGenerator(seed=seed)
+    specs = list(ProblemGenerator._enumerate_specs(problem_type, difficulty))
+    specs = random.Random(seed).sample(specs, min(count, len(specs)))
+    return [generator._build_draw(problem_type, difficulty, spec)[0] for spec in specs]
+
+
+@pytest.fixture
+def no_solvers(monkeypatch):
+    """Make any SymPy solver call fail"""
+
+    def fail(*args, **kwargs):
+        raise AssertionError("solver called")
+
+    for name in ("diff", "integrate", "apart"):
+        monkeypatch.setattr(sympy, name, fail)
+
+
+class TestDerivativeSteps:
+    """Test cases for rule-based differentiation"""
+
+    @pytest.mark.parametrize(
+        "difficulty,count", [("easy", 60), ("medium", 200), ("hard", 4)]
+    )
+    def test_result_matches_diff(self, difficulty, count):
+        """Test that the rule walk gives sympy.diff's expression"""
+        for function in family_functions("derivative", difficulty, count):
+            derivative, _ = derivative_steps(function)
+            assert derivative == diff(function, x)
+            assert str(derivative) == str(diff(function, x))
+
+    def test_rules_follow_the_tree(self):
+        """Test that sums, products and chains each name their rule"""
+        _, rules = derivative_steps(x * log(x) + exp(x**2) + 4)
+
+        assert rules == (
+            "- Sum rule: differentiate term by term",
+            "- Product rule: d/dx(x*log(x)) = log(x) + 1",
+            "- Power rule: d/dx(x) = 1",
+            "- Derivative of ln(x) is 1/x",
+            "- Chain rule: d/dx(exp(x**2)) = 2*x*exp(x**2)",
+            "- Power rule: d/dx(x**2) = 2*x",
+            "- Constant rule: d/dx(4) = 0",
+        )
+
+    def test_elementary_rules_keep_their_wording(self):
+        """Test that sin, cos and exp of x read as before"""
+        _, rules = derivative_steps(exp(x) * sin(x) + cos(x))
+
+        assert "- Derivative of e^x is e^x" in rules
+        assert "- Derivative of sin(x) is cos(x)" in rules
+        assert "- Derivative of cos(x) is -sin(x)" in rules
+
+    def test_repeated_rules_appear_once(self):
+        """Test that a rule reached twice is listed once"""
+        _, rules = derivative_steps(sin(x) * cos(x) + sin(x))
+
+        assert rules.count("- Derivative of sin(x) is cos(x)") == 1
+
+    def test_shared_subtrees_are_memoized(self, no_solvers):
+        """Test that shared terms are walked once and no solver runs"""
+        derivative_steps(3 * x**2 + sin(x))
+        derivative_steps(sympy.Integer(-1))
+        before = derivative_steps.cache_info()
+        derivative_steps(3 * x**2 + sin(x) - 1)
+        after = derivative_steps.cache_info()
+
+        # One new sum; its terms and their children come from the cache
+        assert after.misses - before.misses == 1
+        assert after.hits - before.hits == 3
+
+
+class TestIntegralSteps:
+    """Test cases for integral explanations"""
+
+    def test_integration_by_parts(self, no_solvers):
+        """Test that polynomial * trig integrands are explained by tabular parts"""
+        function = (x**2 + 1) * sin(x)
+        rules = integral_steps(function, sympy.S.Zero)
+
+        assert rules == (
+            "- Integration by parts (tabular): u = x**2 + 1, dv = sin(x) dx",
+            "- Differentiate u until it vanishes: x**2 + 1 → 2*x → 2 → 0",
+            "- Integrate dv repeatedly: -cos(x) → -sin(x) → cos(x)",
+            "- Multiply diagonally with alternating signs (+, -, +, ...) and add",
+        )
+
+    def test_partial_fractions_from_result(self):
+        """Test that rational integrands are split using the solver's result"""
+        function = -5 * x / (5 * x - 5)
+        integral = ratint(function, x)
+
+        rules = integral_steps(function, integral)
+        assert rules == (
+            "- Divide and split into partial fractions, then integrate each term",
+            "- ∫-1 dx = -x",
+            "- ∫-1/(x - 1) dx = -log(x - 1)",
+        )
+
+    def test_medium_integrals_use_parts(self):
+        """Test that every sampled medium integral gets a tabular explanation"""
+        for function in family_functions("integral", "medium", 40):
+            rules = integral_steps(function, sympy.S.Zero)
+            assert rules[0].startswith("- Integration by parts (tabular)")
+
+
+class TestPolynomialSteps:
+    """Test cases for the polynomial engine's steps"""
+
+    @pytest.mark.parametrize("coeffs", [(3, -1), (0, 2), (0, 0, -1), (5, 0, 2), (3, 0, -1)])
+    def test_match_step_engine(self, coeffs):
+        """Test that coefficient-based steps equal the engine's on the expression"""
+        polynomial = Polynomial(coeffs)
+        expression = polynomial.as_expr(x)
+
+        assert polynomial_derivative_steps(polynomial) == derivative_steps(expression)[1]
+        assert polynomial_integral_steps(polynomial) == integral_steps(
+            expression, polynomial.integrate().as_expr(x)
+        )
+
+    def test_power_and_sum_rules(self):
+        """Test the rule lines of a small polynomial"""
+        polynomial = Polynomial([2, 0, 3])
+
+        assert polynomial_derivative_steps(polynomial) == (
+            "- Sum rule: differentiate term by term",
+            "- Power rule: d/dx(3*x**2) = 6*x",
+            "- Constant rule: d/dx(2) = 0",
+        )
+        assert polynomial_integral_steps(polynomial) == (
+            "- Sum rule: integrate term by term",
+            "- Power rule: ∫3*x**2 dx = x**3",
+            "- Constant rule: ∫2 dx = 2*x",
+        )
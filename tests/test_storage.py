@@ -0,0 +1,98 @@
+"""
+Unit tests for the pack format
+"""
+
+import io
+from datetime import datetime
+
+import pytest
+from src.generator import ProblemGenerator
+from src.storage import ProblemPack, write_pack
+
+
+@pytest.fixture(scope="module")
+def problems():
+    """Mixed problem set covering every type and difficulty"""
+    generator = ProblemGenerator(seed=4)
+    return [
+        problem
+        for difficulty in ("easy", "hard")
+        for problem in generator.generate_problem_set(count=9, difficulty=difficulty)
+    ]
+
+
+@pytest.fixture
+def pack_path(tmp_path, problems):
+    """Pack file holding the problem set"""
+    path = tmp_path / "set.pack"
+    with path.open("wb") as stream:
+        write_pack(problems, stream, title="Set", generated_at=datetime(2025, 3, 1, 12))
+    return path
+
+
+class TestProblemPack:
+    """Test cases for writing and reading pack files"""
+
+    def test_round_trip(self, pack_path, problems):
+        """Test that every problem reads back unchanged, keys in order"""
+        with ProblemPack(pack_path) as pack:
+            loaded = list(pack)
+
+            assert len(pack) == len(problems)
+            assert (pack.title, pack.generated_at) == ("Set", datetime(2025, 3, 1, 12))
+        assert loaded == problems
+        assert [list(problem) for problem in loaded] == [list(p) for p in problems]
+
+    def test_random_access(self, pack_path, problems):
+        """Test that single problems are fetched by position"""
+        with ProblemPack(pack_path) as pack:
+            assert pack[5] == problems[5]
+            assert pack[-1] == problems[-1]
+            with pytest.raises(IndexError):
+                pack[len(problems)]
+
+    @pytest.mark.parametrize(
+        "problem_type,difficulty",
+        [("limit", None), (None, "hard"), ("integral", "easy"), ("limit", "medium")],
+    )
+    def test_filter(self, pack_path, problems, problem_type, difficulty):
+        """Test that filtering matches a scan of the decoded problems"""
+        expected = [
+            problem
+            for problem in problems
+            if problem_type in (None, problem["type"])
+            and difficulty in (None, problem["difficulty"])
+        ]
+
+        with ProblemPack(pack_path) as pack:
+            assert list(pack.filter(problem_type, difficulty)) == expected
+
+    def test_empty_set(self, tmp_path):
+        """Test that a set without problems is a valid pack"""
+        path = tmp_path / "empty.pack"
+        with path.open("wb") as stream:
+            write_pack([], stream)
+
+        with ProblemPack(path) as pack:
+            assert len(pack) == 0
+            assert list(pack.filter("limit")) == []
+
+    def test_streams_to_unseekable_output(self, problems):
+        """Test that the writer never seeks, so it can write to a pipe"""
+
+        class Pipe(io.BytesIO):
+            def seek(self, *args):
+                raise io.UnsupportedOperation("seek")
+
+        stream = Pipe()
+        write_pack(iter(problems), stream)
+
+        assert stream.getvalue().startswith(b"MPGPACK")
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test that a file in another format is not read as a pack"""
+        path = tmp_path / "set.json"
+        path.write_text("[]" * 40)
+
+        with pytest.raises(ValueError):
+            ProblemPack(path)
@@ -0,0 +1,119 @@
+"""
+Unit tests for problem templates
+"""
+
+import random
+
+import pytest
+import sympy
+from sympy import cos, diff, exp, integrate, latex, sin
+from src.generator import ProblemGenerator
+from src.templates import (
+    coefficients,
+    derivative_template,
+    polynomial,
+    polynomial_times_template,
+    x,
+)
+
+
+def sampled_specs(problem_type, difficulty, count, seed=0):
+    """A reproducible sample of every spec of a family"""
+    specs = list(ProblemGenerator._enumerate_specs(problem_type, difficulty))
+    return random.Random(seed).sample(specs, min(count, len(specs)))
+
+
+class TestTemplate:
+    """Test cases for building and specializing templates"""
+
+    def test_polynomial_derivative_template(self):
+        """Test that a specialized derivative equals differentiating directly"""
+        parameters = coefficients(3)
+        template = derivative_template(polynomial(parameters) + sin(x), parameters)
+
+        function = template.function_at((4, 0, -2))
+        assert function == 4 - 2 * x**2 + sin(x)
+        assert template.solution_at((4, 0, -2)) == diff(function, x)
+
+    @pytest.mark.parametrize("factor", [sin(x), cos(x)])
+    @pytest.mark.parametrize("degree", [1, 2, 3])
+    def test_tabular_integral_matches_integrate(self, degree, factor):
+        """Test that the tabular antiderivative matches integrate term for term"""
+        template = polynomial_times_template(degree, factor)
+        values = tuple(range(-2, degree - 2)) + (5,)
+
+        function = template.function_at(values)
+        solution = template.solution_at(values)
+        expected = integrate(function, x)
+        assert solution == expected
+        assert str(solution) == str(expected)
+        assert latex(solution) == latex(expected)
+
+    def test_zero_coefficients_drop_out(self):
+        """Test that substituting zeros removes the matching terms"""
+        template = polynomial_times_template(2, cos(x))
+
+        assert template.function_at((0, 0, 1)) == x**2 * cos(x)
+        assert template.solution_at((0, 0, 1)) == integrate(x**2 * cos(x), x)
+
+    def test_fixed_template_returns_solution(self):
+        """Test that a template without parameters is its own instance"""
+        template = derivative_template(exp(x**2))
+
+        assert template.function_at(()) == exp(x**2)
+        assert template.solution_at(()) == diff(exp(x**2), x)
+
+
+class TestGeneratorTemplates:
+    """Test cases for template-backed generation"""
+
+    @pytest.mark.parametrize(
+        "problem_type,difficulty,count",
+        [
+            ("derivative", "medium", 40),
+            ("integral", "medium", 15),
+            ("derivative", "hard", 4),
+        ],
+    )
+    def test_templates_match_direct_solving(self, problem_type, difficulty, count):
+        """Test that templated problems equal solving the built function directly"""
+        generator = ProblemGenerator(seed=0)
+        for spec in sampled_specs(problem_type, difficulty, count):
+            drawn = generator._build_draw(problem_type, difficulty, spec)
+            templated, solve = generator._instantiate(problem_type, difficulty, spec)
+
+            assert templated == drawn
+            assert str(templated[0]) == str(drawn[0])
+            problem = getattr(generator, f"_solve_{problem_type}")(
+                *templated, difficulty, solve
+            )
+            expected = getattr(generator, f"_solve_{problem_type}")(*drawn, difficulty)
+            assert problem == expected
+
+    def test_untemplated_families(self):
+        """Test that easy problems, hard integrals and limits keep their own paths"""
+        generator = ProblemGenerator(seed=0)
+
+        assert generator._instantiate("integral", "hard", ((1, 2), (3, 4))) is None
+        assert generator._instantiate("derivative", "easy", ((1, 2),)) is None
+        assert generator._instantiate("limit", "medium", ()) is None
+
+    def test_medium_generation_skips_solvers(self, monkeypatch):
+        """Test that medium problems never call SymPy's solvers per problem"""
+        import src.generator as generator_module
+
+        # Build the templates first: only specialization may run below
+        ProblemGenerator(seed=3).generate_problem_set(count=30, difficulty="medium")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("solver called")
+
+        monkeypatch.setattr(generator_module, "integrate", fail)
+        for name in ("diff", "limit"):
+            monkeypatch.setattr(sympy, name, fail)
+
+        problems = ProblemGenerator(seed=3).generate_problem_set(
+            count=30, difficulty="medium"
+        )
+        assert len(problems) == 30
+        assert all(problem["solution"] for problem in problems)
@@ -0,0 +1,103 @@
+"""
+Unit tests for vectorized easy problem generation
+"""
+
+import math
+
+import numpy as np
+import pytest
+import src.generator as generator_module
+from src.generator import ProblemGenerator
+from src.polynomial import Polynomial
+from src.vectorized import PolynomialBatch, draw_easy_batch, solve_easy_batch
+
+PROBLEM_TYPES = ["derivative", "integral", "limit"]
+
+
+class TestPolynomialBatch:
+    """Test cases for PolynomialBatch class"""
+
+    def test_calculus_matches_polynomial(self):
+        """Test that batch calculus agrees with Polynomial row by row"""
+        coeffs = np.array([[3, -5, 2], [0, -1, 0], [4, 0, -3]])
+        batch = PolynomialBatch(coeffs)
+        rows = [Polynomial(row) for row in coeffs.tolist()]
+
+        assert batch.diff().polynomials() == [row.diff() for row in rows]
+        assert batch.integrate().polynomials() == [row.integrate() for row in rows]
+        assert batch.evaluate(1) == [row.evaluate(1) for row in rows]
+        assert batch.limit_at_infinity(math.inf) == [
+            row.limit(math.inf) for row in rows
+        ]
+
+    def test_substituting_infinity(self):
+        """Test that opposite infinite terms give NaN, as for Polynomial"""
+        values = PolynomialBatch(np.array([[0, -1, 4], [3, 0, 4]])).evaluate(math.inf)
+
+        assert math.isnan(values[0])
+        assert values[1] == math.inf
+
+    def test_render_matches_polynomial(self):
+        """Test that bulk rendering prints each row like Polynomial"""
+        batch = PolynomialBatch(np.array([[3, 0, -1], [1, 1, 0], [3, 0, -1]]))
+        texts, latexes = batch.integrate().render()
+
+        assert texts == [str(p) for p in batch.integrate().polynomials()]
+        assert latexes == [p.latex() for p in batch.integrate().polynomials()]
+
+
+class TestVectorizedGeneration:
+    """Test cases for vectorized generation"""
+
+    def test_rows_match_polynomial_engine(self):
+        """Test that each batch row equals the scalar solve of the same spec"""
+        type_index, coeffs, point_index = draw_easy_batch(
+            np.random.default_rng(0), 300, len(PROBLEM_TYPES)
+        )
+        problems = solve_easy_batch(PROBLEM_TYPES, type_index, coeffs, point_index)
+        generator = ProblemGenerator()
+
+        for row, problem in enumerate(problems):
+            polynomial = tuple(Polynomial(coeffs[row].tolist()).coeffs)
+            problem_type = PROBLEM_TYPES[type_index[row]]
+            if problem_type == "limit":
+                spec = (int(point_index[row]), polynomial)
+            else:
+                spec = (polynomial,)
+            expected = generator._solve_polynomial(problem_type, spec)
+
+            assert problem == {**expected, "number": row + 1}
+
+    def test_draws_are_valid_easy_polynomials(self):
+        """Test that every drawn polynomial has degree 1 or 2 and bounded coefficients"""
+        _, coeffs, _ = draw_easy_batch(np.random.default_rng(1), 5000, 3)
+        degrees = {Polynomial(row).degree for row in coeffs.tolist()}
+
+        assert degrees == {1, 2}
+        assert coeffs.min() >= -5 and coeffs.max() <= 5
+
+    def test_seed_reproducibility(self, monkeypatch):
+        """Test that a seed reproduces the vectorized set across batches"""
+        monkeypatch.setattr(generator_module, "VECTOR_BATCH_SIZE", 10)
+        first = ProblemGenerator(seed=4).generate_problem_set(
+            count=25, difficulty="easy", vectorized=True
+        )
+        second = ProblemGenerator(seed=4).generate_problem_set(
+            count=25, difficulty="easy", vectorized=True
+        )
+
+        assert first == second
+        assert [p["number"] for p in first] == list(range(1, 26))
+
+    def test_types_filter(self):
+        """Test that only the requested types are generated"""
+        problems = ProblemGenerator(seed=0).generate_problem_set(
+            count=50, problem_types=["integral"], difficulty="easy", vectorized=True
+        )
+
+        assert {p["type"] for p in problems} == {"integral"}
+
+    def test_other_difficulties_are_rejected(self):
+        """Test that vectorized generation is limited to easy problems"""
+        with pytest.raises(ValueError):
+            ProblemGenerator().generate_problem_set(difficulty="medium", vectorized=True)